@@ -0,0 +1,753 @@
+import argparse
+import contextlib
+import json
+import os
+import queue
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+import dcv_capability
+import dcv_core
+import dcv_history
+import dcv_runner
+import dcv_trace
+import dcv_triage
+from dcv_session import BackgroundLost, JumpHost, SSHSessionManager, StepTimeout, load_paramiko, profile_for, transport_profiles
+
+# 실제 DCV 서버 없이 성능을 측정하기 위한 벤치마크 도구
+# - paramiko 기반의 로컬 가짜 SSH 서버를 띄우고, 원격 명령은 실제 /bin/sh 로 실행하되
+#   whoami / systemctl / runlevel / sudo / pgrep / dcv / journalctl 은 가짜 명령(상태 파일 기반)으로 대체
+# - 지연 프록시로 네트워크 왕복 지연(RTT)과 대역폭 제한(--bandwidth)을 흉내냄
+# - --profile 로 접속 프로필(dcv_session.transport_profiles)을 지정 (all 이면 프로필별로 측정하여 비교)
+# - --jump 이면 가짜 경유 서버(direct-tcpip 중계)를 거쳐 접속 (지연 프록시는 경유 서버 앞에 위치)
+# - CASE 1 / CASE 2 흐름을 처음부터 끝까지 수행하고 왕복 수 / 핸드셰이크 수 / 소요 시간 / GUI 멈춤 시간을 출력
+#
+#   python dcv_bench.py --rtt 150 --restart-delay 2 --isolate-delay 1.5 --repeat 3
+#   python dcv_bench.py --rtt 150 --bandwidth 512 --profile all
+#   python dcv_bench.py --checks                      : 조치 흐름 대신 회귀 확인 항목(checks)만 수행
+
+bench_user = "dcvbench"
+bench_password = "dcvbench"
+
+# 가짜 systemctl / runlevel / whoami / sudo 등의 명령 (하나의 스크립트를 이름만 바꿔 링크해서 사용)
+# 상태는 FAKE_STATE 파일(JSON)에 저장하며, *Monotonic 값은 systemd 처럼 CLOCK_MONOTONIC 기준
+# FAKE_SUSPEND: 흉내낼 절전 시간(초) - CLOCK_MONOTONIC 이 /proc/uptime(CLOCK_BOOTTIME)보다 이만큼 뒤처진 호스트
+# FAKE_SESSIONS: 0 이면 DCV 세션이 없는 호스트 (아무도 접속하지 않은 가상 세션 호스트)
+fake_command_source = r'''
+import json, os, sys, time
+
+STATE = os.environ["FAKE_STATE"]
+RESTART_DELAY = float(os.environ.get("FAKE_RESTART_DELAY", "1.5"))
+ISOLATE_DELAY = float(os.environ.get("FAKE_ISOLATE_DELAY", "1.0"))
+FAKE_USER = os.environ.get("FAKE_USER", "root")
+SUSPEND = float(os.environ.get("FAKE_SUSPEND", "0"))
+SESSIONS = os.environ.get("FAKE_SESSIONS", "1") == "1"
+
+def load():
+    try:
+        with open(STATE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {"dcv_active_at": time.time() - 3600, "target": "graphical", "target_at": 0.0, "previous": "N"}
+
+def save(state):
+    with open(STATE + ".tmp", "w") as f:
+        json.dump(state, f)
+    os.replace(STATE + ".tmp", STATE)
+
+def dcv_state(state):
+    return "active" if time.time() >= state["dcv_active_at"] else "activating"
+
+def runlevel(state):
+    level = "5" if state["target"] == "graphical" else "3"
+    if time.time() < state["target_at"]:
+        level = "3" if level == "5" else "5"
+    return state["previous"], level
+
+def monotonic_usec(epoch):
+    return int((time.clock_gettime(time.CLOCK_MONOTONIC) - SUSPEND - (time.time() - epoch)) * 1000000)
+
+def systemctl(args, state):
+    quiet = "-q" in args or "--quiet" in args
+    unix_timestamps = "--timestamp=unix" in args
+    args = [arg for arg in args if arg not in ("--no-pager", "-q", "--quiet", "--no-block", "--timestamp=unix")]
+    verb = args[0] if args else ""
+    unit = args[1] if len(args) > 1 else ""
+    if verb == "restart":
+        state["dcv_active_at"] = time.time() + RESTART_DELAY
+        save(state)
+        return 0
+    if verb == "isolate":
+        state["previous"] = runlevel(state)[1]
+        state["target"] = "graphical" if unit.startswith("graphical") else "multi-user"
+        state["target_at"] = time.time() + ISOLATE_DELAY
+        save(state)
+        return 0
+    if verb == "is-active":
+        if unit.startswith("dcvserver"):
+            value = dcv_state(state)
+        elif unit.startswith("graphical") or unit.startswith("display-manager"):
+            value = "active" if runlevel(state)[1] == "5" else "inactive"
+        else:
+            value = "active"
+        if not quiet:
+            print(value)
+        return 0 if value == "active" else 3
+    if verb == "get-default":
+        print("graphical.target")
+        return 0
+    if verb == "show":
+        properties = []
+        for index, arg in enumerate(args):
+            if arg.startswith("--property="):
+                properties += arg.split("=", 1)[1].split(",")
+            elif arg in ("-p", "--property") and index + 1 < len(args):
+                properties += args[index + 1].split(",")
+        value = dcv_state(state)
+        for name in properties:
+            if name == "ActiveState":
+                print("ActiveState=" + value)
+            elif name == "ActiveEnterTimestamp":
+                enter = int(state["dcv_active_at"]) if value == "active" else None
+                if enter is None:
+                    print("ActiveEnterTimestamp=")
+                elif unix_timestamps:
+                    print("ActiveEnterTimestamp=@%d" % enter)
+                else:
+                    print("ActiveEnterTimestamp=" + time.strftime("%a %Y-%m-%d %H:%M:%S %Z", time.localtime(enter)))
+            elif name == "ActiveEnterTimestampMonotonic":
+                print("ActiveEnterTimestampMonotonic=%d" % (monotonic_usec(state["dcv_active_at"]) if value == "active" else 0))
+            else:
+                print(name + "=")
+        return 0
+    return 0
+
+def main():
+    name = os.path.basename(sys.argv[0])
+    args = sys.argv[1:]
+    if name == "sudo":
+        while args and args[0].startswith("-"):
+            args = args[1:]
+        os.execvp(args[0], args)
+    if name == "whoami":
+        print(FAKE_USER)
+        return 0
+    state = load()
+    if name == "runlevel":
+        print("%s %s" % runlevel(state))
+        return 0
+    if name == "systemctl":
+        return systemctl(args, state)
+    # 그래픽 모드(런레벨 5)일 때만 Xorg 실행 중 / dcvserver 가 active 이면서 그래픽 모드일 때만 콘솔 세션 존재
+    if name == "pgrep":
+        return 0 if runlevel(state)[1] == "5" else 1
+    if name == "journalctl":
+        for index in range(2000):
+            print("dcvserver[1234]: fake journal line %d - session console ready" % index)
+        return 0
+    if name == "dcv":
+        if args[:1] == ["list-sessions"] and SESSIONS and dcv_state(state) == "active" and runlevel(state)[1] == "5":
+            print("Session: 'console' (owner:%s type:console)" % FAKE_USER)
+        return 0
+    return 0
+
+sys.exit(main())
+'''
+fake_command_names = ("systemctl", "runlevel", "whoami", "sudo", "pgrep", "dcv", "journalctl")
+fake_log_files = (("/var/log/dcv/server.log", 3 * 1024 * 1024), ("/var/log/dcv/agent.console.log", 200 * 1024), ("/var/log/Xorg.0.log", 64 * 1024))
+
+
+# 가짜 DCV 호스트 (가짜 명령 디렉터리 + 상태 파일)
+class FakeDCVHost:
+    def __init__(self, restart_delay=1.5, isolate_delay=1.0, user="root", suspend=0.0, sessions=True):
+        self.directory = tempfile.mkdtemp(prefix="dcv_bench_")
+        bin_dir = os.path.join(self.directory, "bin")
+        os.makedirs(bin_dir)
+        script = os.path.join(bin_dir, "fakehost")
+        with open(script, "w") as f:
+            f.write(f"#!{sys.executable} -S\n" + fake_command_source)
+        os.chmod(script, 0o755)
+        for name in fake_command_names:
+            os.symlink(script, os.path.join(bin_dir, name))
+        # SFTP 로 보이는 파일 시스템 (진단 자료 수집용 가짜 로그)
+        self.root = os.path.join(self.directory, "root")
+        for path, size in fake_log_files:
+            local = os.path.join(self.root, path.lstrip("/"))
+            os.makedirs(os.path.dirname(local), exist_ok=True)
+            with open(local, "wb") as f:
+                line = b"[fake] " + path.encode() + b" log line\n"
+                f.write(line * (size // len(line)))
+        self.env = dict(
+            os.environ,
+            PATH=bin_dir + os.pathsep + os.environ.get("PATH", ""),
+            HOME=self.directory,
+            FAKE_STATE=os.path.join(self.directory, "state.json"),
+            FAKE_RESTART_DELAY=str(restart_delay),
+            FAKE_ISOLATE_DELAY=str(isolate_delay),
+            FAKE_USER=user,
+            FAKE_SUSPEND=str(suspend),
+            FAKE_SESSIONS="1" if sessions else "0",
+        )
+
+    def cleanup(self):
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+# 원격 명령을 가짜 호스트 환경의 /bin/sh 로 실행하는 가짜 SSH 서버
+class FakeSSHServer:
+    def __init__(self, host):
+        paramiko = load_paramiko()
+        self.host = host
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.listener = socket.socket()
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(128)
+        self.port = self.listener.getsockname()[1]
+        self.transports = []
+        self.auth_count = 0
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+
+    def accept_loop(self):
+        paramiko = load_paramiko()
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.host_key)
+            transport.set_subsystem_handler("sftp", paramiko.SFTPServer, self.make_sftp_interface())
+            self.transports.append(transport)
+            transport.start_server(server=self.make_interface())
+
+    def make_interface(self):
+        paramiko = load_paramiko()
+        server = self
+
+        class Interface(paramiko.ServerInterface):
+            def get_allowed_auths(self, username):
+                return "password"
+
+            def check_auth_password(self, username, password):
+                if username == bench_user and password == bench_password:
+                    server.auth_count += 1
+                    return paramiko.AUTH_SUCCESSFUL
+                return paramiko.AUTH_FAILED
+
+            def check_channel_request(self, kind, chanid):
+                return paramiko.OPEN_SUCCEEDED if kind == "session" else paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+            def check_channel_exec_request(self, channel, command):
+                threading.Thread(target=server.run_command, args=(channel, command.decode("utf-8")), daemon=True).start()
+                return True
+
+        return Interface()
+
+    # 가짜 호스트의 root 디렉터리를 / 로 보여주는 읽기 전용 SFTP 서버
+    def make_sftp_interface(self):
+        paramiko = load_paramiko()
+        root = self.host.root
+
+        def local_path(path):
+            return os.path.join(root, os.path.normpath("/" + path).lstrip("/"))
+
+        class Handle(paramiko.SFTPHandle):
+            def stat(self):
+                return paramiko.SFTPAttributes.from_stat(os.fstat(self.readfile.fileno()))
+
+        class SFTPInterface(paramiko.SFTPServerInterface):
+            def list_folder(self, path):
+                try:
+                    return [paramiko.SFTPAttributes.from_stat(os.stat(os.path.join(local_path(path), name)), name)
+                            for name in os.listdir(local_path(path))]
+                except OSError as e:
+                    return paramiko.SFTPServer.convert_errno(e.errno)
+
+            def stat(self, path):
+                try:
+                    return paramiko.SFTPAttributes.from_stat(os.stat(local_path(path)))
+                except OSError as e:
+                    return paramiko.SFTPServer.convert_errno(e.errno)
+
+            lstat = stat
+
+            def open(self, path, flags, attr):
+                if flags & (os.O_WRONLY | os.O_RDWR):
+                    return paramiko.SFTP_PERMISSION_DENIED
+                try:
+                    handle = Handle(flags)
+                    handle.readfile = open(local_path(path), "rb")
+                    return handle
+                except OSError as e:
+                    return paramiko.SFTPServer.convert_errno(e.errno)
+
+        return SFTPInterface
+
+    # 명령을 실행하면서 stdout / stderr 를 도착하는 대로 채널로 전달하고, 채널 입력은 프로세스 stdin 으로 전달
+    def run_command(self, channel, command):
+        process = subprocess.Popen(
+            ["/bin/sh", "-c", command], env=self.host.env, cwd=self.host.directory,
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+        )
+
+        def pump(source, send):
+            try:
+                for chunk in iter(lambda: source.read1(32768), b""):
+                    send(chunk)
+            except OSError:
+                pass
+
+        def feed():
+            try:
+                for chunk in iter(lambda: channel.recv(32768), b""):
+                    process.stdin.write(chunk)
+                    process.stdin.flush()
+            except (OSError, ValueError):
+                pass
+            finally:
+                try:
+                    process.stdin.close()
+                except OSError:
+                    pass
+
+        threading.Thread(target=feed, daemon=True).start()
+        pumps = [
+            threading.Thread(target=pump, args=(process.stdout, channel.sendall), daemon=True),
+            threading.Thread(target=pump, args=(process.stderr, channel.sendall_stderr), daemon=True),
+        ]
+        for thread in pumps:
+            thread.start()
+        for thread in pumps:
+            thread.join()
+        try:
+            channel.send_exit_status(process.wait())
+            channel.close()
+        except OSError:
+            pass
+
+    def close(self):
+        self.listener.close()
+        for transport in self.transports:
+            transport.close()
+
+
+# direct-tcpip 채널만 허용하는 가짜 경유 서버 (채널을 로컬 TCP 접속으로 중계)
+class FakeBastion:
+    def __init__(self):
+        paramiko = load_paramiko()
+        self.host_key = paramiko.RSAKey.generate(2048)
+        self.listener = socket.socket()
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(128)
+        self.port = self.listener.getsockname()[1]
+        self.transports = []
+        self.auth_count = 0
+        self.tunnel_count = 0
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+
+    def accept_loop(self):
+        paramiko = load_paramiko()
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            transport = paramiko.Transport(client)
+            transport.add_server_key(self.host_key)
+            self.transports.append(transport)
+            destinations = {}
+            transport.start_server(server=self.make_interface(destinations))
+            threading.Thread(target=self.channel_loop, args=(transport, destinations), daemon=True).start()
+
+    def make_interface(self, destinations):
+        paramiko = load_paramiko()
+        bastion = self
+
+        class Interface(paramiko.ServerInterface):
+            def get_allowed_auths(self, username):
+                return "password"
+
+            def check_auth_password(self, username, password):
+                if username == bench_user and password == bench_password:
+                    bastion.auth_count += 1
+                    return paramiko.AUTH_SUCCESSFUL
+                return paramiko.AUTH_FAILED
+
+            def check_channel_request(self, kind, chanid):
+                return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+            def check_channel_direct_tcpip_request(self, chanid, origin, destination):
+                destinations[chanid] = destination
+                return paramiko.OPEN_SUCCEEDED
+
+        return Interface()
+
+    # 열린 터널마다 목적지로 TCP 접속 후 양방향 중계
+    def channel_loop(self, transport, destinations):
+        while transport.is_active():
+            channel = transport.accept(1)
+            if channel is None:
+                continue
+            try:
+                upstream = socket.create_connection(destinations.pop(channel.get_id()))
+            except OSError:
+                channel.close()
+                continue
+            self.tunnel_count += 1
+            for source, destination in ((channel, upstream), (upstream, channel)):
+                threading.Thread(target=self.pump, args=(source, destination), daemon=True).start()
+
+    @staticmethod
+    def pump(source, destination):
+        try:
+            for chunk in iter(lambda: source.recv(65536), b""):
+                destination.sendall(chunk)
+        except (OSError, EOFError):
+            pass
+        for sock in (source, destination):
+            try:
+                sock.close()
+            except (OSError, EOFError):
+                pass
+
+    def close(self):
+        self.listener.close()
+        for transport in self.transports:
+            transport.close()
+
+
+# 지정한 왕복 지연(RTT)을 흉내내는 TCP 중계기 (각 방향으로 RTT/2 만큼 늦게 전달)
+# bandwidth_kbps: 방향별 대역폭 제한 (0 이면 제한 없음 - 앞 데이터의 전송이 끝나야 다음 데이터 전송 시작)
+class LatencyProxy:
+    def __init__(self, target_port, rtt_ms, bandwidth_kbps=0):
+        self.target_port = target_port
+        self.delay = rtt_ms / 2000
+        self.rate = bandwidth_kbps * 1000 / 8 # 초당 바이트
+        self.listener = socket.socket()
+        self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listener.bind(("127.0.0.1", 0))
+        self.listener.listen(128)
+        self.port = self.listener.getsockname()[1]
+        threading.Thread(target=self.accept_loop, daemon=True).start()
+
+    def accept_loop(self):
+        while True:
+            try:
+                client, _ = self.listener.accept()
+            except OSError:
+                return
+            upstream = socket.create_connection(("127.0.0.1", self.target_port))
+            for source, destination in ((client, upstream), (upstream, client)):
+                pending = queue.Queue()
+                threading.Thread(target=self.read_loop, args=(source, pending), daemon=True).start()
+                threading.Thread(target=self.write_loop, args=(destination, pending), daemon=True).start()
+
+    def read_loop(self, source, pending):
+        sent_at = 0.0 # 이 방향으로 앞 데이터 전송이 끝나는 시간
+        try:
+            for chunk in iter(lambda: source.recv(65536), b""):
+                sent_at = max(time.monotonic(), sent_at) + (len(chunk) / self.rate if self.rate else 0)
+                pending.put((sent_at + self.delay, chunk))
+        except OSError:
+            pass
+        pending.put((time.monotonic() + self.delay, b""))
+
+    def write_loop(self, destination, pending):
+        while True:
+            due, chunk = pending.get()
+            wait = due - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            try:
+                if not chunk:
+                    destination.shutdown(socket.SHUT_WR)
+                    return
+                destination.sendall(chunk)
+            except OSError:
+                return
+
+    def close(self):
+        self.listener.close()
+
+
+# GUI 흐름(MainWindow)을 화면 없이 실행하기 위한 메시지창 대체 클래스 (결과만 기록하고 이벤트 루프 종료)
+class HeadlessMessageBox:
+    results = []
+    app = None
+    StandardButton = None # QMessageBox.StandardButton (GUI 측정 시작 시 설정)
+
+    @classmethod
+    def information(cls, parent, title, text, *args, **kwargs):
+        cls.results.append((True, text))
+        cls.app.quit()
+
+    @classmethod
+    def critical(cls, parent, title, text, *args, **kwargs):
+        cls.results.append((False, text))
+        cls.app.quit()
+
+    # 자동 진단 후 조치 진행 여부 확인 - 항상 진행
+    @classmethod
+    def question(cls, parent, title, text, *args, **kwargs):
+        return cls.StandardButton.Yes
+
+
+# 핵심 흐름(dcv_core)만으로 CASE 수행 - 로그인(접속)부터 조치 완료까지 측정
+# remote=True 이면 원격 일괄 실행 모드(dcv_runner)로 수행, jump: 경유 서버(JumpHost)
+def run_core_case(case, port, remote=False, jump=None, profile=None):
+    start = time.monotonic()
+    session = SSHSessionManager("127.0.0.1", bench_user, bench_password, port=port, jump=jump, profile=profile)
+    session.connect()
+    flows = dcv_runner.remote_flows if remote else dcv_core.remediation_flows
+    result = flows[case](session)
+    wall = time.monotonic() - start
+    stats = session.stats()
+    session.close()
+    return {"ok": result.ok, "wall_s": round(wall, 3), "gui_stall_ms": None, **stats}
+
+
+# GUI 흐름(MainWindow)으로 CASE 수행 - 실제 작업 스레드 / 시그널 경로를 거치며 GUI 멈춤 시간까지 측정
+def run_gui_case(case, port, profile=None):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt6.QtWidgets import QApplication, QMessageBox
+    from PyQt6.QtCore import QTimer
+    import dcv_gui
+
+    app = QApplication.instance() or QApplication([])
+    HeadlessMessageBox.app = app
+    HeadlessMessageBox.StandardButton = QMessageBox.StandardButton
+    HeadlessMessageBox.results = []
+    dcv_gui.QMessageBox = HeadlessMessageBox
+
+    start = time.monotonic()
+    session = SSHSessionManager("127.0.0.1", bench_user, bench_password, port=port, profile=profile)
+    session.connect()
+    window = dcv_gui.MainWindow(session)
+    window.timer.stop() # 자동 종료 타이머는 측정에서 제외
+    QTimer.singleShot(0, window.restart_service if case == "restart" else window.change_runlevel)
+    app.exec()
+    wall = time.monotonic() - start
+    stats = session.stats()
+    stall = window.stall_monitor.stats()
+    window.runner.shutdown()
+    session.close()
+    window.close()
+    ok = bool(HeadlessMessageBox.results and HeadlessMessageBox.results[-1][0])
+    return {"ok": ok, "wall_s": round(wall, 3), "gui_stall_ms": stall["total_stall_ms"], "gui_max_stall_ms": stall["max_stall_ms"], **stats}
+
+
+# 회귀 확인 항목 - 출력이 계속 나오는 명령도 제한 시간 안에 StepTimeout 으로 끝나는지 확인
+def check_chatty_timeout(port, timeout=1.0):
+    session = SSHSessionManager("127.0.0.1", bench_user, bench_password, port=port)
+    session.connect()
+    start = time.monotonic()
+    try:
+        for _ in session.stream("while :; do echo tick; sleep 0.05; done", timeout=timeout, step="check:chatty"):
+            pass
+        ok, message = False, "StepTimeout 이 발생하지 않음"
+    except StepTimeout:
+        elapsed = time.monotonic() - start
+        ok, message = elapsed < timeout + 1.0, f"{elapsed:.2f}초 후 StepTimeout"
+    finally:
+        session.close()
+    return ok, message
+
+# 회귀 확인 항목 - 절전했던 호스트(CLOCK_MONOTONIC 이 CLOCK_BOOTTIME 보다 뒤처짐)에서도 CASE 1 재시작을 성공으로 판정하는지 확인
+def check_suspended_restart(port):
+    messages = []
+    ok = True
+    for name, flows in (("core", dcv_core.remediation_flows), ("runner", dcv_runner.remote_flows)):
+        session = SSHSessionManager("127.0.0.1", bench_user, bench_password, port=port)
+        session.connect()
+        try:
+            result = flows["restart"](session)
+        finally:
+            session.close()
+        ok = ok and result.ok
+        messages.append(f"{name} {result.message}")
+    return ok, " / ".join(messages)
+
+# 회귀 확인 항목 - DCV 세션만 없는 정상 호스트에서 자동 조치(watchdog 과 같은 auto_flow)가 dcvserver 를 재시작하지 않는지 확인
+def check_idle_host(port):
+    session = SSHSessionManager("127.0.0.1", bench_user, bench_password, port=port)
+    session.connect()
+    try:
+        notes = dcv_triage.triage(session).notes
+        result = dcv_triage.auto_flow(session)
+    finally:
+        session.close()
+    return result.action == "none", f"{result.message} / 참고: {', '.join(notes) or '-'}"
+
+# 회귀 확인 항목 - 재접속해도 실행 중인 백그라운드 명령이 끊기지 않고, Transport 가 끊겨 결과를 못 받은 경우는 BackgroundLost 로 구분되는지 확인
+def check_reconnect_background(port):
+    session = SSHSessionManager("127.0.0.1", bench_user, bench_password, port=port)
+    session.connect()
+    try:
+        # 살아있는 Transport 에서 재접속 (채널 열기 실패 후 재시도와 같은 경로)
+        session.start_background("sleep 1; echo done", step="check:background")
+        session.connect()
+        kept = session.join_background(5)
+        # Transport 가 끊긴 뒤 다음 명령에서 재접속
+        session.start_background("sleep 1; echo done", step="check:background")
+        time.sleep(0.3)
+        session.transport.close()
+        session.run("true", step="check:reconnect")
+        lost = session.join_background(5)
+    finally:
+        session.close()
+    ok = [getattr(result, "stdout", None) for result in kept] == ["done"] and len(lost) == 1 and isinstance(lost[0], BackgroundLost)
+    return ok, f"재접속 중 유지: {kept[0].stdout if kept and hasattr(kept[0], 'stdout') else kept} / 연결 끊김: {type(lost[0]).__name__ if lost else '-'}"
+
+# 회귀 확인 항목 목록 (이름, 함수(port) -> (성공 여부, 메시지), 가짜 호스트 설정)
+checks = (
+    ("chatty_timeout", check_chatty_timeout, {}),
+    ("suspended_restart", check_suspended_restart, {"suspend": 3600.0}),
+    ("idle_host", check_idle_host, {"sessions": False}),
+    ("reconnect_background", check_reconnect_background, {}),
+)
+
+# 측정 / 회귀 확인 중에 쓰는 파일(원격 환경 정보 캐시 / 트레이스 / metrics.prom / 조치 이력)을 가짜 호스트 디렉터리에 두고 끝나면 되돌림
+# (사용자의 실제 기록을 건드리지 않고, 이전 측정 이력이 대기 정책 / 진행률 추정에 섞이지 않도록)
+@contextlib.contextmanager
+def isolated_outputs(directory):
+    saved = (dcv_capability.cache, dcv_trace.trace_dir, dcv_history.history_db)
+    # 기록 스레드가 열어 둔 이전 저장소 연결을 닫고 새 경로로 다시 열도록 함
+    dcv_history.close()
+    dcv_capability.cache = dcv_capability.CapabilityCache(os.path.join(directory, "capabilities.json"))
+    dcv_trace.trace_dir = os.path.join(directory, "traces")
+    dcv_history.history_db = os.path.join(directory, "history.sqlite3")
+    try:
+        yield
+    finally:
+        # 남은 기록을 가짜 호스트 저장소에 모두 저장한 뒤 경로 복원
+        dcv_history.close()
+        dcv_capability.cache, dcv_trace.trace_dir, dcv_history.history_db = saved
+
+# 가짜 호스트 / 서버를 띄우고 회귀 확인 항목 수행
+def run_checks(rtt_ms=0):
+    rows = []
+    for name, check, host_options in checks:
+        host = FakeDCVHost(**host_options)
+        server = FakeSSHServer(host)
+        proxy = LatencyProxy(server.port, rtt_ms) if rtt_ms else None
+        try:
+            with isolated_outputs(host.directory):
+                ok, message = check(proxy.port if proxy else server.port)
+        except Exception as e:
+            ok, message = False, f"오류: {e}"
+        finally:
+            if proxy:
+                proxy.close()
+            server.close()
+            host.cleanup()
+        rows.append({"check": name, "ok": ok, "message": message})
+    return rows
+
+
+def gui_available():
+    try:
+        import PyQt6.QtWidgets # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+# 벤치마크 1회 수행 (가짜 호스트 / 서버 / 지연 프록시 준비 후 정리까지)
+# jump=True 이면 가짜 경유 서버를 거쳐 접속 (GUI 측정은 직접 접속만 지원), profile: 접속 프로필 이름
+def run_benchmark(case, mode="core", rtt_ms=0, restart_delay=1.5, isolate_delay=1.0, user="root", jump=False, profile="default",
+                  bandwidth_kbps=0):
+    host = FakeDCVHost(restart_delay, isolate_delay, user)
+    server = FakeSSHServer(host)
+    bastion = FakeBastion() if jump and mode != "gui" else None
+    proxy = LatencyProxy(bastion.port if bastion else server.port, rtt_ms, bandwidth_kbps) if rtt_ms or bandwidth_kbps else None
+    port = proxy.port if proxy else server.port
+    jump_host = None
+    if bastion:
+        jump_host = JumpHost("127.0.0.1", bench_user, bench_password, port=proxy.port if proxy else bastion.port)
+        port = server.port
+    try:
+        # 측정마다 원격 환경 정보를 새로 조회하고 기록 파일은 가짜 호스트 디렉터리에 남김
+        # 상태 확인 간격의 jitter 는 조치별로 고정 (모드 / 프로필끼리 같은 확인 간격으로 비교)
+        random.seed(case)
+        with isolated_outputs(host.directory):
+            if mode == "gui":
+                result = run_gui_case(case, port, profile_for(profile))
+            else:
+                result = run_core_case(case, port, remote=mode == "runner", jump=jump_host, profile=profile_for(profile))
+        if jump_host:
+            result["jump_handshakes"] = jump_host.stats()["handshakes"]
+    finally:
+        if jump_host:
+            jump_host.close()
+        if proxy:
+            proxy.close()
+        if bastion:
+            bastion.close()
+        server.close()
+        host.cleanup()
+    return {"case": case, "mode": mode, "rtt_ms": rtt_ms, "bandwidth_kbps": bandwidth_kbps, **result}
+
+
+def format_rows(rows):
+    lines = [f"{'CASE':<12}{'MODE':<7}{'PROFILE':<14}{'RTT':>5}{'OK':>4}{'WALL(s)':>9}{'ROUNDTRIPS':>11}{'PREFETCHED':>11}"
+             f"{'HANDSHAKES':>11}{'AVOIDED':>8}{'STALL(ms)':>10}"]
+    for row in rows:
+        stall = "-" if row["gui_stall_ms"] is None else row["gui_stall_ms"]
+        lines.append(
+            f"{row['case']:<12}{row['mode']:<7}{row['profile']:<14}{row['rtt_ms']:>5}{'Y' if row['ok'] else 'N':>4}{row['wall_s']:>9.3f}"
+            f"{row['round_trips']:>11}{row['channels_prefetched']:>11}{row['handshakes']:>11}{row['handshakes_avoided']:>8}{stall:>10}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 가짜 SSH 서버로 CASE 1 / CASE 2 흐름 성능 측정")
+    parser.add_argument("--cases", default="restart,blackscreen", help="측정할 조치 (쉼표 구분, 기본 restart,blackscreen)")
+    parser.add_argument("--mode", choices=("core", "runner", "gui", "both", "all"), default="both",
+                        help="core = dcv_core 흐름, runner = 원격 일괄 실행 모드, gui = MainWindow 흐름, both = core + gui, all = 전체")
+    parser.add_argument("--rtt", type=int, default=0, help="흉내낼 네트워크 왕복 지연(ms)")
+    parser.add_argument("--bandwidth", type=int, default=0, help="흉내낼 방향별 대역폭(kbps) (0 이면 제한 없음)")
+    parser.add_argument("--profile", choices=list(transport_profiles) + ["all"], default="default",
+                        help="접속 프로필 (all = 프로필별로 측정하여 비교)")
+    parser.add_argument("--restart-delay", type=float, default=1.5, help="dcvserver 재시작 후 active 가 되기까지 걸리는 시간(초)")
+    parser.add_argument("--isolate-delay", type=float, default=1.0, help="런레벨 전환에 걸리는 시간(초)")
+    parser.add_argument("--user", default="root", help="원격 접속 사용자 (root 가 아니면 sudo 경로 사용)")
+    parser.add_argument("--jump", action="store_true", help="가짜 경유 서버를 거쳐 접속 (core / runner 측정만 해당)")
+    parser.add_argument("--repeat", type=int, default=1, help="반복 횟수")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    parser.add_argument("--checks", action="store_true", help="조치 흐름 대신 회귀 확인 항목만 수행")
+    args = parser.parse_args(argv)
+
+    if args.checks:
+        rows = run_checks(args.rtt)
+        print(json.dumps(rows, ensure_ascii=False, indent=2) if args.json else
+              "\n".join(f"{row['check']:<22}{'OK' if row['ok'] else 'FAIL':<6}{row['message']}" for row in rows))
+        return 0 if all(row["ok"] for row in rows) else 1
+
+    modes = {"both": ["core", "gui"], "all": ["core", "runner", "gui"]}.get(args.mode, [args.mode])
+    if "gui" in modes and not gui_available():
+        print("PyQt6 를 불러올 수 없어 GUI 측정은 생략합니다.", file=sys.stderr)
+        modes.remove("gui")
+
+    profiles = list(transport_profiles) if args.profile == "all" else [args.profile]
+    rows = []
+    for _ in range(args.repeat):
+        for case in args.cases.split(","):
+            for mode in modes:
+                for profile in profiles:
+                    rows.append(run_benchmark(case, mode, args.rtt, args.restart_delay, args.isolate_delay, args.user, args.jump,
+                                              profile, args.bandwidth))
+    print(json.dumps(rows, ensure_ascii=False, indent=2) if args.json else format_rows(rows))
+    return 0 if all(row["ok"] for row in rows) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
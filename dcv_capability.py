@@ -0,0 +1,123 @@
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict, fields
+
+# 호스트 / 사용자별 원격 환경 정보 캐시 (접속 사용자, sudo 비밀번호 없이 사용 가능 여부, init 시스템, runlevel 명령 유무)
+# 로그인 시 1회 왕복으로 조회해 세션에 보관하고, 파일에도 저장해 두어 다음 실행 때는 조회 없이 재사용 (유효시간 capability_ttl)
+
+capability_file = os.environ.get("DCV_TOOLS_CAPABILITIES") or os.path.join(os.path.expanduser("~"), ".dcv_tools", "capabilities.json")
+capability_ttl = 3600 # 캐시 유효시간(초)
+
+
+@dataclass
+class HostCapabilities:
+    user: str = ""
+    sudo_nopasswd: bool = False # sudo -n 성공 여부 (비밀번호 입력 없이 sudo 사용 가능)
+    init_system: str = "" # 1번 프로세스 이름 (예: systemd)
+    has_runlevel: bool = True # runlevel 명령 사용 가능 여부 (없으면 graphical.target 상태로 런레벨 판단)
+    probed_at: float = 0.0 # 조회 시간 (epoch 초)
+
+    # systemctl 명령 앞에 붙일 접두어 (root 이면 없음, sudo -n 이 되면 비밀번호 대기 없이 바로 실패하도록 -n 사용)
+    @property
+    def sudo_prefix(self):
+        if self.user == "root":
+            return ""
+        return "sudo -n " if self.sudo_nopasswd else "sudo "
+
+    def is_fresh(self, ttl=capability_ttl):
+        return time.time() - self.probed_at < ttl
+
+
+# 원격 환경 정보를 한 번의 왕복으로 조회하는 명령어
+capability_probe_command = (
+    "echo User=$(whoami);"
+    " if sudo -n true >/dev/null 2>&1; then echo SudoNoPasswd=1; else echo SudoNoPasswd=0; fi;"
+    " echo Init=$(cat /proc/1/comm 2>/dev/null);"
+    " if command -v runlevel >/dev/null 2>&1; then echo Runlevel=1; else echo Runlevel=0; fi"
+)
+
+# capability_probe_command 결과(key=value 줄 목록)를 HostCapabilities로 변환
+def parse_capabilities(output):
+    values = dict(line.split("=", 1) for line in output.splitlines() if "=" in line)
+    return HostCapabilities(
+        user=values.get("User", "").strip(),
+        sudo_nopasswd=values.get("SudoNoPasswd", "").strip() == "1",
+        init_system=values.get("Init", "").strip(),
+        has_runlevel=values.get("Runlevel", "1").strip() != "0",
+        probed_at=time.time(),
+    )
+
+
+# 파일에 저장되는 캐시 ("사용자@IP:포트" 별 HostCapabilities)
+class CapabilityCache:
+    def __init__(self, path=None):
+        self.path = path or capability_file
+        self.lock = threading.Lock()
+        self.entries = None
+
+    def load(self):
+        if self.entries is None:
+            self.entries = {}
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    names = {field.name for field in fields(HostCapabilities)}
+                    for key, values in json.load(f).items():
+                        self.entries[key] = HostCapabilities(**{name: value for name, value in values.items() if name in names})
+            except (OSError, ValueError, TypeError, AttributeError):
+                # 캐시 파일이 없거나 잘못된 경우 빈 캐시로 시작
+                self.entries = {}
+        return self.entries
+
+    def get(self, key):
+        with self.lock:
+            capabilities = self.load().get(key)
+        return capabilities if capabilities is not None and capabilities.is_fresh() else None
+
+    def put(self, key, capabilities):
+        with self.lock:
+            self.load()[key] = capabilities
+            self.save()
+
+    def discard(self, key):
+        with self.lock:
+            if self.load().pop(key, None) is not None:
+                self.save()
+
+    # 임시 파일 작성 후 교체 (저장 실패는 무시 - 다음 실행 때 다시 조회)
+    def save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump({key: asdict(value) for key, value in self.entries.items() if value.is_fresh()}, f, ensure_ascii=False, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError:
+            pass
+
+cache = CapabilityCache()
+
+
+def cache_key(session):
+    return f"{session.username}@{session.ip}:{session.port}"
+
+
+# 세션의 원격 환경 정보 반환 (세션 보관값 → 파일 캐시 → 원격 조회 순, refresh=True 이면 다시 조회)
+def capabilities_for(session, refresh=False):
+    capabilities = session.capabilities
+    if not refresh and capabilities is not None and capabilities.is_fresh():
+        return capabilities
+    key = cache_key(session)
+    capabilities = None if refresh else cache.get(key)
+    if capabilities is None:
+        capabilities = parse_capabilities(session.run(capability_probe_command, step="probe:capabilities"))
+        cache.put(key, capabilities)
+    session.capabilities = capabilities
+    return capabilities
+
+
+# 캐시된 정보가 맞지 않을 수 있는 경우 (조치 중 오류 발생 등) 세션 / 파일 캐시에서 제거 → 다음 조치 때 다시 조회
+def invalidate(session):
+    session.capabilities = None
+    cache.discard(cache_key(session))
@@ -0,0 +1,308 @@
+import argparse
+import getpass
+import json
+import os
+import signal
+import sys
+import time
+
+import dcv_capability
+import dcv_core
+import dcv_diagnostics
+import dcv_fleet
+import dcv_history
+import dcv_runner
+import dcv_trace
+import dcv_triage
+import dcv_watchdog
+from dcv_policy import host_classes, policy_for_host
+from dcv_session import SSHSessionManager, StepTimeout, jump_host_for, close_jump_hosts, profile_for, transport_profiles
+
+# GUI 없이 명령줄에서 조치를 수행하기 위한 CLI (Qt 모듈을 불러오지 않음 - cron / 모니터링 훅에서 사용)
+#   dcv_tools restart --host 10.0.0.5 -u admin         : CASE 1 (DCV 사용 중 튕김)
+#   dcv_tools blackscreen --host 10.0.0.5 -u admin     : CASE 2 (DCV 처음 접속 시 검은 화면)
+#   dcv_tools diagnose --host 10.0.0.5 -u admin [--fix] : 자동 진단 (--fix 이면 필요한 조치까지 수행)
+#   dcv_tools collect --host 10.0.0.5 -u admin [-o out.tar.gz] : 진단 자료(로그) 수집
+#   dcv_tools fleet restart hosts.txt -u admin -c 20   : 여러 호스트 동시 조치 (auto = 진단 후 필요한 조치만)
+#   dcv_tools watch hosts.txt -u admin -i 30           : 감시 모드 (주기적으로 진단하여 이상이 있으면 자동 조치, Ctrl+C 로 종료)
+#                                                        --view 이면 호스트 현황 창(dcv_hostview) 함께 표시
+#   dcv_tools history p95 blackscreen                  : 조치 이력 조회 (p95 = 호스트별 소요 시간 p95,
+#                                                        frequent = 이번 주 조치가 4회 이상인 호스트, recent = 최근 기록)
+# 모든 명령에 --jump [사용자@]경유서버[:포트] 를 주면 경유 서버 로그인 1회로 모든 대상 호스트에 접속
+# --profile high-latency 를 주면 VPN 등 고지연 회선용 접속 설정 사용 (dcv_session.transport_profiles)
+# 결과는 기본적으로 JSON 한 줄로 출력하며, 종료 코드는 성공 0 / 조치 실패 1 / 접속 등 오류 2
+
+# 비밀번호는 명령줄에 남지 않도록 환경변수(DCV_TOOLS_PASSWORD) 또는 입력 프롬프트로 받음
+def read_password():
+    return os.environ.get("DCV_TOOLS_PASSWORD") or getpass.getpass("PW : ", stream=sys.stderr)
+
+# --jump 로 지정한 경유 서버 (지정하지 않으면 None - 직접 접속)
+def jump_host(args, password):
+    if not args.jump:
+        return None
+    return jump_host_for(args.jump, args.user, os.environ.get("DCV_TOOLS_JUMP_PASSWORD") or password)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="dcv_tools", description="DCV 서버 조치 도구 (인자 없이 실행하면 GUI 실행)")
+    parser.add_argument("-V", "--version", action="version", version=f"DCV Tools {dcv_core.program_version}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    for action, help_text in (("restart", "CASE 1 : DCV 사용 중 튕김 (dcvserver 재시작)"),
+                              ("blackscreen", "CASE 2 : DCV 처음 접속 시 검은 화면 (런레벨 3 → 5 변경)"),
+                              ("diagnose", "자동 진단 : 상태를 한 번에 조회하여 CASE 1 / CASE 2 중 필요한 조치 추천")):
+        sub = subparsers.add_parser(action, help=help_text)
+        sub.add_argument("--host", required=True, help="DCV 접속 IP")
+        sub.add_argument("--port", type=int, default=22, help="SSH 포트 (기본 22)")
+        sub.add_argument("-u", "--user", required=True, help="SSH 접속 계정")
+        sub.add_argument("--host-class", help=f"대기 정책 등급 ({' / '.join(host_classes)}, 생략 시 설정 파일 기준)")
+        sub.add_argument("--remote-runner", action="store_true", help="원격 일괄 실행 모드 (조치 전체를 원격 스크립트 1회 실행으로 수행)")
+        sub.add_argument("--jump", help="경유 서버(bastion) [사용자@]호스트[:포트] - 비밀번호는 DCV_TOOLS_JUMP_PASSWORD (생략 시 접속 비밀번호)")
+        sub.add_argument("--profile", choices=list(transport_profiles), default="default", help="접속 프로필 (high-latency = VPN 등 고지연 회선용)")
+        sub.add_argument("--format", choices=("json", "text"), default="json", help="출력 형식 (기본 json)")
+        if action == "diagnose":
+            sub.add_argument("--fix", action="store_true", help="추천된 조치까지 수행")
+
+    sub = subparsers.add_parser("collect", help="진단 자료 수집 : journalctl / Xorg / GDM / DCV 로그를 tar.gz 로 저장")
+    sub.add_argument("--host", required=True, help="DCV 접속 IP")
+    sub.add_argument("--port", type=int, default=22, help="SSH 포트 (기본 22)")
+    sub.add_argument("-u", "--user", required=True, help="SSH 접속 계정")
+    sub.add_argument("-o", "--output", help=f"저장 경로 (생략 시 {dcv_diagnostics.bundle_dir} 아래에 저장)")
+    sub.add_argument("--jump", help="경유 서버(bastion) [사용자@]호스트[:포트] - 비밀번호는 DCV_TOOLS_JUMP_PASSWORD (생략 시 접속 비밀번호)")
+    sub.add_argument("--profile", choices=list(transport_profiles), default="default", help="접속 프로필 (high-latency = VPN 등 고지연 회선용)")
+    sub.add_argument("--format", choices=("json", "text"), default="json", help="출력 형식 (기본 json)")
+
+    sub = subparsers.add_parser("fleet", help="여러 호스트에 CASE 1 / CASE 2 조치를 동시에 수행")
+    sub.add_argument("action", choices=sorted(dcv_core.remediation_flows) + ["auto"], help="restart = CASE 1, blackscreen = CASE 2, auto = 진단 후 필요한 조치만")
+    sub.add_argument("inventory", nargs="+", help="인벤토리 파일 경로 또는 IP / IP:포트 / CIDR (쉼표 구분 가능)")
+    sub.add_argument("-u", "--user", required=True, help="SSH 접속 계정")
+    sub.add_argument("-c", "--concurrency", type=int, default=10, help="동시 조치 호스트 수 (기본 10)")
+    sub.add_argument("-t", "--host-timeout", type=float, default=120, help="호스트별 제한시간(초) (기본 120)")
+    sub.add_argument("--host-class", help=f"대기 정책 등급 ({' / '.join(host_classes)}, 생략 시 호스트별 설정 파일 기준)")
+    sub.add_argument("--remote-runner", action="store_true", help="원격 일괄 실행 모드 (조치 전체를 원격 스크립트 1회 실행으로 수행)")
+    sub.add_argument("--jump", help="경유 서버(bastion) [사용자@]호스트[:포트] - 비밀번호는 DCV_TOOLS_JUMP_PASSWORD (생략 시 접속 비밀번호)")
+    sub.add_argument("--profile", choices=list(transport_profiles), default="default", help="접속 프로필 (high-latency = VPN 등 고지연 회선용)")
+    sub.add_argument("--format", choices=("json", "text"), default="json", help="출력 형식 (기본 json)")
+
+    sub = subparsers.add_parser("watch", help="감시 모드 : 여러 호스트를 주기적으로 진단하여 CASE 1 / CASE 2 자동 조치")
+    sub.add_argument("inventory", nargs="+", help="인벤토리 파일 경로 또는 IP / IP:포트 / CIDR (쉼표 구분 가능)")
+    sub.add_argument("-u", "--user", required=True, help="SSH 접속 계정")
+    sub.add_argument("-i", "--interval", type=float, default=30, help="호스트별 상태 확인 주기(초) (기본 30)")
+    sub.add_argument("-c", "--concurrency", type=int, default=5, help="전체 동시 조치 호스트 수 (기본 5)")
+    sub.add_argument("-w", "--workers", type=int, default=32, help="상태 확인 작업 스레드 수 (기본 32)")
+    sub.add_argument("--threshold", type=int, default=2, help="연속 이상 확인 횟수 - 이 횟수 이상이면 조치 (기본 2)")
+    sub.add_argument("--max-actions", type=int, default=3, help="호스트별 기간 내 최대 자동 조치 횟수 (기본 3)")
+    sub.add_argument("--period", type=float, default=3600, help="조치 횟수 제한 기간(초) (기본 3600)")
+    sub.add_argument("--duration", type=float, help="감시 시간(초) (생략 시 종료 신호를 받을 때까지)")
+    sub.add_argument("--dry-run", action="store_true", help="조치 없이 감지 결과만 출력")
+    sub.add_argument("--view", action="store_true", help="호스트 현황 창 표시 (PyQt6 필요 - 창을 닫으면 감시 종료)")
+    sub.add_argument("--host-class", help=f"대기 정책 등급 ({' / '.join(host_classes)}, 생략 시 호스트별 설정 파일 기준)")
+    sub.add_argument("--remote-runner", action="store_true", help="원격 일괄 실행 모드 (조치 전체를 원격 스크립트 1회 실행으로 수행)")
+    sub.add_argument("--jump", help="경유 서버(bastion) [사용자@]호스트[:포트] - 비밀번호는 DCV_TOOLS_JUMP_PASSWORD (생략 시 접속 비밀번호)")
+    sub.add_argument("--profile", choices=list(transport_profiles), default="default", help="접속 프로필 (high-latency = VPN 등 고지연 회선용)")
+    sub.add_argument("--format", choices=("json", "text"), default="json", help="출력 형식 (기본 json - 이벤트마다 한 줄)")
+
+    sub = subparsers.add_parser("history", help="조치 이력 조회 : 호스트별 소요 시간 p95 / 반복 조치 호스트 / 최근 기록 (접속하지 않음)")
+    sub.add_argument("report", choices=("p95", "frequent", "recent"), help="p95 = 호스트별 소요 시간 p95, frequent = 반복 조치 호스트, recent = 최근 기록")
+    sub.add_argument("action", nargs="?", choices=sorted(dcv_core.remediation_flows), help="조치 (p95 / frequent 는 필수)")
+    sub.add_argument("--host", help="호스트 IP 또는 사용자@IP:포트 (recent 에만 적용)")
+    sub.add_argument("--days", type=float, help="조회 기간(일) (생략 시 p95 = 전체, frequent = 이번 주)")
+    sub.add_argument("--min-count", type=int, default=4, help="frequent 기준 조치 횟수 (기본 4 - 3회 초과)")
+    sub.add_argument("--limit", type=int, default=20, help="recent 출력 개수 (기본 20)")
+    sub.add_argument("--format", choices=("json", "text"), default="json", help="출력 형식 (기본 json)")
+    return parser
+
+
+# 단일 호스트 조치 수행
+def run_single(args, password, startup_ms):
+    session = SSHSessionManager(args.host, args.user, password, port=args.port, jump=jump_host(args, password),
+                                profile=profile_for(args.profile))
+    output = {"host": args.host, "action": args.command, "ok": False, "message": "", "elapsed": 0.0}
+    try:
+        session.connect()
+        policy = policy_for_host(args.host, args.host_class, key=dcv_capability.cache_key(session))
+        flows = dcv_runner.remote_flows if args.remote_runner else dcv_core.remediation_flows
+        result = flows[args.command](session, policy=policy)
+        output.update(ok=result.ok, message=result.message, elapsed=round(result.elapsed, 3))
+        code = 0 if result.ok else 1
+    except StepTimeout as e:
+        # 응답이 멈춘 단계를 함께 기록
+        output.update(message=f"오류 발생: {e}", stalled_step=e.step)
+        code = 2
+    except Exception as e:
+        output["message"] = f"오류 발생: {e}"
+        code = 2
+    finally:
+        session.close()
+    output["startup_ms"] = startup_ms
+    output["session"] = session.stats()
+
+    if args.format == "json":
+        print(json.dumps(output, ensure_ascii=False))
+    else:
+        print(f"[{args.host}] {output['message']} ({output['elapsed']}초)")
+    return code
+
+
+# 자동 진단 (--fix 이면 추천된 조치까지 수행) - 종료 코드는 이상 없음(또는 조치 성공) 0 / 조치 필요(또는 조치 실패) 1 / 오류 2
+def run_diagnose(args, password, startup_ms):
+    session = SSHSessionManager(args.host, args.user, password, port=args.port, jump=jump_host(args, password),
+                                profile=profile_for(args.profile))
+    output = {"host": args.host, "action": "diagnose", "recommendation": None, "reasons": [], "notes": []}
+    try:
+        session.connect()
+        tracer = dcv_trace.begin(session, "diagnose")
+        try:
+            diagnosis = dcv_triage.triage(session)
+        finally:
+            tracer.finish("ok")
+        output.update(recommendation=diagnosis.action, reasons=diagnosis.reasons, notes=diagnosis.notes, report=vars(diagnosis.report))
+        output["message"] = f"추천 조치: {diagnosis.case_name}"
+        code = 0 if diagnosis.action is None else 1
+        if args.fix and diagnosis.action is not None:
+            flows = dcv_runner.remote_flows if args.remote_runner else dcv_core.remediation_flows
+            result = flows[diagnosis.action](session, policy=policy_for_host(args.host, args.host_class, key=dcv_capability.cache_key(session)))
+            output.update(ok=result.ok, message=result.message, elapsed=round(result.elapsed, 3))
+            code = 0 if result.ok else 1
+    except StepTimeout as e:
+        output.update(message=f"오류 발생: {e}", stalled_step=e.step)
+        code = 2
+    except Exception as e:
+        output["message"] = f"오류 발생: {e}"
+        code = 2
+    finally:
+        session.close()
+    output["startup_ms"] = startup_ms
+    output["session"] = session.stats()
+
+    if args.format == "json":
+        print(json.dumps(output, ensure_ascii=False))
+    else:
+        print(f"[{args.host}] {output['message']}")
+        for reason in output["reasons"] + output["notes"]:
+            print(f"  - {reason}")
+    return code
+
+
+# 진단 자료 수집 - 종료 코드는 전체 수집 0 / 일부 항목 실패 1 / 오류 2
+def run_collect(args, password, startup_ms):
+    session = SSHSessionManager(args.host, args.user, password, port=args.port, jump=jump_host(args, password),
+                                profile=profile_for(args.profile))
+    output = {"host": args.host, "action": "collect", "path": None, "message": ""}
+    try:
+        session.connect()
+        bundle = dcv_diagnostics.collect_bundle(session, args.output)
+        output.update(path=bundle.path, bytes=bundle.total_bytes, elapsed=round(bundle.elapsed, 3), items=bundle.items,
+                      message=f"진단 자료 저장 완료 ({len(bundle.items) - len(bundle.errors)}/{len(bundle.items)}개 항목)")
+        code = 1 if bundle.errors else 0
+    except StepTimeout as e:
+        output.update(message=f"오류 발생: {e}", stalled_step=e.step)
+        code = 2
+    except Exception as e:
+        output["message"] = f"오류 발생: {e}"
+        code = 2
+    finally:
+        session.close()
+    output["startup_ms"] = startup_ms
+    output["session"] = session.stats()
+
+    if args.format == "json":
+        print(json.dumps(output, ensure_ascii=False))
+    else:
+        print(f"[{args.host}] {output['message']}" + (f" - {output['path']}" if output["path"] else ""))
+    return code
+
+
+# 여러 호스트 동시 조치 수행
+def run_fleet(args, password, startup_ms):
+    hosts = dcv_fleet.load_inventory(args.inventory)
+    jump = jump_host(args, password)
+    results, summary = dcv_fleet.run_fleet(hosts, args.action, args.user, password, args.concurrency, args.host_timeout,
+                                           host_class=args.host_class, remote=args.remote_runner, jump=jump,
+                                           profile=profile_for(args.profile))
+    if args.format == "json":
+        summary["startup_ms"] = startup_ms
+        if jump is not None:
+            summary["jump"] = jump.stats()
+        print(json.dumps({"results": [dict(vars(result), elapsed=round(result.elapsed, 3)) for result in results], "summary": summary}, ensure_ascii=False))
+    else:
+        print(dcv_fleet.format_table(results, summary))
+    return 0 if summary["ok"] == summary["hosts"] else 1
+
+
+# 감시 모드 - 상태 변화 / 조치 이벤트를 한 줄씩 출력하고 SIGINT / SIGTERM 을 받으면 진행 중인 작업을 취소하고 종료
+def run_watch(args, password, startup_ms):
+    def on_event(event):
+        if args.format == "json":
+            print(json.dumps(event, ensure_ascii=False), flush=True)
+        else:
+            stamp = time.strftime("%H:%M:%S", time.localtime(event["time"]))
+            print(f"{stamp} [{event['host']}] {event['event']:<15} {event['message']}", flush=True)
+
+    hosts = dcv_fleet.load_inventory(args.inventory)
+    watchdog = dcv_watchdog.Watchdog(hosts, args.user, password, interval=args.interval, concurrency=args.concurrency,
+                                     probe_workers=args.workers, max_actions=args.max_actions, period=args.period,
+                                     threshold=args.threshold, dry_run=args.dry_run, host_class=args.host_class,
+                                     remote=args.remote_runner, jump=jump_host(args, password),
+                                     profile=profile_for(args.profile), on_event=on_event)
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, lambda signum, frame: watchdog.stop())
+    if args.view:
+        # 현황 창을 쓸 때만 Qt 모듈을 불러옴
+        import dcv_hostview
+        dcv_hostview.run_watch_view(watchdog, args.duration)
+    else:
+        watchdog.run(args.duration)
+    summary = dict(watchdog.summary(), hosts=len(hosts), startup_ms=startup_ms)
+    print(json.dumps({"summary": summary}, ensure_ascii=False) if args.format == "json" else f"종료 - {summary}", flush=True)
+    return 0
+
+
+# 조치 이력 조회 (원격 접속 없이 로컬 이력 저장소만 조회)
+def run_history(args):
+    if args.report != "recent" and args.action is None:
+        print(json.dumps({"error": f"{args.report} 조회에는 조치(restart / blackscreen)를 지정해야 합니다"}, ensure_ascii=False))
+        return 2
+    since = time.time() - args.days * 86400 if args.days else None
+    if args.report == "p95":
+        rows = [{"host": host, "p95": round(p95, 3), "runs": runs}
+                for host, (p95, runs) in sorted(dcv_history.host_percentiles(args.action, 0.95, since).items(), key=lambda item: -item[1][0])]
+        header, line = f"{'HOST':<30}{'P95(s)':>8}{'RUNS':>6}", "{host:<30}{p95:>8.1f}{runs:>6}"
+    elif args.report == "frequent":
+        rows = [{"host": host, "runs": runs}
+                for host, runs in dcv_history.frequent_hosts(args.action, since or dcv_history.week_start(), args.min_count)]
+        header, line = f"{'HOST':<30}{'RUNS':>6}", "{host:<30}{runs:>6}"
+    else:
+        rows = dcv_history.recent_runs(args.action, args.host, args.limit)
+        for row in rows:
+            row["started_at"] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(row["started_at"]))
+            row["duration"] = round(row["duration"], 3)
+        header = f"{'STARTED':<21}{'HOST':<30}{'ACTION':<13}{'OUTCOME':<9}{'TIME(s)':>8}{'RETRY':>6}  ERROR"
+        line = "{started_at:<21}{host:<30}{action:<13}{outcome!s:<9}{duration:>8.1f}{retries:>6}  {error}"
+    if args.format == "json":
+        print(json.dumps({"report": args.report, "action": args.action, "rows": rows}, ensure_ascii=False))
+    else:
+        print("\n".join([header] + [line.format(**dict(row, error=row.get("error") or "")) for row in rows]))
+    return 0
+
+
+# startup_clock: 프로그램 시작 시점(perf_counter) - 명령 수행 준비까지 걸린 시간(startup_ms)을 결과에 함께 기록
+def main(argv=None, startup_clock=None):
+    args = build_parser().parse_args(argv)
+    startup_ms = round((time.perf_counter() - startup_clock) * 1000, 1) if startup_clock is not None else None
+    if args.command == "history":
+        return run_history(args)
+    password = read_password()
+    try:
+        if args.command == "watch":
+            return run_watch(args, password, startup_ms)
+        if args.command == "fleet":
+            return run_fleet(args, password, startup_ms)
+        if args.command == "diagnose":
+            return run_diagnose(args, password, startup_ms)
+        if args.command == "collect":
+            return run_collect(args, password, startup_ms)
+        return run_single(args, password, startup_ms)
+    finally:
+        close_jump_hosts()
+        dcv_history.close() # 남은 조치 이력 저장
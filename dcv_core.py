@@ -0,0 +1,297 @@
+import time
+from dataclasses import dataclass, field
+import dcv_capability
+import dcv_trace
+from dcv_policy import WaitPolicy
+from dcv_session import BackgroundLost, CommandFailed
+
+# GUI(Qt)와 무관한 원격 명령 구성 / 결과 파싱 / 조치(CASE 1, CASE 2) 수행 함수 모음
+
+program_version = '1.1' # 프로그램 버전 기록용
+service_name = "dcvserver" # 조치 대상 서비스
+recent_restart_window = 10 # active가 된 지 이 시간(초) 이내여야 재시작 성공으로 구분
+default_policy = WaitPolicy() # 대기 정책을 지정하지 않았을 때 사용하는 기본값
+min_step_timeout = 5 # 전체 제한 시간이 거의 끝난 뒤 시작한 단계에도 보장하는 최소 대기 시간(초)
+
+# 서비스 상태 확인 결과 (활성 상태 / 활성화 시점 / 원격지 시간을 한 번에 조회한 값)
+@dataclass
+class ServiceProbe:
+    active_state: str = "unknown"
+    active_enter: int = 0 # 서비스가 active가 된 시간 (epoch 초)
+    now: int = 0 # 원격지 현재 시간 (epoch 초)
+
+    @property
+    def is_active(self):
+        return self.active_state == "active"
+
+    # 서비스가 active 상태가 된 뒤 경과한 시간(초) (알 수 없으면 None)
+    @property
+    def active_age(self):
+        if not self.active_enter or not self.now:
+            return None
+        return self.now - self.active_enter
+
+    # active 상태이면서 window초 이내에 (재)시작되었는지 확인
+    def recently_restarted(self, window=10):
+        age = self.active_age
+        return self.is_active and age is not None and age <= window
+
+
+# 서비스가 active가 된 시간과 원격지 현재 시간을 같은 시계(epoch 초)로 출력하는 명령어
+# (ActiveEnterTimestampMonotonic 은 절전 중 멈추는 CLOCK_MONOTONIC, /proc/uptime 은 절전 중에도 흐르는 CLOCK_BOOTTIME 이라
+#  두 값을 빼면 절전했던 호스트에서 경과 시간이 절전 시간만큼 커짐 - 같은 시계 값끼리 비교)
+# --timestamp=unix 를 지원하지 않는 systemd(248 미만)는 UTC 로 출력한 시간을 원격지 date 로 변환
+def active_enter_command(service_name):
+    return (
+        f"t=$(systemctl show {service_name} --property=ActiveEnterTimestamp --timestamp=unix 2>/dev/null | cut -d= -f2);"
+        f' [ -n "$t" ] || {{ t=$(TZ=UTC systemctl show {service_name} --property=ActiveEnterTimestamp | cut -d= -f2-);'
+        ' [ -n "$t" ] && t=@$(TZ=UTC date -d "$t" +%s 2>/dev/null); };'
+        " echo ActiveEnterTimestamp=$t; echo Now=$(date +%s)"
+    )
+
+# active_enter_command 출력의 "@<epoch 초>" 값을 정수로 변환 (값이 없으면 0)
+def parse_epoch(value):
+    return to_int((value or "").lstrip("@"))
+
+# 서비스 상태 / 활성화 시점 / 원격지 시간을 한 번의 왕복으로 조회하는 명령어
+def service_probe_command(service_name):
+    return f"systemctl show {service_name} --property=ActiveState; " + active_enter_command(service_name)
+
+# service_probe_command 결과(key=value 줄 목록)를 ServiceProbe로 변환
+def parse_service_probe(output):
+    values = parse_key_values(output)
+    probe = ServiceProbe()
+    probe.active_state = values.get("ActiveState") or "unknown"
+    probe.active_enter = parse_epoch(values.get("ActiveEnterTimestamp"))
+    probe.now = to_int(values.get("Now"))
+    return probe
+
+# 세션에서 상태 조회 명령을 1회 실행하고 파싱된 결과를 반환
+def probe_service(session, service_name, timeout=None):
+    return parse_service_probe(session.run(service_probe_command(service_name), step="probe:service", timeout=timeout))
+
+# 단계별 최대 대기 시간 - 조치 전체 제한 시간의 남은 시간 (최소 min_step_timeout초 보장, deadline 이 없으면 세션 기본값)
+def step_timeout(deadline):
+    return None if deadline is None else max(deadline.remaining(), min_step_timeout)
+
+
+# "key=value" 형식의 여러 줄 출력을 dict로 변환
+def parse_key_values(output):
+    values = {}
+    for line in output.splitlines():
+        if "=" in line:
+            key, value = line.split("=", 1)
+            values[key.strip()] = value.strip()
+    return values
+
+def to_int(value, default=0):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+def to_float(value, default=0.0):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+# 상태 대기 결과 (목표 상태 도달 여부 / 마지막 상태 / 관찰된 상태 변화 목록)
+@dataclass
+class WaitResult:
+    reached: bool = False
+    state: str = "unknown"
+    transitions: list = field(default_factory=list)
+
+# 원격지에서 상태 확인 명령을 직접 반복 실행하며 상태가 바뀔 때만 "STATE <값>"을 출력하는 감시 스크립트
+# 목표 상태에 도달하는 즉시 0으로 종료하고, 확인 간격 목록(intervals)을 모두 소진하면 124로 종료 (종료 전 "POLLS <확인 횟수>" 출력)
+# (클라이언트가 매번 새 명령을 보내는 대신 채널 1개에 원격 프로세스 1개만 유지)
+def watch_state_command(check_command, targets, intervals):
+    target_list = " ".join(targets)
+    sleeps = " ".join(str(value) for value in intervals)
+    return (
+        "last=; n=0;"
+        f" for d in {sleeps} 0; do n=$((n+1)); s=$({check_command} 2>/dev/null); s=${{s:-unknown}};"
+        ' if [ "$s" != "$last" ]; then echo "STATE $s"; last=$s; fi;'
+        f' case " {target_list} " in *" $s "*) echo "POLLS $n"; exit 0;; esac;'
+        ' [ "$d" = 0 ] || sleep $d; done; echo "POLLS $n"; exit 124'
+    )
+
+# 상태가 targets 중 하나가 될 때까지 최대 timeout초 대기 (도달하는 순간 반환)
+# 확인 간격은 대기 정책(policy)에 따라 처음엔 짧게, 이후 점점 길게 적용
+# abort: 함께 진행 중인 명령의 실패 확인 함수 (background_failure) - 실패하면 대기를 바로 중단
+def wait_for_state(session, check_command, targets, timeout, policy=None, abort=None):
+    policy = policy or default_policy
+    result = WaitResult()
+    with session.tracer.span("wait:" + ",".join(targets), check=check_command) as attrs:
+        intervals = policy.intervals(timeout)
+        command = watch_state_command(check_command, targets, intervals)
+        # 원격 감시 스크립트의 대기 시간보다 조금 넉넉하게 채널 타임아웃을 설정
+        for line in session.stream(command, timeout=timeout + 10, step="exec:watch", abort=abort):
+            if line.startswith("STATE "):
+                result.state = line[6:].strip()
+                result.transitions.append(result.state)
+            elif line.startswith("POLLS "):
+                # 실제 확인 횟수 - 첫 확인 이후는 재확인으로 이력의 재시도 횟수에 포함
+                attrs["polls"] = int(line[6:])
+                attrs["rechecks"] = max(attrs["polls"] - 1, 0)
+        result.reached = result.state in targets
+        attrs["reached"] = result.reached
+    return result
+
+# 서비스/타겟 유닛이 states 상태가 될 때까지 대기
+def wait_for_unit_state(session, unit, states=("active",), timeout=10, policy=None):
+    return wait_for_state(session, f"systemctl is-active {unit}", states, timeout, policy)
+
+# 현재 런레벨 확인 명령어 (runlevel 명령이 없는 호스트는 graphical.target 활성 여부로 5 / 3 판단)
+def runlevel_command(capabilities=None):
+    if capabilities is not None and not capabilities.has_runlevel:
+        return "if systemctl is-active -q graphical.target; then echo 5; else echo 3; fi"
+    return "runlevel | awk '{print $2}'"
+
+# 현재 런레벨이 runlevel 값이 될 때까지 대기
+def wait_for_runlevel(session, runlevel, timeout=20, policy=None, abort=None):
+    return wait_for_state(session, runlevel_command(session.capabilities), (str(runlevel),), timeout, policy, abort)
+
+# 백그라운드 명령(Future)이 실패로 끝났으면 예외를 반환하는 함수 (상태 감시 중 주기적으로 확인 - 끝나지 않았거나 성공이면 None)
+# 재접속으로 결과를 받지 못한 경우(BackgroundLost)는 실패로 보지 않고 상태 감시 결과로 판단
+def background_failure(future, step):
+    def check():
+        if not future.done():
+            return None
+        error = future.exception()
+        if isinstance(error, BackgroundLost):
+            return None
+        if error is not None:
+            return error
+        result = future.result()
+        if result.exit_status not in (0, None):
+            return CommandFailed(step, result.exit_status, result.stderr)
+        return None
+    return check
+
+
+# 조치 수행 결과
+@dataclass
+class RemediationResult:
+    action: str
+    ok: bool = False
+    message: str = ""
+    elapsed: float = 0.0
+    trace_path: str = None # 저장된 JSON 트레이스 파일 경로
+
+# 접속 사용자가 root가 아니면 sudo를 붙여서 명령 실행 (capabilities: dcv_capability.HostCapabilities)
+def systemctl_command(capabilities, args):
+    return f"{capabilities.sudo_prefix}systemctl {args}"
+
+# [CASE 1] 서비스 재시작 명령 송신 (재시작 작업이 끝날 때까지 대기) 후 원격 환경 정보 반환
+# (접속 사용자 / sudo 사용 방식은 로그인 시 조회해 둔 캐시를 사용 - 매번 whoami 를 실행하지 않음)
+# deadline: 조치 전체 제한 시간 (재시작 명령이 끝나지 않으면 StepTimeout, 실패하면 상태 대기 없이 바로 CommandFailed)
+def send_restart(session, service=service_name, deadline=None):
+    with session.tracer.span("send_restart"):
+        capabilities = dcv_capability.capabilities_for(session)
+        session.triage = None # 상태가 바뀌므로 이전 진단 결과 무효화
+        session.check_call(systemctl_command(capabilities, f"restart {service}"), timeout=step_timeout(deadline))
+        return capabilities
+
+# [CASE 1] 서비스가 active가 될 때까지 감시 후 10초 이내에 재시작되었는지 확인
+# deadline: 조치 전체 제한 시간 (남은 시간만큼만 대기)
+def check_restarted(session, service=service_name, policy=None, deadline=None):
+    policy = policy or default_policy
+    deadline = deadline or policy.start("restart")
+    with session.tracer.span("check_restarted"):
+        wait_for_unit_state(session, service, ("active",), deadline.remaining(), policy)
+        return probe_service(session, service, step_timeout(deadline)).recently_restarted(recent_restart_window)
+
+# [CASE 2] 런레벨 3(multi-user.target)으로 변경하는 명령어 송신 후 원격 환경 정보 반환
+# isolate 명령은 전환이 끝날 때까지 블로킹되므로 별도 채널에서 실행하고 (출력은 끝까지 읽어 채널 버퍼가 차지 않도록 함)
+# 결과를 기다리지 않고 바로 런레벨 감시를 시작 (두 채널이 같은 Transport 위에서 동시에 진행)
+def send_isolate_multi_user(session, deadline=None):
+    with session.tracer.span("send_isolate_multi_user"):
+        capabilities = dcv_capability.capabilities_for(session)
+        session.triage = None
+        session.start_background(systemctl_command(capabilities, "isolate multi-user.target"), step="exec:isolate multi-user",
+                                 timeout=step_timeout(deadline))
+        return capabilities
+
+# 마지막으로 시작한 백그라운드 명령의 실패 확인 함수 (없으면 None)
+def last_background_failure(session, step):
+    return background_failure(session.background[-1], step) if session.background else None
+
+# [CASE 2] 런레벨 3이 되는 즉시 런레벨 5(graphical.target)로 다시 변경하는 명령어 송신
+# (런레벨 3 전환 명령이 실패로 끝나면 제한 시간까지 기다리지 않고 바로 CommandFailed)
+def switch_to_graphical(session, capabilities, policy=None, deadline=None):
+    policy = policy or default_policy
+    deadline = deadline or policy.start("blackscreen")
+    with session.tracer.span("switch_to_graphical"):
+        abort = last_background_failure(session, "exec:isolate multi-user")
+        result = wait_for_runlevel(session, 3, deadline.remaining(), policy, abort)
+        if result.reached:
+            session.start_background(systemctl_command(capabilities, "isolate graphical.target"), step="exec:isolate graphical",
+                                     timeout=step_timeout(deadline))
+        return result.reached
+
+# [CASE 2] 런레벨 5로 복귀했는지 확인 후 백그라운드 명령(isolate)이 끝날 때까지 대기하여 채널 정리
+def check_graphical(session, policy=None, deadline=None):
+    policy = policy or default_policy
+    deadline = deadline or policy.start("blackscreen")
+    with session.tracer.span("check_graphical") as attrs:
+        abort = last_background_failure(session, "exec:isolate graphical")
+        reached = wait_for_runlevel(session, 5, deadline.remaining(), policy, abort).reached
+        # 전환 명령의 결과는 조치 성공 여부에 영향을 주지 않고 트레이스에만 기록
+        attrs["background"] = [getattr(result, "exit_status", str(result)) for result in session.join_background(step_timeout(deadline))]
+        return reached
+
+# CASE 1 (DCV 사용 중 튕김) 조치 전체 수행 - progress(퍼센트) 콜백으로 진행상황 전달
+# policy: 대기 정책 (호스트 등급별 정책 - 생략 시 기본값)
+def restart_flow(session, service=service_name, progress=None, policy=None):
+    progress = progress or (lambda value: None)
+    policy = policy or default_policy
+    result = RemediationResult("restart")
+    tracer = dcv_trace.begin(session, "restart")
+    deadline = policy.start("restart")
+    start = time.monotonic()
+    try:
+        progress(0)
+        send_restart(session, service, deadline)
+        progress(20)
+        result.ok = check_restarted(session, service, policy, deadline)
+        progress(100 if result.ok else 0)
+        result.message = "CASE 1 조치 완료" if result.ok else "CASE 1 조치 실패"
+    except Exception:
+        # 캐시된 사용자 / sudo 정보가 달라졌을 수 있으므로 다음 조치 때 다시 조회
+        dcv_capability.invalidate(session)
+        raise
+    finally:
+        result.elapsed = time.monotonic() - start
+        result.trace_path = tracer.finish("ok" if result.ok else "failed")
+    return result
+
+# CASE 2 (DCV 처음 접속 시 검은 화면) 조치 전체 수행
+def blackscreen_flow(session, progress=None, policy=None):
+    progress = progress or (lambda value: None)
+    policy = policy or default_policy
+    result = RemediationResult("blackscreen")
+    tracer = dcv_trace.begin(session, "blackscreen")
+    deadline = policy.start("blackscreen")
+    start = time.monotonic()
+    try:
+        progress(0)
+        capabilities = send_isolate_multi_user(session, deadline)
+        progress(20)
+        if switch_to_graphical(session, capabilities, policy, deadline):
+            progress(50)
+            result.ok = check_graphical(session, policy, deadline)
+        progress(100 if result.ok else 0)
+        result.message = "CASE 2 조치 완료" if result.ok else "CASE 2 조치 실패"
+    except Exception:
+        dcv_capability.invalidate(session)
+        raise
+    finally:
+        result.elapsed = time.monotonic() - start
+        result.trace_path = tracer.finish("ok" if result.ok else "failed")
+    return result
+
+# 조치 이름으로 수행할 함수를 찾기 위한 목록
+remediation_flows = {"restart": restart_flow, "blackscreen": blackscreen_flow}
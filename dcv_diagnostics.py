@@ -0,0 +1,249 @@
+import fnmatch
+import io
+import json
+import os
+import posixpath
+import shlex
+import stat
+import tarfile
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+
+import dcv_capability
+import dcv_core
+
+# 진단 자료 수집 - 조치가 실패했을 때 원격지 로그를 로컬 tar.gz 묶음으로 저장 (직접 접속해서 로그를 모을 필요 없음)
+# - 명령 출력(journalctl 등)은 원격지에서 gzip 으로 압축해 채널로 받고, 로그 파일은 SFTP 로 끝부분부터 받음
+# - 여러 항목을 동시에 받되 (같은 SSH 세션의 채널 여러 개) 항목마다 임시 파일에 기록해 메모리에 올리지 않음
+# - 항목별 / 전체 크기 제한을 넘으면 잘라서 받고 manifest.json 에 기록
+
+bundle_dir = os.environ.get("DCV_TOOLS_BUNDLE_DIR") or os.path.join(os.path.expanduser("~"), ".dcv_tools", "bundles")
+max_file_bytes = 20 * 1024 * 1024 # 로그 파일 1개 최대 크기 (넘으면 마지막 부분만 수집)
+max_command_bytes = 10 * 1024 * 1024 # 명령 출력 1개 최대 크기 (압축 전 기준)
+max_total_bytes = 100 * 1024 * 1024 # 전체 최대 크기 (넘으면 이후 파일은 남은 크기만큼만 수집)
+fetch_workers = 4 # 동시에 받는 항목 수
+fetch_timeout = 120 # 항목 1개 수집 제한 시간(초)
+chunk_size = 32768
+prefetch_requests = 32 # SFTP 로 한 번에 요청해 두는 읽기 수 (항목 1개가 메모리에 올리는 크기는 최대 prefetch_requests × chunk_size)
+
+# 수집할 명령 출력 (묶음 내 파일 이름, 명령)
+diagnostic_commands = (
+    ("journal-dcvserver.log", f"journalctl -u {dcv_core.service_name} -b --no-pager -n 20000"),
+    ("journal-display-manager.log", "journalctl -u display-manager -u gdm -b --no-pager -n 5000"),
+    ("systemctl-status.txt", f"systemctl status {dcv_core.service_name} graphical.target display-manager --no-pager -l"),
+    ("dcv-sessions.txt", "dcv list-sessions"),
+)
+# 수집할 로그 파일 (와일드카드는 파일 이름 부분에만 사용)
+diagnostic_files = (
+    "/var/log/dcv/*.log",
+    "/var/log/Xorg.*.log",
+    "/var/log/gdm/*",
+    "/var/lib/gdm/.local/share/xorg/Xorg.*.log",
+)
+
+
+# 수집 결과 (저장 경로 / 항목별 수집 내역 / 전체 크기)
+@dataclass
+class BundleResult:
+    path: str = None
+    items: list = field(default_factory=list)
+    total_bytes: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def errors(self):
+        return [item for item in self.items if item.get("error")]
+
+
+# 전체 크기 제한 관리 (여러 작업 스레드에서 공유)
+class ByteBudget:
+    def __init__(self, total):
+        self.remaining = total
+        self.lock = threading.Lock()
+
+    # 최대 wanted 바이트를 예약하고 실제 예약한 크기 반환
+    def reserve(self, wanted):
+        with self.lock:
+            granted = max(0, min(wanted, self.remaining))
+            self.remaining -= granted
+            return granted
+
+    def refund(self, unused):
+        with self.lock:
+            self.remaining += unused
+
+
+# 원격지 로그 파일 목록 조회 (SFTP) - [(경로, 크기)]
+def list_log_files(sftp, patterns=diagnostic_files):
+    files = []
+    for pattern in patterns:
+        directory, name_pattern = posixpath.split(pattern)
+        try:
+            entries = sftp.listdir_attr(directory)
+        except OSError:
+            continue
+        for entry in sorted(entries, key=lambda entry: entry.filename):
+            if fnmatch.fnmatch(entry.filename, name_pattern) and stat.S_ISREG(entry.st_mode or 0):
+                files.append((posixpath.join(directory, entry.filename), entry.st_size or 0))
+    return files
+
+
+# 명령 출력 수집 - 원격지에서 크기 제한 후 gzip 압축하여 전송 (sudo 를 비밀번호 없이 쓸 수 있으면 sudo 로 실행)
+# 받기 전에 최대 크기만큼 예약하고, 받은 뒤 압축된 크기를 제외한 나머지를 돌려줌
+def fetch_command(session, name, command, spool, budget):
+    item = {"name": name + ".gz", "source": command, "size": 0, "bytes": 0, "truncated": False}
+    granted = budget.reserve(max_command_bytes)
+    if granted <= 0:
+        item.update(truncated=True, error="전체 크기 제한 초과로 생략")
+        return item
+    capabilities = dcv_capability.capabilities_for(session)
+    prefix = capabilities.sudo_prefix if capabilities.sudo_nopasswd else ""
+    remote = f"{{ {prefix}{command}; }} 2>&1 | head -c {granted} | gzip -1 -c"
+    try:
+        with open(spool, "wb") as out:
+            item["bytes"] = session.copy_output(remote, out, step=f"collect:{name}", timeout=fetch_timeout)
+    finally:
+        budget.refund(granted - min(item["bytes"], granted))
+    # 압축 전 크기가 제한에 닿았으면 잘린 것으로 기록
+    item["size"] = gzip_size(spool)
+    item["truncated"] = item["size"] >= granted
+    return item
+
+# gzip 파일의 압축 전 크기 (끝 4바이트에 기록된 값 - 4GB 미만만 정확, 명령 출력 제한보다 충분히 큼)
+def gzip_size(path):
+    with open(path, "rb") as file:
+        if file.seek(0, os.SEEK_END) < 18:
+            return 0
+        file.seek(-4, os.SEEK_END)
+        return int.from_bytes(file.read(4), "little")
+
+
+# 로그 파일 수집 - 크기 제한을 넘으면 마지막 부분만 받음
+# 접속 계정으로 읽을 수 없는 파일은 sudo 를 비밀번호 없이 쓸 수 있으면 sudo tail 출력으로 받음
+def fetch_file(session, path, size, spool, budget):
+    item = {"name": path.lstrip("/"), "source": path, "size": size, "bytes": 0, "truncated": False}
+    wanted = budget.reserve(min(size, max_file_bytes))
+    if wanted <= 0:
+        item.update(truncated=True, error="전체 크기 제한 초과로 생략")
+        return item
+    try:
+        item["bytes"] = sftp_tail(session, path, size, wanted, spool)
+    except PermissionError:
+        capabilities = dcv_capability.capabilities_for(session)
+        if capabilities.user == "root" or not capabilities.sudo_nopasswd:
+            raise
+        with open(spool, "wb") as out:
+            item["bytes"] = session.copy_output(f"sudo -n tail -c {wanted} {shlex.quote(path)}", out,
+                                                step=f"collect:{posixpath.basename(path)}", timeout=fetch_timeout)
+        item["via"] = "sudo"
+    finally:
+        budget.refund(wanted - item["bytes"])
+    item["truncated"] = item["bytes"] < size
+    return item
+
+# SFTP 로 파일의 마지막 wanted 바이트를 받아 spool 파일에 기록
+# 읽기 요청을 prefetch_requests개씩 묶어 한 번에 보내고 받은 순서대로 기록 (파일 전체를 한꺼번에 요청하면 응답이 모두 메모리에 쌓임)
+def sftp_tail(session, path, size, wanted, spool):
+    received = 0
+    start = size - wanted
+    sftp = session.open_sftp(timeout=fetch_timeout)
+    try:
+        with session.tracer.span(f"collect:{posixpath.basename(path)}") as attrs:
+            with sftp.open(path, "rb") as remote, open(spool, "wb") as out:
+                while received < wanted:
+                    session.cancel_token.check()
+                    position = start + received
+                    end = min(size, position + prefetch_requests * chunk_size)
+                    batch = 0
+                    try:
+                        for data in remote.readv([(offset, min(chunk_size, end - offset)) for offset in range(position, end, chunk_size)]):
+                            out.write(data)
+                            batch += len(data)
+                    except EOFError:
+                        pass
+                    received += batch
+                    # 수집 중에 파일이 줄어든 경우 받은 만큼만 기록
+                    if batch < end - position:
+                        break
+            attrs["bytes"] = received
+    finally:
+        session.close_sftp(sftp)
+    return received
+
+
+# 진단 자료 수집 후 tar.gz 로 저장 (output: 저장 경로 - 생략 시 bundle_dir/<호스트>-<시간>.tar.gz)
+# progress(퍼센트) 콜백으로 진행상황 전달, 항목별 오류는 manifest 에 기록하고 나머지 항목은 계속 수집
+def collect_bundle(session, output=None, progress=None):
+    progress = progress or (lambda value: None)
+    start = time.monotonic()
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    base_name = f"dcv-diagnostics-{session.ip.replace(':', '_')}-{stamp}"
+    output = output or os.path.join(bundle_dir, base_name + ".tar.gz")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    result = BundleResult(path=output)
+    budget = ByteBudget(max_total_bytes)
+
+    progress(0)
+    sftp = session.open_sftp(timeout=fetch_timeout)
+    try:
+        log_files = list_log_files(sftp)
+    finally:
+        session.close_sftp(sftp)
+
+    temp_output = output + ".part"
+    with tempfile.TemporaryDirectory(prefix="dcv_bundle_") as spool_dir:
+        try:
+            write_bundle(session, temp_output, spool_dir, base_name, stamp, log_files, budget, result, progress)
+        except BaseException:
+            # 취소 / 오류 시 만들던 파일 삭제
+            if os.path.exists(temp_output):
+                os.remove(temp_output)
+            raise
+    os.replace(temp_output, output)
+
+    result.elapsed = time.monotonic() - start
+    progress(100)
+    return result
+
+
+# 항목을 동시에 받으면서 받기가 끝난 항목부터 tar.gz 에 추가
+def write_bundle(session, temp_output, spool_dir, base_name, stamp, log_files, budget, result, progress):
+    with tarfile.open(temp_output, "w:gz") as tar, ThreadPoolExecutor(max_workers=fetch_workers) as pool:
+        futures = {}
+        for index, (name, command) in enumerate(diagnostic_commands):
+            spool = os.path.join(spool_dir, f"command-{index}")
+            futures[pool.submit(fetch_command, session, name, command, spool, budget)] = (spool, name + ".gz", command)
+        for index, (path, size) in enumerate(log_files):
+            spool = os.path.join(spool_dir, f"file-{index}")
+            futures[pool.submit(fetch_file, session, path, size, spool, budget)] = (spool, path.lstrip("/"), path)
+
+        # 받기가 끝난 항목부터 묶음에 추가하고 임시 파일 삭제
+        for done, future in enumerate(as_completed(futures), 1):
+            spool, name, source = futures[future]
+            try:
+                item = future.result()
+            except Exception as e:
+                item = {"name": name, "source": source, "bytes": 0, "error": str(e)}
+            if os.path.exists(spool):
+                if not item.get("error"):
+                    tar.add(spool, arcname=f"{base_name}/{item['name']}")
+                os.remove(spool)
+            result.items.append(item)
+            result.total_bytes += item["bytes"]
+            progress(int(done * 95 / len(futures)))
+        # 취소된 경우 (항목별 오류로 기록된 상태) 묶음을 만들지 않고 중단
+        session.cancel_token.check()
+
+        manifest = json.dumps({
+            "host": session.ip,
+            "collected_at": stamp,
+            "limits": {"file_bytes": max_file_bytes, "command_bytes": max_command_bytes, "total_bytes": max_total_bytes},
+            "items": sorted(result.items, key=lambda item: item["name"]),
+        }, ensure_ascii=False, indent=2).encode("utf-8")
+        info = tarfile.TarInfo(f"{base_name}/manifest.json")
+        info.size = len(manifest)
+        info.mtime = time.time()
+        tar.addfile(info, io.BytesIO(manifest))
@@ -0,0 +1,168 @@
+import ipaddress
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+
+import dcv_capability
+import dcv_core
+import dcv_runner
+import dcv_triage
+from dcv_policy import policy_for_host
+from dcv_session import SSHSessionManager, StepTimeout
+
+# 여러 DCV 호스트에 CASE 1 / CASE 2 조치를 동시에 수행하는 플릿(다중 호스트) 실행 엔진
+
+start_poll = 0.5 # 작업 스레드가 비기를 기다리는 호스트가 있을 때 시작 여부 확인 간격(초)
+
+# 호스트별 조치 결과
+@dataclass
+class HostResult:
+    host: str
+    action: str
+    status: str = "pending" # ok / failed / error / timeout
+    message: str = ""
+    elapsed: float = 0.0
+
+
+# 인벤토리 파일 또는 "IP / IP:포트 / CIDR" 목록을 호스트 목록으로 변환 (중복 제거, 입력 순서 유지)
+# 파일은 한 줄에 하나씩 IP 또는 CIDR을 적고, '#' 뒤는 주석으로 처리
+def load_inventory(specs):
+    entries = []
+    for spec in specs:
+        if os.path.isfile(spec):
+            with open(spec, encoding="utf-8") as f:
+                for line in f:
+                    entries.extend(line.split("#", 1)[0].replace(",", " ").split())
+        else:
+            entries.extend(spec.replace(",", " ").split())
+
+    hosts = []
+    for entry in entries:
+        if "/" in entry:
+            network = ipaddress.ip_network(entry, strict=False)
+            hosts.extend(str(ip) for ip in (network.hosts() if network.num_addresses > 1 else [network.network_address]))
+        else:
+            hosts.append(entry)
+    return list(dict.fromkeys(hosts))
+
+
+# "IP" 또는 "IP:포트" 형식을 (IP, 포트)로 분리
+def split_host_port(host, default_port=22):
+    if host.count(":") == 1:
+        ip, port = host.split(":")
+        return ip, int(port)
+    return host, default_port
+
+
+# 호스트 1대에 접속하여 조치 수행 (작업 스레드에서 실행)
+# host_class: 대기 정책 등급 (생략 시 호스트 등급 설정 파일 기준)
+# remote: 원격 일괄 실행 모드 사용 여부 (조치 전체를 채널 1개로 수행)
+# jump: 경유 서버(JumpHost) - 모든 호스트가 경유 서버 접속 하나를 함께 사용 (호스트마다 터널만 새로 열림)
+# profile: 접속 프로필 (dcv_session.TransportProfile - 생략 시 기본)
+# started: 호스트별 실제 시작 시간을 기록할 dict (run_fleet 이 제한 시간 계산에 사용)
+def remediate_host(host, action, username, password, sessions, connect_timeout=10, host_class=None, remote=False, jump=None,
+                   profile=None, started=None):
+    result = HostResult(host, action)
+    start = time.monotonic()
+    if started is not None:
+        started[host] = start
+    ip, port = split_host_port(host)
+    session = SSHSessionManager(ip, username, password, port=port, timeout=connect_timeout, jump=jump, profile=profile)
+    sessions[host] = session
+    try:
+        session.connect()
+        flows = dcv_runner.remote_flows if remote else dcv_core.remediation_flows
+        policy = policy_for_host(ip, host_class, key=dcv_capability.cache_key(session))
+        if action == "auto":
+            # 진단 후 필요한 조치만 수행
+            outcome = dcv_triage.auto_flow(session, policy=policy, flows=flows)
+            result.action = outcome.action
+        else:
+            outcome = flows[action](session, policy=policy)
+        result.status = "ok" if outcome.ok else "failed"
+        result.message = outcome.message
+    except StepTimeout as e:
+        result.status = "timeout"
+        result.message = str(e)
+    except Exception as e:
+        result.status = "error"
+        result.message = str(e)
+    finally:
+        session.close()
+        sessions.pop(host, None)
+    result.elapsed = time.monotonic() - start
+    return result
+
+
+# 호스트 목록에 조치를 동시 수행 (최대 concurrency대 동시 진행, 호스트별 host_timeout초 제한)
+# on_result 콜백은 호스트 1대의 결과가 나올 때마다 호출
+def run_fleet(hosts, action, username, password, concurrency=10, host_timeout=120, on_result=None, host_class=None, remote=False,
+              jump=None, profile=None):
+    on_result = on_result or (lambda result: None)
+    results = {}
+    sessions = {} # 진행 중인 호스트의 세션 (제한시간 초과 시 강제 종료용)
+    started = {} # 호스트별 실제 시작 시간 (작업 스레드에서 기록)
+    pending = list(hosts)
+    running = {}
+    start = time.monotonic()
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        while pending or running:
+            # 동시 실행 수 제한 내에서 다음 호스트 투입
+            while pending and len(running) < concurrency:
+                host = pending.pop(0)
+                future = pool.submit(remediate_host, host, action, username, password, sessions, host_class=host_class, remote=remote,
+                                     jump=jump, profile=profile, started=started)
+                running[future] = host
+
+            # 제한시간은 작업 스레드가 실제로 시작한 시점부터 계산
+            # (시간 초과로 취소한 호스트가 아직 스레드를 점유하고 있으면 다음 호스트는 대기열에서 기다림)
+            deadlines = {future: started[host] + host_timeout for future, host in running.items() if host in started}
+            timeout = max(0, min(deadlines.values()) - time.monotonic()) if deadlines else start_poll
+            if len(deadlines) < len(running):
+                timeout = min(timeout, start_poll)
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                host = running.pop(future)
+                deadlines.pop(future, None)
+                results[host] = future.result()
+                on_result(results[host])
+
+            # 제한시간을 넘긴 호스트는 조치를 취소(채널 / 세션 종료)하여 블로킹된 작업을 풀어주고 timeout으로 기록
+            now = time.monotonic()
+            for future, deadline in deadlines.items():
+                if now >= deadline:
+                    host = running.pop(future)
+                    session = sessions.pop(host, None)
+                    if session is not None:
+                        session.cancel()
+                    results[host] = HostResult(host, action, "timeout", f"{host_timeout}초 내에 완료되지 않음", host_timeout)
+                    on_result(results[host])
+
+    elapsed = time.monotonic() - start
+    ordered = [results[host] for host in hosts if host in results]
+    return ordered, summarize(ordered, elapsed)
+
+
+# 전체 결과 집계 (상태별 개수 / 전체 소요 시간 / 분당 처리 호스트 수)
+def summarize(results, elapsed):
+    summary = {"hosts": len(results), "elapsed": round(elapsed, 2)}
+    for status in ("ok", "failed", "error", "timeout"):
+        summary[status] = sum(1 for result in results if result.status == status)
+    summary["hosts_per_minute"] = round(len(results) / elapsed * 60, 2) if elapsed > 0 else 0.0
+    return summary
+
+
+# 결과를 표 형식 문자열로 변환
+def format_table(results, summary):
+    lines = [f"{'HOST':<18}{'ACTION':<13}{'STATUS':<9}{'TIME(s)':>8}  MESSAGE"]
+    for result in results:
+        lines.append(f"{result.host:<18}{result.action:<13}{result.status:<9}{result.elapsed:>8.1f}  {result.message}")
+    lines.append("")
+    lines.append(
+        f"총 {summary['hosts']}대 / 성공 {summary['ok']} / 실패 {summary['failed']} / 오류 {summary['error']}"
+        f" / 시간초과 {summary['timeout']} / 소요 {summary['elapsed']}초 / 처리량 {summary['hosts_per_minute']} hosts/min"
+    )
+    return "\n".join(lines)
+
@@ -0,0 +1,900 @@
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QLabel, QLineEdit, QPushButton, QVBoxLayout, QFrame,
+    QHBoxLayout, QWidget, QMessageBox, QProgressBar, QDialog, QSizePolicy, QGraphicsDropShadowEffect, QCheckBox, QComboBox
+)
+from PyQt6.QtCore import Qt, QTimer, QThread, QObject, QRunnable, QThreadPool, QElapsedTimer, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon
+from dcv_session import SSHSessionManager, PendingTransport, warm_import, jump_host_for, close_jump_hosts, transport_profiles
+import dcv_capability
+import dcv_core
+import dcv_diagnostics
+import dcv_history
+import dcv_progress
+import dcv_runner
+import dcv_trace
+import dcv_triage
+from dcv_policy import policy_for_host
+import math
+import re
+import os
+import sys
+
+user_info = {"id": "", "pw": "", "ip": ""} # 사용자의 정보 저장
+ipv4_pattern = re.compile(r"^(?:\d{1,3}\.){3}\d{1,3}$")
+
+# IP주소 형식이 맞는지 확인
+def is_valid_ipv4(text):
+    return bool(ipv4_pattern.match(text)) and all(0 <= int(octet) <= 255 for octet in text.split('.'))
+
+# MAC OS에서 tkinter는 버튼 클릭 히트박스 이슈 / message(info/error/stop 등..)박스 아이콘 고정 이슈가 있음
+# PyQt6 모듈로 GUI모듈을 교체
+
+# SSH 접속 함수
+class SSHThread(QThread):
+    result_signal = pyqtSignal(str) 
+    def __init__(self, ip, username, password, timeout=10, pending=None, jump=None, profile=None):
+        super().__init__()
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        self.pending = pending # IP 입력 시 미리 키 교환까지 수행해 둔 접속 (있으면 인증만 수행)
+        self.jump = jump # 경유 서버 "[사용자@]호스트[:포트]" (없으면 직접 접속)
+        self.profile = profile # 접속 프로필 (dcv_session.TransportProfile)
+        self.session = None
+
+    def run(self): # 접속 시도 후 콜백 변수에 성공 유무를 반환 받음
+        session = None
+        try:
+            # 로그인 시 인증된 세션을 닫지 않고 유지하여 이후 모든 조치 기능에서 재사용
+            # 경유 서버는 같은 ID / PW 로 로그인 (이전에 로그인한 경유 서버 접속이 있으면 재사용)
+            jump = jump_host_for(self.jump, self.username, self.password, self.timeout) if self.jump else None
+            session = SSHSessionManager(self.ip, self.username, self.password, timeout=self.timeout, jump=jump, profile=self.profile)
+            tracer = dcv_trace.begin(session, "login")
+            outcome = "failed"
+            try:
+                session.connect(self.pending)
+                # 접속 사용자 / sudo 사용 방식 등 원격 환경 정보를 로그인 시 1회 조회 (파일 캐시가 유효하면 조회 생략)
+                dcv_capability.capabilities_for(session)
+                outcome = "ok"
+            finally:
+                tracer.finish(outcome)
+            self.session = session
+            self.result_signal.emit("success")
+        except Exception as e:
+            # 접속 후 단계(환경 정보 조회 등)에서 실패하면 보관하지 않을 세션의 Transport 를 정리
+            if session is not None:
+                session.close()
+            self.result_signal.emit(f"failure: {str(e)}")
+
+# 끝난 조치의 트레이스 저장 (파일 쓰기가 있으므로 작업 스레드에서 호출)
+def save_action(tracer, session, outcome):
+    if outcome == "error":
+        # 캐시된 사용자 / sudo 정보가 달라졌을 수 있으므로 다음 조치 때 다시 조회
+        dcv_capability.invalidate(session)
+    return tracer.finish(outcome)
+
+# 작업 스레드의 실행 결과를 GUI 스레드로 전달하기 위한 시그널 묶음
+class WorkerSignals(QObject):
+    result_signal = pyqtSignal(object)
+    error_signal = pyqtSignal(str)
+    progress_signal = pyqtSignal(int)
+
+# 블로킹 SSH 작업(명령 송신 / 결과 수신)을 스레드풀에서 수행하는 작업 단위
+# report_progress=True 이면 진행상황 보고 함수(progress_signal.emit)를 인자로 넘겨 호출
+class SSHWorker(QRunnable):
+    def __init__(self, fn, report_progress=False):
+        super().__init__()
+        self.fn = fn
+        self.report_progress = report_progress
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.fn(self.signals.progress_signal.emit) if self.report_progress else self.fn()
+        except Exception as e:
+            self.signals.error_signal.emit(str(e))
+        else:
+            self.signals.result_signal.emit(result)
+
+# 모든 원격 명령이 거쳐가는 실행 엔진 (GUI 스레드는 작업을 넘기고 결과 시그널만 받아 화면을 갱신)
+class TaskRunner:
+    def __init__(self, max_threads=4):
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(max_threads)
+        self.workers = set() # 작업이 끝날 때까지 시그널 객체가 해제되지 않도록 참조 유지
+
+    def submit(self, fn, on_result, on_error, on_progress=None):
+        worker = SSHWorker(fn, report_progress=on_progress is not None)
+        worker.setAutoDelete(False)
+        if on_progress is not None:
+            worker.signals.progress_signal.connect(on_progress)
+        worker.signals.result_signal.connect(on_result)
+        worker.signals.error_signal.connect(on_error)
+        worker.signals.result_signal.connect(lambda _: self.workers.discard(worker))
+        worker.signals.error_signal.connect(lambda _: self.workers.discard(worker))
+        self.workers.add(worker)
+        self.pool.start(worker)
+
+    # 남은 작업이 끝날 때까지 대기 (프로그램 종료 시 호출)
+    def shutdown(self, timeout_ms=3000):
+        self.pool.waitForDone(timeout_ms)
+
+# GUI 이벤트 루프가 멈춘 시간(stall)을 측정하는 감시 타이머
+# 일정 주기로 타이머를 돌려 예정보다 늦게 호출된 만큼을 이벤트 루프가 블로킹된 시간으로 집계
+class StallMonitor(QObject):
+    def __init__(self, interval_ms=20, parent=None):
+        super().__init__(parent)
+        self.interval_ms = interval_ms
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.on_tick)
+        self.clock = QElapsedTimer()
+        self.total_stall_ms = 0
+        self.max_stall_ms = 0
+
+    def start(self):
+        self.total_stall_ms = 0
+        self.max_stall_ms = 0
+        self.clock.start()
+        self.timer.start()
+
+    def stop(self):
+        self.timer.stop()
+
+    def on_tick(self):
+        elapsed = self.clock.restart()
+        stall = max(0, elapsed - self.interval_ms * 2) # 타이머 자체 오차(1주기)는 제외
+        self.total_stall_ms += stall
+        self.max_stall_ms = max(self.max_stall_ms, stall)
+
+    def stats(self):
+        return {"total_stall_ms": self.total_stall_ms, "max_stall_ms": self.max_stall_ms}
+
+# 프로그레스바 진행률 표시 엔진 - 조치 진행 중에만 타이머 1개로 갱신
+# 단계 시작 이벤트(step) / 작업이 보고한 진행률(report)을 받아 최근 단계별 소요 시간 기준 추정값(dcv_progress)까지 부드럽게 따라가고
+# 남은 예상 시간을 함께 표시 (기존에는 1% 마다 단발 타이머를 새로 만들어 이전 호출과 서로 경쟁했음)
+class ProgressEngine(QObject):
+    def __init__(self, bar, interval_ms=50, parent=None):
+        super().__init__(parent)
+        self.bar = bar
+        self.estimate = None
+        self.shown = 0.0
+        self.timer = QTimer(self)
+        self.timer.setInterval(interval_ms)
+        self.timer.timeout.connect(self.tick)
+
+    def start(self, action, host=None, history=None):
+        self.estimate = dcv_progress.ProgressEstimate(action, host, history=history)
+        self.shown = 0.0
+        self.bar.setValue(0)
+        self.bar.setFormat("%p%")
+        self.timer.start()
+
+    def step(self, name):
+        if self.estimate is not None:
+            self.estimate.step(name)
+
+    def report(self, percent):
+        if self.estimate is not None:
+            self.estimate.report(percent)
+
+    def finish(self, ok):
+        self.timer.stop()
+        self.estimate = None
+        self.bar.setFormat("%p%")
+        self.bar.setValue(100 if ok else 0)
+
+    def tick(self):
+        # 추정값으로 바로 뛰지 않고 주기마다 남은 차이의 30% 씩 접근
+        self.shown += (self.estimate.percent() - self.shown) * 0.3
+        value = int(self.shown)
+        remaining = self.estimate.remaining()
+        text = "%p%" if remaining is None else f"%p% (약 {math.ceil(remaining)}초 남음)"
+        if value != self.bar.value():
+            self.bar.setValue(value)
+        if text != self.bar.format():
+            self.bar.setFormat(text)
+
+# 로그인창 GUI 구성 클래스 + 로그인창에서 수행될 기능 함수들
+class LoginWindow(QMainWindow):
+    def __init__(self):
+        super().__init__()
+        # 타이틀명 / 창 사이즈 / 레이아웃 구성 / 간격, 위치 등을 선언
+        self.setWindowTitle("Login")
+        self.setFixedSize(310, 250)
+        # 응용프로그램 기본 아이콘 변경을 위한 아이콘 경로 설정
+        if hasattr(sys, '_MEIPASS'):
+            icon_path = os.path.join(sys._MEIPASS, 'ico.ico')
+        else:
+            icon_path = 'ico.ico'
+        self.setWindowIcon(QIcon(icon_path))
+
+        # ID 입력칸 위젯 속성 정의
+        self.label_id = QLabel("ID : ")
+        self.label_id.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.input_id = QLineEdit()
+        self.input_id.setFixedHeight(25)
+        self.input_id.setFixedWidth(200)
+        self.input_id.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+        # PW 입력칸 위젯 속성 정의
+        self.label_pw = QLabel("PW : ")
+        self.label_pw.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.input_pw = QLineEdit()
+        self.input_pw.setFixedHeight(25)
+        self.input_pw.setFixedWidth(200)
+        self.input_pw.setEchoMode(QLineEdit.EchoMode.Password)
+        self.input_pw.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+
+        # IP 입력칸 위젯 속성 정의
+        self.label_ip = QLabel("DCV 접속 IP : ")
+        self.label_ip.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.input_ip = QLineEdit()
+        self.input_ip.setFixedHeight(25)
+        self.input_ip.setFixedWidth(200)
+        self.input_ip.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        # IP 입력이 끝나면 (입력 멈춤 후 0.3초) 로그인 버튼을 누르기 전에 미리 접속 + 키 교환 수행
+        self.pending = None
+        self.prewarm_timer = QTimer(self)
+        self.prewarm_timer.setSingleShot(True)
+        self.prewarm_timer.setInterval(300)
+        self.prewarm_timer.timeout.connect(self.prewarm_connection)
+        self.input_ip.textChanged.connect(lambda _: self.prewarm_timer.start())
+
+        # 경유 서버 입력칸 위젯 속성 정의 (비워두면 직접 접속)
+        self.label_jump = QLabel("경유 서버 : ")
+        self.label_jump.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.input_jump = QLineEdit()
+        self.input_jump.setFixedHeight(25)
+        self.input_jump.setFixedWidth(200)
+        self.input_jump.setPlaceholderText("(선택) 사용자@호스트:포트")
+        self.input_jump.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        self.input_jump.textChanged.connect(lambda _: self.prewarm_timer.start())
+
+        # 접속 방식(접속 프로필) 선택 위젯 속성 정의 (VPN 등 고지연 회선이면 고지연 선택)
+        self.label_profile = QLabel("접속 방식 : ")
+        self.label_profile.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.input_profile = QComboBox()
+        self.input_profile.setFixedHeight(25)
+        self.input_profile.setFixedWidth(200)
+        self.input_profile.setSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        for profile in transport_profiles.values():
+            self.input_profile.addItem(profile.label, profile.name)
+        self.input_profile.currentIndexChanged.connect(lambda _: self.prewarm_timer.start())
+
+        # 에러메세지 출력을 위한 위젯 속성 정의
+        self.error_label = QLabel("")
+        self.error_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.error_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+        # 구분선 추가를 위한 구분선 위젯 속성 정의
+        self.separator = QFrame()
+        self.separator.setFrameShape(QFrame.Shape.HLine)
+        self.separator.setFrameShadow(QFrame.Shadow.Sunken)
+        self.separator.setFixedHeight(1)
+        self.separator.setStyleSheet("background-color: #ccc;")
+
+        # 로그인 버튼 위젯 속성 정의
+        self.login_button = QPushButton("로그인")
+        self.login_button.setFixedHeight(30)
+        self.login_button.clicked.connect(self.handle_login)
+
+        # 하단 카피라이트 위젯 속성 정의
+        self.copyright_label = QLabel("ⓒ2024 TheSsenVisualCraft Corp. All right reserved.")
+        self.copyright_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.copyright_label.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.copyright_label.setObjectName("copyrightLabel")
+
+        # 위에서 만든 아이템(위젯)을 서브레이아웃 생성 후 배치
+        id_layout = QHBoxLayout()
+        id_layout.addWidget(self.label_id)
+        id_layout.addWidget(self.input_id)
+        id_layout.setSpacing(0)
+        pw_layout = QHBoxLayout()
+        pw_layout.addWidget(self.label_pw)
+        pw_layout.addWidget(self.input_pw)
+        pw_layout.setSpacing(0)
+        ip_layout = QHBoxLayout()
+        ip_layout.addWidget(self.label_ip)
+        ip_layout.addWidget(self.input_ip)
+        ip_layout.setSpacing(0) 
+        jump_layout = QHBoxLayout()
+        jump_layout.addWidget(self.label_jump)
+        jump_layout.addWidget(self.input_jump)
+        jump_layout.setSpacing(0)
+        profile_layout = QHBoxLayout()
+        profile_layout.addWidget(self.label_profile)
+        profile_layout.addWidget(self.input_profile)
+        profile_layout.setSpacing(0)
+        label_layout = QVBoxLayout()
+        label_layout.addWidget(self.error_label, alignment=Qt.AlignmentFlag.AlignCenter)
+        label_layout.addWidget(self.separator)
+        label_layout.setSpacing(5)
+        button_layout = QVBoxLayout()
+        button_layout.addWidget(self.login_button)
+        button_layout.setSpacing(10)
+        copyright_layout = QVBoxLayout()
+        copyright_layout.addWidget(self.copyright_label)
+        copyright_layout.setSpacing(0)
+
+        # 로그인 버튼의 입체감을 위한 그림자 속성 정의
+        shadow_effect = QGraphicsDropShadowEffect()
+        shadow_effect.setBlurRadius(5)
+        shadow_effect.setOffset(1, 1)
+        shadow_effect.setColor(QColor(0, 0, 0, 255)) 
+        self.login_button.setGraphicsEffect(shadow_effect)
+
+        # 위에서 만든 서브 레이아웃을 메인레이아웃 생성 후 배치
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(id_layout)
+        main_layout.addSpacing(3)
+        main_layout.addLayout(pw_layout)
+        main_layout.addSpacing(3)
+        main_layout.addLayout(ip_layout)
+        main_layout.addSpacing(3)
+        main_layout.addLayout(jump_layout)
+        main_layout.addSpacing(3)
+        main_layout.addLayout(profile_layout)
+        main_layout.addSpacing(3)
+        main_layout.addLayout(label_layout)
+        main_layout.setSpacing(5)
+        main_layout.addLayout(button_layout)
+        main_layout.addSpacing(15) 
+        main_layout.addLayout(copyright_layout)
+
+        # 중앙 정렬
+        central_widget = QWidget()
+        central_widget.setLayout(main_layout)
+        self.setCentralWidget(central_widget)
+
+        # 각 아이템(위젯)에 대한 기본 스타일시트 정의 
+        self.setStyleSheet("""
+            QLabel {
+                font-weight : bold;
+                color : #000000;
+            }
+            #copyrightLabel {
+                font: 8pt Arial;
+                color : #c4c4c4;
+            }
+            QWidget {
+                background-color: #f0f0f0;
+                border-radius: 10px;
+            }
+            QLineEdit, QComboBox {
+                border: 1px solid #ccc;
+                padding: 3px;
+                border-radius: 5px;
+                background-color: white;
+                color : #000000;
+            }
+            QPushButton {
+                background-color: #1e73be;
+                color: white;
+                border: none;
+                padding: 5px;
+                border-radius: 5px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #115b9c;
+            }
+            QPushButton:disabled {
+                background-color: #a9a9a9;
+                color: #ffffff;
+            }
+            QLabel {
+                font-size: 14px;
+            }
+            QMessageBox {
+                border-radius: 10px;
+            }
+        """)
+
+        # 창이 먼저 그려진 뒤 SSH 모듈(paramiko)을 백그라운드에서 미리 불러옴
+        QTimer.singleShot(0, warm_import)
+
+    # 입력된 IP가 올바른 형식이면 해당 IP로 TCP 접속 + 키 교환을 백그라운드에서 미리 수행
+    # (경유 서버를 지정한 경우 경유 서버 로그인에 비밀번호가 필요하므로 미리 접속하지 않음)
+    def prewarm_connection(self):
+        ip_text = self.input_ip.text()
+        profile = self.selected_profile()
+        if self.pending is not None and self.pending.matches(ip_text, profile=profile) and not self.input_jump.text().strip():
+            return
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        if is_valid_ipv4(ip_text) and not self.input_jump.text().strip():
+            self.pending = PendingTransport(ip_text, profile=profile)
+
+    # 선택한 접속 프로필 (TransportProfile)
+    def selected_profile(self):
+        return transport_profiles[self.input_profile.currentData()]
+
+    # 로그인창이 닫힐 때 사용하지 않은 사전 접속 정리
+    def closeEvent(self, event):
+        if self.pending is not None:
+            self.pending.cancel()
+            self.pending = None
+        super().closeEvent(event)
+
+    # 엔터키 입력 시 액션에 대한 정의 (로그인 버튼 기능 수행)
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key.Key_Return or event.key() == Qt.Key.Key_Enter:
+            self.handle_login()
+
+    # 로그인 버튼이 눌렸을때 발생하는 이벤트
+    def handle_login(self):
+        self.login_button.setEnabled(False)
+        self.error_label.setStyleSheet("color: green;")
+        self.error_label.setText("로그인 시도 중...")
+
+        ip_text = self.input_ip.text()
+        id_text = self.input_id.text()
+        pw_text = self.input_pw.text()
+         # IP주소 형식이 맞는지 확인
+        if not is_valid_ipv4(ip_text):
+            self.error_label.setText("*입력하신 정보가 옳바르지 않습니다.")
+            self.error_label.setStyleSheet("color: red;")
+            self.login_button.setEnabled(True)
+            return
+        # SSH 접속 기능 병렬 스레드로 수행 (그냥 실행시 로그인 시도 중에 로그인창 GUI가 멈추기에 병렬 수행 처리)
+        self.prewarm_timer.stop()
+        pending, self.pending = self.pending, None # 미리 열어둔 접속은 한 번만 사용
+        self.ssh_thread = SSHThread(ip_text, id_text, pw_text, pending=pending, jump=self.input_jump.text().strip() or None,
+                                    profile=self.selected_profile())
+        self.ssh_thread.result_signal.connect(self.on_ssh_result)
+        self.ssh_thread.start()
+
+    # 로그인 접속 결과 처리 함수
+    def on_ssh_result(self, result):
+        # 성공 시 성공한 ID/PW/IP 전역변수에 저장
+        if result == "success":
+            user_info["id"] = self.input_id.text()
+            user_info["pw"] = self.input_pw.text()
+            user_info["ip"] = self.input_ip.text()
+            self.error_label.setText("로그인 성공!")
+            self.open_main_window(self.ssh_thread.session) # 로그인 성공 후 메인 윈도우 호출
+        else: # 실패 시 실패 문구로 사용자에게 알림
+            self.error_label.setText(f"*입력하신 정보가 옳바르지 않습니다.")
+            self.error_label.setStyleSheet("color: red;")
+            self.login_button.setEnabled(True)
+
+    # 로그인창을 닫고 메인창(기능창)을 호출하는 함수
+    def open_main_window(self, session):
+        self.main_window = MainWindow(session)
+        self.main_window.show() # 메인 윈도우 호출
+        self.close() # 로그인창 닫기
+
+
+# 메인창 GUI 화면에 대한 정의 클래스 + 메인창에서 수행할 기능 함수들
+class MainWindow(QMainWindow):
+    def __init__(self, session):
+        super().__init__()
+        self.setWindowTitle(f"DCV Tools Ver:{dcv_core.program_version}")
+        self.setFixedSize(300, 300)
+        if hasattr(sys, '_MEIPASS'):
+            icon_path = os.path.join(sys._MEIPASS, 'ico.ico')
+        else:
+            icon_path = 'ico.ico'
+        self.setWindowIcon(QIcon(icon_path))
+
+        self.service_name = dcv_core.service_name
+        self.session = session # 로그인 시 인증된 SSH 세션 (모든 기능에서 공유)
+        self.runner = TaskRunner() # 원격 명령 실행 엔진 (GUI 스레드 블로킹 방지)
+        self.stall_monitor = StallMonitor(parent=self) # 조치 진행 중 GUI 멈춤 시간 측정
+        # 호스트 대기 정책 / 단계별 예상 소요 시간 (조치 이력 조회는 작업 스레드에서 수행 - 조회가 끝나기 전에는 기본값 사용)
+        self.host_policy = dcv_core.default_policy
+        self.step_history = {}
+        self.load_host_history()
+
+        # 자동 진단 버튼 (상태를 한 번에 조회하여 CASE 1 / CASE 2 중 필요한 조치 추천)
+        self.triage_button = QPushButton("자동 진단")
+        self.triage_button.setFixedHeight(35)
+        self.triage_button.clicked.connect(self.run_triage)
+        # 진단 자료 수집 버튼 (조치 실패 시 원격지 로그를 tar.gz 로 저장)
+        self.collect_button = QPushButton("진단 자료 수집")
+        self.collect_button.setFixedHeight(35)
+        self.collect_button.clicked.connect(self.collect_diagnostics)
+
+        # 구현한 기능을 수행할 라벨 위젯과 버튼 위젯 속성 정의
+        self.function_label = QLabel()
+        self.function_label.setText(
+            '<span sytyle="font-weight: bold">· </span><span style="color: #0d7c14; font-weight: bold;">CASE 1</span><span style="font-weight: bold"> : DCV 사용 중 튕김</span>'
+        )
+        self.function_label.setAlignment(Qt.AlignmentFlag.AlignBottom)
+        self.restart_button = QPushButton("CASE 1 조치 진행")
+        self.restart_button.setFixedHeight(35)
+        self.restart_button.clicked.connect(self.restart_service)
+
+        self.function_label2 = QLabel()
+        self.function_label2.setText(
+            '<span sytyle="font-weight: bold">· </span><span style="color: #0d7c14; font-weight: bold;">CASE 2</span><span style="font-weight: bold"> : DCV 처음 접속 시 검은 화면</span>'
+        )
+        self.function_label2.setAlignment(Qt.AlignmentFlag.AlignBottom)
+        self.runlevel_button = QPushButton("CASE 2 조치 진행")
+        self.runlevel_button.setFixedHeight(35)
+        self.runlevel_button.clicked.connect(self.change_runlevel)
+
+        # 원격 일괄 실행 모드 선택 (조치 전체를 원격 스크립트 1회 실행으로 수행 - 고지연 환경용)
+        self.remote_checkbox = QCheckBox("원격 일괄 실행 모드")
+        # 진행 중인 조치 취소 버튼 (조치 진행 중에만 활성화)
+        self.cancel_button = QPushButton("조치 취소")
+        self.cancel_button.setFixedSize(80, 22)
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_action)
+
+        # 진행 상황을 시각적인 효과로 전달하기 위한 프로그레스바 위젯 속성 정의
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.progress = ProgressEngine(self.progress_bar, parent=self) # 조치 단계 이벤트로 프로그레스바 갱신
+        # 프로그램 자동 종료까지 남은 시간을 표시하기 위하 위젯 속성 정의
+        self.timer_label = QLabel("프로그램 자동 종료까지 : 60초 남음")
+        self.timer_label.setAlignment(Qt.AlignmentFlag.AlignHCenter | Qt.AlignmentFlag.AlignBottom)
+
+        # 기능 실행 버튼에 입체감 추가를 위한 그림자 속성 정의
+        shadow_effect = QGraphicsDropShadowEffect()
+        shadow_effect.setBlurRadius(5)
+        shadow_effect.setOffset(1, 1)
+        shadow_effect.setColor(QColor(0, 0, 0, 255)) 
+        self.restart_button.setGraphicsEffect(shadow_effect)
+        shadow_effect = QGraphicsDropShadowEffect()
+        shadow_effect.setBlurRadius(5)
+        shadow_effect.setOffset(1, 1)
+        shadow_effect.setColor(QColor(0, 0, 0, 255)) 
+        self.runlevel_button.setGraphicsEffect(shadow_effect)
+        shadow_effect = QGraphicsDropShadowEffect()
+        shadow_effect.setBlurRadius(5)
+        shadow_effect.setOffset(1, 1)
+        shadow_effect.setColor(QColor(0, 0, 0, 255)) 
+        self.triage_button.setGraphicsEffect(shadow_effect)
+        shadow_effect = QGraphicsDropShadowEffect()
+        shadow_effect.setBlurRadius(5)
+        shadow_effect.setOffset(1, 1)
+        shadow_effect.setColor(QColor(0, 0, 0, 255)) 
+        self.collect_button.setGraphicsEffect(shadow_effect)
+
+        # 레이아웃 구분을 위한 구분선 속성 정의
+        self.separator = QFrame()
+        self.separator.setFrameShape(QFrame.Shape.HLine)
+        self.separator.setFrameShadow(QFrame.Shadow.Sunken)
+        self.separator.setFixedHeight(1)
+        self.separator.setStyleSheet("background-color: #ccc;")
+
+        # 수직 메인 레이아웃 생성 후 위에서 생성한 위젯을 배치
+        main_layout = QVBoxLayout()
+        tool_layout = QHBoxLayout()
+        tool_layout.addWidget(self.triage_button)
+        tool_layout.addWidget(self.collect_button)
+        main_layout.addLayout(tool_layout)
+        main_layout.addSpacing(10)
+        main_layout.addWidget(self.function_label)
+        main_layout.addWidget(self.restart_button)
+        main_layout.addSpacing(20)
+        main_layout.addWidget(self.function_label2)
+        main_layout.addWidget(self.runlevel_button)
+        main_layout.addSpacing(20)
+        main_layout.addWidget(self.separator)
+        option_layout = QHBoxLayout()
+        option_layout.addWidget(self.remote_checkbox)
+        option_layout.addWidget(self.cancel_button)
+        main_layout.addLayout(option_layout)
+        main_layout.addWidget(self.progress_bar)
+        main_layout.addWidget(self.timer_label)
+
+        # 중앙 정렬
+        central_widget = QWidget()
+        central_widget.setLayout(main_layout)
+        self.setCentralWidget(central_widget)
+
+        # 자동 종료 시간 설정 
+        self.remaining_time = 60
+        self.timer = QTimer()
+        self.timer.timeout.connect(self.update_time)
+        self.timer.start(1000)
+
+        # 기능 수행 창에 위젯들에 대한 기본 스타일시트 정의
+        self.setStyleSheet("""
+            QWidget {
+                background-color: #f0f0f0;
+                border-radius: 10px;
+                color : #000000
+            }
+            QLineEdit {
+                border: 1px solid #ccc;
+                padding: 3px;
+                border-radius: 5px;
+            }
+            QPushButton {
+                background-color: #1e73be;
+                color: white;
+                border: none;
+                padding: 2px;
+                border-radius: 5px;
+                font-size: 14px;
+                font-weight: bold;
+            }
+            QPushButton:hover {
+                background-color: #115b9c;
+            }
+            QPushButton:disabled {
+                background-color: #a9a9a9;
+                color: #ffffff;
+            }
+            QLabel {
+                font-size: 14px;
+            }
+            QMessageBox {
+                border-radius: 10px;
+            }
+        """)
+
+    # 서비스 재시작 기능 함수 (dcvserver)
+    def restart_service(self):
+        self.set_action_buttons(False)
+        self.begin_action("restart")
+        if self.remote_checkbox.isChecked():
+            self.run_remote("restart", self.on_service_status, self.on_restart_error)
+            return
+        # SSH 명령 송수신은 작업 스레드에서 수행하고 결과만 시그널로 받아 GUI를 갱신
+        # 사용자를 구분하고 사용자에 맞는 재시작 명령어 송신 (재시작 작업이 끝날 때까지 대기)
+        self.runner.submit(
+            lambda: dcv_core.send_restart(self.session, self.service_name, self.deadline),
+            self.on_restart_sent,
+            self.on_restart_error,
+        )
+
+    def on_restart_sent(self, capabilities):
+        self.progress.step("check_restarted")
+        # 고정 대기 없이 바로 서비스 상태 감시 시작
+        self.check_service_status()
+
+    def on_restart_error(self, message):
+        self.fail_action(f"오류 발생: {message}")
+        QTimer.singleShot(5000, lambda: self.set_action_buttons(True))
+
+    # 서비스 상태 확인을 위한 기능 함수
+    # (서비스가 active가 될 때까지 원격 감시 후 상태와 재시작 시간을 1회 왕복으로 조회하여
+    #  active 상태이고 active가 된 지 10초 이내일 경우 재시작에 성공한걸로 구분)
+    def check_service_status(self):
+        self.runner.submit(
+            lambda: dcv_core.check_restarted(self.session, self.service_name, self.policy, self.deadline),
+            self.on_service_status,
+            self.on_status_error,
+        )
+
+    def on_service_status(self, recently_active):
+        self.end_action("ok" if recently_active else "failed")
+        # 다음으로 현재 dcvserver 서비스 상태가 Active 상태가 맞는지 확인
+        if recently_active:
+            QTimer.singleShot(1000, lambda: self.set_action_buttons(True))
+            QMessageBox.information(self, "작업 성공", "CASE 1 조치 완료") 
+            # 모든 확인에 통과할 경우 정상적인 서비스 재시작 확인으로 구분
+        else:
+            self.set_action_buttons(True)
+            QMessageBox.critical(self, "작업 실패", "CASE 1 조치 실패\n진단 자료 수집 후 IT팀에 문의하세요.") 
+            # 대기 시간 내에 active가 되지 않았을 경우 최종 실패로 구분
+    
+    # 런레벨 변경 기능 함수 (블랙스크린 조치)
+    def change_runlevel(self):
+        self.set_action_buttons(False)
+        self.begin_action("blackscreen")
+        if self.remote_checkbox.isChecked():
+            self.run_remote("blackscreen", self.on_final_runlevel, self.on_runlevel_error)
+            return
+        # 런레벨 3(multi-user.target)으로 변경하는 명령어 송신
+        self.runner.submit(
+            lambda: dcv_core.send_isolate_multi_user(self.session, self.deadline),
+            self.on_multi_user_sent,
+            self.on_runlevel_error,
+        )
+
+    def on_multi_user_sent(self, capabilities):
+        self.progress.step("switch_to_graphical")
+        # 런레벨 3로 변경하는 명령어 송신 후 바로 런레벨 변경 감시 시작
+        self.check_runlevel(capabilities)
+
+    def on_runlevel_error(self, message):
+        self.fail_action(f"오류 발생: {message}")
+        self.restore_buttons()
+
+    # 런레벨 체크 기능 함수 (런레벨 3이 되는 즉시 런레벨 5(graphical.target)로 다시 변경하는 명령어 송신)
+    def check_runlevel(self, capabilities):
+        self.runner.submit(
+            lambda: dcv_core.switch_to_graphical(self.session, capabilities, self.policy, self.deadline),
+            self.on_runlevel,
+            self.on_status_error,
+        )
+
+    def on_runlevel(self, reached):
+        # 대기 시간 내에 런레벨 3으로 변경되지 않았을 경우 최종 실패처리
+        if not reached:
+            self.end_action("failed")
+            self.restore_buttons()
+            QMessageBox.critical(self, "작업 실패", "CASE 2 조치 실패\n진단 자료 수집 후 IT팀에 문의해주세요.")
+            return
+        self.progress.step("check_graphical")
+        self.check_final_runlevel()
+
+    # 최총 런레벨 체크 기능 함수 
+    def check_final_runlevel(self):
+        # 현재 런레벨 상태가 다시 5로 변경되었는지 감시
+        self.runner.submit(
+            lambda: dcv_core.check_graphical(self.session, self.policy, self.deadline),
+            self.on_final_runlevel,
+            self.on_status_error,
+        )
+
+    def on_final_runlevel(self, reached):
+        self.end_action("ok" if reached else "failed")
+        if reached:
+            QMessageBox.information(self, "작업 성공", f"CASE 2 조치 완료")
+            self.restore_buttons()
+        else:
+            self.restore_buttons()
+            QMessageBox.critical(self, "작업 실패", f"CASE 2 조치 실패\n진단 자료 수집 후 IT팀에 문의해주세요.")
+
+    def on_status_error(self, message):
+        self.fail_action(f"상태 확인 중 오류 발생: {message}")
+        self.restore_buttons()
+
+    # 자동 진단 기능 함수 - 진단 결과를 보여주고 필요한 조치만 진행할지 확인
+    def run_triage(self):
+        self.set_action_buttons(False)
+        self.begin_action("triage")
+        self.runner.submit(
+            lambda: dcv_triage.triage(self.session, self.service_name, refresh=True, timeout=dcv_core.step_timeout(self.deadline)),
+            self.on_triage,
+            self.on_triage_error,
+        )
+
+    def on_triage(self, diagnosis):
+        self.end_action("ok")
+        self.set_action_buttons(True)
+        notes = "".join(f"\n- {note}" for note in diagnosis.notes)
+        if diagnosis.action is None:
+            QMessageBox.information(self, "진단 결과", f"이상 없음 - 조치가 필요하지 않습니다.{notes}")
+            return
+        reasons = "".join(f"\n- {reason}" for reason in diagnosis.reasons)
+        answer = QMessageBox.question(self, "진단 결과", f"{diagnosis.case_name} 조치가 필요합니다.{reasons}{notes}\n\n조치를 진행할까요?")
+        if answer == QMessageBox.StandardButton.Yes:
+            self.restart_service() if diagnosis.action == "restart" else self.change_runlevel()
+
+    def on_triage_error(self, message):
+        self.fail_action(f"진단 중 오류 발생: {message}")
+        self.restore_buttons()
+
+    # 진단 자료 수집 기능 함수 - 원격지 로그를 받아 tar.gz 로 저장 (받는 동안 프로그레스바로 진행상황 표시)
+    def collect_diagnostics(self):
+        self.set_action_buttons(False)
+        self.begin_action("collect")
+        self.runner.submit(
+            lambda progress: dcv_diagnostics.collect_bundle(self.session, progress=progress),
+            self.on_collected,
+            self.on_collect_error,
+            self.progress.report,
+        )
+
+    def on_collected(self, bundle):
+        self.end_action("ok")
+        self.restore_buttons()
+        skipped = f"\n(수집하지 못한 항목 {len(bundle.errors)}개 - manifest.json 참고)" if bundle.errors else ""
+        QMessageBox.information(self, "진단 자료 수집 완료", f"저장 위치:\n{bundle.path}{skipped}")
+
+    def on_collect_error(self, message):
+        self.fail_action(f"진단 자료 수집 중 오류 발생: {message}")
+        self.restore_buttons()
+
+    # 원격 일괄 실행 모드 - 조치 전체를 원격 스크립트로 수행하고, 스크립트가 보내는 진행상황으로 프로그레스바 갱신
+    # 완료 시 단계별 흐름과 같은 결과 처리 함수(on_done)로 성공 여부 전달
+    def run_remote(self, action, on_done, on_error):
+        self.runner.submit(
+            lambda progress: dcv_runner.run_remote(self.session, action, self.service_name, self.policy, self.deadline, progress)[0],
+            on_done,
+            on_error,
+            self.progress.report,
+        )
+
+    # 조치 시작 - GUI 멈춤 시간 측정 및 단계별 소요 시간 기록 시작, 호스트 등급별 대기 정책과 전체 제한 시간 적용
+    # (대기 정책 / 예상 소요 시간은 미리 조회해 둔 값 사용 - GUI 스레드에서 조치 이력 저장소를 읽지 않음)
+    def begin_action(self, action):
+        # 조치 중에는 자동 종료 시간 멈춤 (조치가 끝나면 처음부터 다시 계산)
+        self.timer.stop()
+        self.timer_label.setText("조치 진행 중 - 자동 종료 대기")
+        self.session.begin_operation()
+        self.cancel_button.setEnabled(True)
+        self.progress.start(action, dcv_capability.cache_key(self.session), self.step_history.get(action, {}))
+        self.stall_monitor.start()
+        self.tracer = dcv_trace.begin(self.session, action)
+        self.policy = self.host_policy
+        self.deadline = self.policy.start(action)
+
+    # 조치 종료 - 측정 중지 후 트레이스 저장 (GUI 멈춤 시간도 트레이스에 함께 기록)
+    # 트레이스 / 지표 / 캐시 파일 저장은 작업 스레드에서 수행하고 끝나면 호스트 이력을 다시 조회
+    def end_action(self, outcome):
+        self.cancel_button.setEnabled(False)
+        self.progress.finish(outcome == "ok")
+        self.stall_monitor.stop()
+        self.tracer.annotate(**self.stall_monitor.stats())
+        self.runner.submit(lambda tracer=self.tracer, session=self.session: save_action(tracer, session, outcome),
+                           lambda _: self.load_host_history(), lambda message: None)
+        self.reset_auto_exit()
+
+    # 호스트의 대기 정책 / 단계별 예상 소요 시간을 작업 스레드에서 조회 (창을 열 때와 조치가 끝날 때마다 갱신)
+    def load_host_history(self):
+        ip, key = self.session.ip, dcv_capability.cache_key(self.session)
+        self.runner.submit(lambda: (policy_for_host(ip, key=key), dcv_progress.host_history(key)), self.on_host_history, lambda message: None)
+
+    def on_host_history(self, loaded):
+        self.host_policy, self.step_history = loaded
+
+    # 조치 실패 처리 - 사용자가 취소한 경우에는 오류창 대신 취소 안내
+    def fail_action(self, message):
+        cancelled = self.session.cancel_token.cancelled
+        self.end_action("cancelled" if cancelled else "error")
+        if cancelled:
+            QMessageBox.information(self, "작업 취소", "조치를 취소했습니다.")
+        else:
+            self.show_error_message(message)
+
+    # 조치 취소 버튼 - 진행 중인 채널과 세션을 닫아 작업 스레드의 대기를 즉시 종료 (결과는 오류 처리 함수로 전달됨)
+    def cancel_action(self):
+        self.cancel_button.setEnabled(False)
+        self.session.cancel()
+
+    # 조치 버튼 (자동 진단 / CASE 1 / CASE 2) 활성화 상태 변경
+    def set_action_buttons(self, enabled):
+        self.triage_button.setEnabled(enabled)
+        self.collect_button.setEnabled(enabled)
+        self.restart_button.setEnabled(enabled)
+        self.runlevel_button.setEnabled(enabled)
+
+    # 기능 수행중 비활성화 된 버튼을 3초 후 다시 활성화 시키는 기능 함수
+    def restore_buttons(self):
+        QTimer.singleShot(3000, lambda: self.set_action_buttons(True))
+
+    # 예외처리 외의 기능문제 발생시 에러코드 확인을 위한 에러창 함수 (개발자 에러내용 확인용)
+    def show_error_message(self, message="오류 발생"):
+        QMessageBox.critical(self, "Error", message)
+
+    # 창이 닫힐 때 유지하던 SSH 세션 종료
+    def closeEvent(self, event):
+        self.stall_monitor.stop()
+        self.session.cancel() # 진행 중인 작업이 있으면 바로 끝나도록 취소 후 대기
+        self.runner.shutdown()
+        self.session.close()
+        close_jump_hosts()
+        dcv_history.close() # 남은 조치 이력 저장
+        super().closeEvent(event)
+
+    # 자동 종료 시간을 처음(60초)부터 다시 시작
+    def reset_auto_exit(self):
+        self.remaining_time = 60
+        self.timer_label.setText(f"프로그램 자동 종료까지 : {self.remaining_time}초 남음")
+        self.timer.start(1000)
+
+    # 프로그램 자동 종료까지의 시간을 사용자에게 알리기 위한 기능 함수 
+    def update_time(self):
+        self.remaining_time -= 1
+        if self.remaining_time <= 0:
+            self.close()
+            sys.exit()
+        else:
+            self.timer_label.setText(f"프로그램 자동 종료까지 : {self.remaining_time}초 남음")
+
+
+# GUI 실행 (로그인창 호출)
+def run_gui(argv):
+    app = QApplication(argv)
+    icon_path = os.path.join(os.path.dirname(sys.executable), "ico.ico") if getattr(sys, 'frozen', False) else "ico.ico"
+    app.setWindowIcon(QIcon(icon_path))
+    login_window = LoginWindow()
+    login_window.show()
+    return app.exec()
+
+
+if __name__ == "__main__":
+    sys.exit(run_gui(sys.argv))
\ No newline at end of file
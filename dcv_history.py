@@ -0,0 +1,275 @@
+import math
+import os
+import pathlib
+import queue
+import sqlite3
+import threading
+import time
+
+# 조치 이력 저장소 (SQLite) - 조치가 끝날 때마다 호스트 / 조치 / 시작·종료 시간 / 단계별 소요 시간 / 재시도 횟수 / 결과를 기록
+# - 호스트는 접속 정보 캐시와 같은 "사용자@IP:포트" 키로 구분 (dcv_capability.cache_key)
+# - 기록은 전용 스레드가 큐에서 꺼내 모아서 저장 (GUI / 조치 스레드는 큐에 넣기만 하고 기다리지 않음)
+# - 추가만 하고 수정 / 삭제하지 않음 (여러 프로세스가 동시에 써도 되도록 WAL 모드 사용)
+# - 호스트별 소요 시간 백분위 / 기간 내 조치 횟수 조회는 인덱스로 처리 - 대기 제한 시간 / 진행률 추정에 사용
+
+history_db = os.environ.get("DCV_TOOLS_HISTORY_DB") or os.path.join(os.path.expanduser("~"), ".dcv_tools", "history.sqlite3")
+batch_size = 100 # 한 트랜잭션에 저장하는 최대 기록 수
+close_timeout = 5 # 종료 시 남은 기록 저장을 기다리는 최대 시간(초)
+read_timeout = 1 # 조회 시 잠금을 기다리는 최대 시간(초) - WAL 모드에서는 기록 중에도 조회가 대기하지 않음
+
+schema = (
+    """CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        host TEXT NOT NULL,
+        action TEXT NOT NULL,
+        started_at REAL NOT NULL,
+        ended_at REAL NOT NULL,
+        duration REAL NOT NULL,
+        outcome TEXT,
+        retries INTEGER NOT NULL DEFAULT 0,
+        error TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS steps (
+        run_id INTEGER NOT NULL REFERENCES runs(id),
+        step TEXT NOT NULL,
+        duration REAL NOT NULL,
+        count INTEGER NOT NULL DEFAULT 1
+    )""",
+    "CREATE INDEX IF NOT EXISTS runs_host_action ON runs(host, action, started_at)",
+    "CREATE INDEX IF NOT EXISTS runs_action_started ON runs(action, started_at)",
+    "CREATE INDEX IF NOT EXISTS steps_run ON steps(run_id, step)",
+)
+
+
+# 저장소 연결 (readonly=True 이면 조회 전용 - 스키마 생성 / PRAGMA / commit 없이 읽기만 하므로 기록 중인 잠금을 기다리지 않음)
+# 조회 전용으로 열 때 저장소 파일이 아직 없으면 빈 메모리 저장소 반환 (조회 결과 없음)
+def connect(path=None, readonly=False):
+    path = path or history_db
+    if readonly:
+        if not os.path.exists(path):
+            connection = sqlite3.connect(":memory:")
+            for statement in schema:
+                connection.execute(statement)
+            return connection
+        return sqlite3.connect(pathlib.Path(os.path.abspath(path)).as_uri() + "?mode=ro", uri=True, timeout=read_timeout)
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    connection = sqlite3.connect(path, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    for statement in schema:
+        connection.execute(statement)
+    connection.commit()
+    return connection
+
+
+# 트레이스 1건의 재시도 횟수 - 재접속 (첫 접속 이후의 connect 단계) + 상태 재확인 (대기 단계의 첫 확인 이후 확인 횟수)
+# + 재실행 (실패(StepTimeout 등)한 단계를 다시 수행했거나 retry 로 표시된 단계)
+def count_retries(spans):
+    spans = sorted(spans, key=lambda span: span["start_ms"])
+    connects = sum(1 for span in spans if span["step"] == "connect")
+    reconnects = max(connects - 1, 0) if spans and spans[0]["step"] == "connect" else connects
+    rechecks = sum(span.get("rechecks", 0) for span in spans)
+    failed, reruns = set(), 0
+    for span in spans:
+        if span["step"] != "connect" and (span["step"] in failed or span.get("retry")):
+            reruns += 1
+        if span["status"] != "ok":
+            failed.add(span["step"])
+    return reconnects + rechecks + reruns
+
+# 트레이스(dcv_trace.Tracer.to_dict) 1건을 저장할 기록으로 변환
+# retries: count_retries 참고, error: 처음 실패한 단계의 오류 메시지
+def run_record(trace):
+    spans = trace.get("spans", [])
+    steps = {}
+    for span in spans:
+        duration, count = steps.get(span["step"], (0.0, 0))
+        steps[span["step"]] = (duration + span["duration_ms"] / 1000, count + 1)
+    error = next((span["error"] for span in spans if span.get("error")), None)
+    duration = trace["duration_ms"] / 1000
+    return {
+        "host": trace.get("key") or trace["host"],
+        "action": trace["action"],
+        "started_at": trace["started_at"],
+        "ended_at": trace["started_at"] + duration,
+        "duration": duration,
+        "outcome": trace.get("outcome"),
+        "retries": count_retries(spans),
+        "error": error,
+        "steps": steps,
+    }
+
+
+# 기록 전용 스레드 (처음 기록할 때 시작)
+class HistoryWriter:
+    def __init__(self, path=None):
+        self.path = path
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.written = 0
+        self.errors = 0
+
+    # 기록 추가 (바로 반환 - 저장은 기록 스레드에서 수행)
+    def submit(self, record):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self.loop, name="dcv-history", daemon=True)
+                self.thread.start()
+        self.queue.put(record)
+
+    def loop(self):
+        connection = None
+        while True:
+            records = [self.queue.get()]
+            # 쌓여 있는 기록은 한 트랜잭션으로 저장
+            while len(records) < batch_size:
+                try:
+                    records.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = None in records
+            records = [record for record in records if record is not None]
+            try:
+                if records:
+                    connection = connection or connect(self.path)
+                    with connection:
+                        for record in records:
+                            insert_run(connection, record)
+                    self.written += len(records)
+            except (OSError, sqlite3.Error):
+                # 이력 저장 실패가 조치에 영향을 주지 않도록 버림
+                self.errors += len(records)
+            finally:
+                for _ in range(len(records) + stop):
+                    self.queue.task_done()
+            if stop:
+                if connection is not None:
+                    connection.close()
+                return
+
+    # 큐에 남은 기록을 모두 저장한 뒤 기록 스레드 종료 (최대 timeout초 대기)
+    def close(self, timeout=close_timeout):
+        with self.lock:
+            thread, self.thread = self.thread, None
+        if thread is None or not thread.is_alive():
+            return
+        self.queue.put(None)
+        thread.join(timeout)
+
+
+def insert_run(connection, record):
+    cursor = connection.execute(
+        "INSERT INTO runs (host, action, started_at, ended_at, duration, outcome, retries, error) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (record["host"], record["action"], record["started_at"], record["ended_at"], record["duration"], record["outcome"],
+         record["retries"], record["error"]),
+    )
+    connection.executemany(
+        "INSERT INTO steps (run_id, step, duration, count) VALUES (?, ?, ?, ?)",
+        [(cursor.lastrowid, step, duration, count) for step, (duration, count) in record["steps"].items()],
+    )
+
+writer = HistoryWriter()
+
+
+# 조치 트레이스 1건 기록 (dcv_trace.Tracer.finish 에서 호출)
+def record(trace):
+    writer.submit(run_record(trace))
+
+# 프로그램 종료 시 호출 (남은 기록 저장)
+def close():
+    writer.close()
+
+
+# 정렬된 값 목록의 q 백분위 (선형 보간)
+def percentile(values, q):
+    if not values:
+        return None
+    position = (len(values) - 1) * q
+    lower = math.floor(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+# 조회 결과 행을 (키 → 정렬된 값 목록)으로 묶음
+def group_values(rows):
+    groups = {}
+    for key, value in rows:
+        groups.setdefault(key, []).append(value)
+    return {key: sorted(values) for key, values in groups.items()}
+
+
+# 호스트별 조치 소요 시간 백분위(초) - {호스트: (p값, 기록 수)} (since: 이 시간(epoch 초) 이후 기록만, ok_only: 성공한 조치만)
+def host_percentiles(action, q=0.95, since=None, ok_only=True, hosts=None, path=None):
+    query = "SELECT host, duration FROM runs WHERE action = ? AND started_at >= ?"
+    params = [action, since or 0]
+    if ok_only:
+        query += " AND outcome = 'ok'"
+    if hosts is not None:
+        query += f" AND host IN ({', '.join('?' * len(hosts))})"
+        params += list(hosts)
+    connection = connect(path, readonly=True)
+    try:
+        rows = connection.execute(query, params).fetchall()
+    finally:
+        connection.close()
+    return {host: (percentile(values, q), len(values)) for host, values in group_values(rows).items()}
+
+# since 이후 action 조치를 min_count번 이상 수행한 호스트 - [(호스트, 횟수)] 횟수 내림차순
+def frequent_hosts(action, since, min_count=4, path=None):
+    connection = connect(path, readonly=True)
+    try:
+        return connection.execute(
+            "SELECT host, COUNT(*) AS runs FROM runs WHERE action = ? AND started_at >= ? GROUP BY host HAVING runs >= ?"
+            " ORDER BY runs DESC, host",
+            (action, since, min_count),
+        ).fetchall()
+    finally:
+        connection.close()
+
+# 최근 기록 - [dict] 최신순 (host: "사용자@IP:포트" 키 또는 IP - IP 이면 해당 IP 의 모든 접속 기록)
+def recent_runs(action=None, host=None, limit=20, path=None):
+    query = "SELECT host, action, started_at, duration, outcome, retries, error FROM runs"
+    conditions, params = [], []
+    if action is not None:
+        conditions.append("action = ?")
+        params.append(action)
+    if host is not None:
+        conditions.append("(host = ? OR host GLOB ?)")
+        params += [host, f"*@{host}:*"]
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    query += " ORDER BY started_at DESC LIMIT ?"
+    connection = connect(path, readonly=True)
+    try:
+        rows = connection.execute(query, params + [limit]).fetchall()
+    finally:
+        connection.close()
+    names = ("host", "action", "started_at", "duration", "outcome", "retries", "error")
+    return [dict(zip(names, row)) for row in rows]
+
+# 최근 성공한 조치 limit건의 단계별 소요 시간 목록 - {단계: [초]} ("total" 은 조치 전체 소요 시간)
+def step_samples(action, host=None, limit=20, path=None):
+    query = "SELECT id, duration FROM runs WHERE action = ? AND outcome = 'ok'"
+    params = [action]
+    if host is not None:
+        query += " AND host = ?"
+        params.append(host)
+    query += " ORDER BY started_at DESC LIMIT ?"
+    connection = connect(path, readonly=True)
+    try:
+        runs = connection.execute(query, params + [limit]).fetchall()
+        samples = {"total": [duration for _, duration in runs]} if runs else {}
+        if runs:
+            rows = connection.execute(
+                f"SELECT step, duration FROM steps WHERE run_id IN ({', '.join('?' * len(runs))})", [run_id for run_id, _ in runs]
+            ).fetchall()
+            for step, duration in rows:
+                samples.setdefault(step, []).append(duration)
+    finally:
+        connection.close()
+    return samples
+
+# 이번 주 시작 시간 (월요일 0시, 현지 시간 기준 epoch 초)
+def week_start(now=None):
+    local = time.localtime(now)
+    return time.mktime((local.tm_year, local.tm_mon, local.tm_mday - local.tm_wday, 0, 0, 0, 0, 0, -1))
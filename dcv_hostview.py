@@ -0,0 +1,332 @@
+import threading
+import time
+from dataclasses import dataclass
+
+from PyQt6.QtWidgets import (
+    QApplication, QMainWindow, QLabel, QLineEdit, QComboBox, QPushButton, QVBoxLayout, QHBoxLayout, QWidget,
+    QTableView, QHeaderView, QAbstractItemView, QStyledItemDelegate, QStyleOptionProgressBar, QStyle
+)
+from PyQt6.QtCore import Qt, QTimer, QAbstractTableModel, QSortFilterProxyModel, QModelIndex
+from PyQt6.QtGui import QColor
+
+# 여러 호스트의 상태를 한 화면에 보여주는 현황 창 (감시 모드 / 플릿 실행 결과 표시용)
+# - 모델/뷰 표(QAbstractTableModel) 사용 - 행마다 위젯을 만들지 않으므로 수천 대도 화면에 보이는 행만 그림
+# - 작업 스레드는 post() 로 변경 사항만 넘기고, GUI 스레드가 flush_interval_ms 주기로 모아서 반영
+#   (같은 호스트의 여러 변경은 마지막 값으로 합치고, 바뀐 행은 연속 구간 단위로 dataChanged 통지)
+# - 정렬은 원본 모델에서 키 정렬로 수행 (프록시 정렬은 비교할 때마다 data() 를 호출해 수천 행에서 느림)
+#   필터는 QSortFilterProxyModel 에서 처리하고, 프록시의 정렬 요청은 원본 모델로 전달
+
+flush_interval_ms = 200 # 변경 사항 반영 주기(ms)
+max_change_ranges = 32 # 바뀐 행 구간이 이보다 많으면 처음~끝 행을 한 번에 통지
+
+# 표 컬럼 (필드 이름, 머리글)
+columns = (
+    ("host", "호스트"),
+    ("status", "상태"),
+    ("latency_ms", "응답(ms)"),
+    ("action", "조치"),
+    ("progress", "진행률"),
+    ("updated", "마지막 확인"),
+    ("message", "내용"),
+)
+progress_column = [name for name, _ in columns].index("progress")
+
+# 상태별 표시 이름 / 글자색
+status_labels = {
+    "pending": ("대기", "#808080"),
+    "healthy": ("정상", "#0d7c14"),
+    "unhealthy": ("이상", "#c47f00"),
+    "remediating": ("조치 중", "#1e73be"),
+    "rate_limited": ("조치 제한", "#b03060"),
+    "unreachable": ("접속 불가", "#c00000"),
+    "error": ("오류", "#c00000"),
+}
+action_labels = {"restart": "CASE 1", "blackscreen": "CASE 2"}
+
+
+# 표의 행 1개 (호스트 1대)
+@dataclass
+class HostRow:
+    host: str
+    status: str = "pending"
+    latency_ms: float = None
+    action: str = ""
+    progress: int = 0
+    updated: float = 0.0 # 마지막 변경 시간 (epoch 초)
+    message: str = ""
+
+
+# 호스트 현황 표 모델 - post() 는 어느 스레드에서나 호출 가능, 나머지는 GUI 스레드 전용
+class HostTableModel(QAbstractTableModel):
+    def __init__(self, hosts=(), parent=None):
+        super().__init__(parent)
+        self.rows = [HostRow(host) for host in hosts]
+        self.row_of = {row.host: index for index, row in enumerate(self.rows)}
+        self.pending = {} # 호스트 -> 아직 반영하지 않은 변경 필드 (같은 호스트는 합쳐짐)
+        self.sort_column = None # 정렬 기준 컬럼 (None 이면 추가된 순서)
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self.pending_lock = threading.Lock()
+        self.flush_timer = QTimer(self)
+        self.flush_timer.setInterval(flush_interval_ms)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start()
+
+    # 변경 사항 등록 (작업 스레드에서 호출 - 실제 반영은 flush 에서)
+    def post(self, host, **values):
+        with self.pending_lock:
+            self.pending.setdefault(host, {}).update(values)
+
+    # 모아둔 변경 사항을 한 번에 반영 (새 호스트는 한 번에 행 추가, 바뀐 행은 연속 구간별로 통지)
+    def flush(self):
+        with self.pending_lock:
+            pending, self.pending = self.pending, {}
+        if not pending:
+            return
+        new_hosts = [host for host in pending if host not in self.row_of]
+        if new_hosts:
+            first = len(self.rows)
+            self.beginInsertRows(QModelIndex(), first, first + len(new_hosts) - 1)
+            for host in new_hosts:
+                self.row_of[host] = len(self.rows)
+                self.rows.append(HostRow(host))
+            self.endInsertRows()
+
+        changed = []
+        sort_name = columns[self.sort_column][0] if self.sort_column is not None else None
+        resort = bool(new_hosts)
+        for host, values in pending.items():
+            index = self.row_of[host]
+            row = self.rows[index]
+            for name, value in values.items():
+                setattr(row, name, value)
+            changed.append(index)
+            resort = resort or sort_name in values
+        if sort_name is not None and resort:
+            # 정렬 기준 값이 바뀐 경우 다시 정렬 (layoutChanged 로 화면 / 필터 전체 갱신)
+            self.resort()
+        else:
+            self.notify_rows(sorted(changed))
+
+    def notify_rows(self, changed):
+        ranges = []
+        for index in changed:
+            if ranges and index == ranges[-1][1] + 1:
+                ranges[-1][1] = index
+            else:
+                ranges.append([index, index])
+        if len(ranges) > max_change_ranges:
+            ranges = [[changed[0], changed[-1]]]
+        last_column = len(columns) - 1
+        for first, last in ranges:
+            self.dataChanged.emit(self.index(first, 0), self.index(last, last_column))
+
+    # 정렬 기준 지정 (표 머리글 클릭 시 프록시를 거쳐 호출)
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sort_column = column if column >= 0 else None
+        self.sort_order = order
+        self.resort()
+
+    def resort(self):
+        if self.sort_column is None:
+            return
+        name = columns[self.sort_column][0]
+        self.layoutAboutToBeChanged.emit()
+        # 정렬 후에도 선택 / 현재 행 등이 같은 호스트를 가리키도록 persistent index 이동
+        persistent = self.persistentIndexList()
+        targets = [(self.rows[index.row()].host, index.column()) for index in persistent]
+        self.rows.sort(key=lambda row: self.sort_key(name, getattr(row, name)), reverse=self.sort_order == Qt.SortOrder.DescendingOrder)
+        self.row_of = {row.host: index for index, row in enumerate(self.rows)}
+        self.changePersistentIndexList(persistent, [self.index(self.row_of[host], column) for host, column in targets])
+        self.layoutChanged.emit()
+
+    # 정렬 키 (값이 없는 응답 시간은 맨 뒤로, 문자열은 대소문자 무시)
+    @staticmethod
+    def sort_key(name, value):
+        if name == "latency_ms":
+            return float("inf") if value is None else value
+        if isinstance(value, str):
+            return value.lower()
+        return value
+
+    # 상태별 호스트 수
+    def counts(self):
+        counts = {}
+        for row in self.rows:
+            counts[row.status] = counts.get(row.status, 0) + 1
+        return counts
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(columns)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return columns[section][1]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self.rows[index.row()]
+        name = columns[index.column()][0]
+        value = getattr(row, name)
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.display_text(name, value)
+        if role == Qt.ItemDataRole.UserRole:
+            return value
+        if role == Qt.ItemDataRole.ForegroundRole and name == "status":
+            return QColor(status_labels.get(value, ("", "#000000"))[1])
+        if role == Qt.ItemDataRole.TextAlignmentRole and name in ("latency_ms", "progress"):
+            return Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+        return None
+
+    @staticmethod
+    def display_text(name, value):
+        if name == "status":
+            return status_labels.get(value, (value,))[0]
+        if name == "latency_ms":
+            return "-" if value is None else f"{value:.0f}"
+        if name == "action":
+            return action_labels.get(value, value)
+        if name == "progress":
+            return f"{value}%"
+        if name == "updated":
+            return time.strftime("%H:%M:%S", time.localtime(value)) if value else "-"
+        return value
+
+
+# 호스트 / 내용 문자열 필터 + 상태 필터 (정렬은 원본 모델에서 수행)
+class HostFilterProxy(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.text = ""
+        self.status = None
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def set_filter(self, text=None, status=None):
+        self.text = (text or "").strip().lower()
+        self.status = status
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        row = self.sourceModel().rows[source_row]
+        if self.status and row.status != self.status:
+            return False
+        return not self.text or self.text in row.host.lower() or self.text in row.message.lower()
+
+
+# 진행률 컬럼을 프로그레스바 모양으로 그리는 delegate (행마다 QProgressBar 위젯을 만들지 않음)
+class ProgressDelegate(QStyledItemDelegate):
+    def paint(self, painter, option, index):
+        value = index.data(Qt.ItemDataRole.UserRole) or 0
+        bar = QStyleOptionProgressBar()
+        bar.rect = option.rect.adjusted(2, 3, -2, -3)
+        bar.minimum = 0
+        bar.maximum = 100
+        bar.progress = value
+        bar.text = f"{value}%"
+        bar.textVisible = True
+        bar.state = option.state
+        QApplication.style().drawControl(QStyle.ControlElement.CE_ProgressBar, bar, painter)
+
+
+# 호스트 현황 창 (필터 입력 / 상태 선택 / 상태별 집계 + 표)
+class HostStatusWindow(QMainWindow):
+    def __init__(self, model, title="DCV 호스트 현황"):
+        super().__init__()
+        self.setWindowTitle(title)
+        self.resize(900, 600)
+        self.model = model
+        self.proxy = HostFilterProxy(self)
+        self.proxy.setSourceModel(model)
+        # 값이 바뀐 행만 다시 필터 (변경 통지가 주기적으로 묶여서 오므로 부담이 적음)
+        self.proxy.setDynamicSortFilter(True)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("호스트 / 내용 검색")
+        self.filter_input.textChanged.connect(self.apply_filter)
+        self.status_combo = QComboBox()
+        self.status_combo.addItem("전체", None)
+        for status, (label, _) in status_labels.items():
+            self.status_combo.addItem(label, status)
+        self.status_combo.currentIndexChanged.connect(self.apply_filter)
+        self.summary_label = QLabel()
+        self.stop_button = QPushButton("감시 중지")
+        self.stop_button.setVisible(False)
+
+        self.table = QTableView()
+        self.table.setModel(self.proxy)
+        self.table.setSortingEnabled(True)
+        self.table.sortByColumn(0, Qt.SortOrder.AscendingOrder)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.setItemDelegateForColumn(progress_column, ProgressDelegate(self.table))
+        self.table.setAlternatingRowColors(True)
+        # 행 높이 / 컬럼 폭을 내용에 맞춰 계산하지 않도록 고정 (수천 행에서도 갱신 비용 일정)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.table.verticalHeader().setDefaultSectionSize(22)
+        self.table.verticalHeader().setVisible(False)
+        header = self.table.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        for column, width in enumerate((150, 80, 70, 70, 110, 90)):
+            self.table.setColumnWidth(column, width)
+
+        filter_layout = QHBoxLayout()
+        filter_layout.addWidget(self.filter_input)
+        filter_layout.addWidget(self.status_combo)
+        filter_layout.addWidget(self.stop_button)
+        main_layout = QVBoxLayout()
+        main_layout.addLayout(filter_layout)
+        main_layout.addWidget(self.table)
+        main_layout.addWidget(self.summary_label)
+        central_widget = QWidget()
+        central_widget.setLayout(main_layout)
+        self.setCentralWidget(central_widget)
+
+        # 집계는 반영 주기마다 갱신 (행 변경마다 다시 세지 않음)
+        self.model.flush_timer.timeout.connect(self.update_summary)
+        self.update_summary()
+
+    def apply_filter(self):
+        self.proxy.set_filter(self.filter_input.text(), self.status_combo.currentData())
+
+    def update_summary(self):
+        counts = self.model.counts()
+        parts = [f"{status_labels[status][0]} {counts[status]}" for status in status_labels if counts.get(status)]
+        self.summary_label.setText(f"총 {len(self.model.rows)}대 / 표시 {self.proxy.rowCount()}대 - " + " / ".join(parts))
+
+
+# 감시 모드(dcv_watchdog.Watchdog) 상태를 모델에 전달하도록 연결
+def attach_watchdog(model, watchdog):
+    def on_state(state):
+        model.post(state.host, status=state.status, latency_ms=state.latency_ms, action=state.action,
+                   progress=state.progress, updated=time.time(), message=state.message)
+    watchdog.on_state = on_state
+
+
+# 감시 모드를 백그라운드 스레드에서 실행하면서 현황 창 표시 (창을 닫거나 duration초가 지나면 감시 종료)
+def run_watch_view(watchdog, duration=None):
+    app = QApplication.instance() or QApplication([])
+    model = HostTableModel(watchdog.hosts)
+    attach_watchdog(model, watchdog)
+    window = HostStatusWindow(model, f"DCV 호스트 현황 - 감시 중 ({len(watchdog.hosts)}대)")
+    window.stop_button.setVisible(True)
+    window.stop_button.clicked.connect(watchdog.stop)
+
+    thread = threading.Thread(target=watchdog.run, args=(duration,), daemon=True)
+    # 감시가 끝나면 (중지 버튼 / duration 경과) 창도 닫음
+    watcher = QTimer(window)
+    watcher.timeout.connect(lambda: thread.is_alive() or window.close())
+    app.aboutToQuit.connect(watchdog.stop)
+    thread.start()
+    watcher.start(500)
+    window.show()
+    code = app.exec()
+    watchdog.stop()
+    thread.join(10)
+    return code
@@ -0,0 +1,130 @@
+import ipaddress
+import json
+import os
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, replace
+
+import dcv_history
+
+# 상태 대기(폴링) 정책 - 처음 몇 번은 빠르게 확인하고 이후 지수적으로 간격을 늘리며(지터 포함),
+# 조치 1회 전체에 하나의 제한 시간(deadline)을 적용
+# 호스트 등급(default / fast / slow)별로 정책을 다르게 설정할 수 있음
+# 조치 이력(dcv_history)에 기록된 호스트별 실제 소요 시간이 길면 해당 호스트의 전체 제한 시간을 늘림 (줄이지는 않음)
+
+host_class_file = os.environ.get("DCV_TOOLS_HOST_CLASSES") or os.path.join(os.path.expanduser("~"), ".dcv_tools", "host_classes.json")
+history_window = 30 * 86400 # 제한 시간 계산에 사용할 이력 기간(초)
+history_min_runs = 5 # 호스트별 성공 기록이 이 개수 이상일 때만 이력 반영
+history_margin = 1.5 # 이력 기반 제한 시간 = 성공한 조치 소요 시간 p95 × history_margin
+history_max_factor = 3.0 # 이력으로 늘릴 수 있는 최대 배수 (등급 기본 제한 시간 기준)
+
+
+@dataclass
+class WaitPolicy:
+    initial_interval: float = 0.2 # 첫 확인 간격(초)
+    fast_polls: int = 5 # initial_interval 간격으로 확인하는 횟수 (이후 간격 증가)
+    backoff: float = 1.6 # 간격 증가 배수
+    max_interval: float = 2.0 # 최대 확인 간격(초)
+    jitter: float = 0.2 # 간격에 더하는 무작위 편차 비율 (여러 호스트가 같은 박자로 확인하지 않도록)
+    restart_deadline: float = 15.0 # CASE 1 전체 제한 시간(초)
+    blackscreen_deadline: float = 30.0 # CASE 2 전체 제한 시간(초)
+
+    # 조치 종류별 전체 제한 시간
+    def deadline_for(self, action):
+        return self.blackscreen_deadline if action == "blackscreen" else self.restart_deadline
+
+    # 조치 시작 시점부터 제한 시간 계산 시작
+    def start(self, action):
+        return Deadline(self.deadline_for(action))
+
+    # timeout초 동안 사용할 확인 간격 목록 (빠른 확인 → 지수 증가 → 최대 간격 유지, 합계가 timeout을 넘지 않음)
+    def intervals(self, timeout, rng=random):
+        result = []
+        total = 0.0
+        interval = self.initial_interval
+        while total < timeout:
+            if len(result) >= self.fast_polls:
+                interval = min(interval * self.backoff, self.max_interval)
+            value = interval * (1 + rng.uniform(-self.jitter, self.jitter))
+            value = round(min(max(value, 0.05), timeout - total), 2)
+            if value <= 0:
+                break
+            result.append(value)
+            total += value
+        return result
+
+
+# 조치 1회 전체 제한 시간 (각 대기 단계는 남은 시간만큼만 대기)
+class Deadline:
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.end = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.end - time.monotonic())
+
+    def expired(self):
+        return self.remaining() <= 0
+
+
+# 기본 호스트 등급 (host_classes.json 의 "classes" 항목으로 값 변경 / 등급 추가 가능)
+host_classes = {
+    "default": WaitPolicy(),
+    "fast": WaitPolicy(initial_interval=0.1, fast_polls=10, max_interval=0.5, restart_deadline=10.0, blackscreen_deadline=20.0),
+    "slow": WaitPolicy(initial_interval=0.5, fast_polls=2, max_interval=5.0, restart_deadline=40.0, blackscreen_deadline=90.0),
+}
+
+
+# 호스트 등급 설정 파일 읽기
+# {"classes": {"slow": {"max_interval": 8}}, "hosts": {"10.0.5.20": "slow", "10.1.0.0/16": "fast"}}
+def load_host_classes(path=None):
+    path = path or host_class_file
+    classes = dict(host_classes)
+    try:
+        with open(path, encoding="utf-8") as f:
+            config = json.load(f)
+        for name, values in config.get("classes", {}).items():
+            classes[name] = replace(classes.get(name, WaitPolicy()), **values)
+    except (OSError, ValueError, TypeError, AttributeError):
+        # 설정 파일이 없거나 잘못된 경우 기본 등급만 사용
+        return dict(host_classes), {}
+    return classes, config.get("hosts", {})
+
+
+# 호스트 IP에 해당하는 등급 이름 찾기 (IP 직접 지정 → CIDR 포함 → default 순)
+def host_class_for(ip, hosts):
+    if ip in hosts:
+        return hosts[ip]
+    try:
+        address = ipaddress.ip_address(ip)
+    except ValueError:
+        return "default"
+    for network, name in hosts.items():
+        if "/" in network and address in ipaddress.ip_network(network, strict=False):
+            return name
+    return "default"
+
+
+# 호스트의 조치 이력으로 전체 제한 시간 조정 (성공한 조치가 제한 시간 가까이 걸리는 호스트가 매번 실패 처리되지 않도록)
+# key: 조치 이력의 호스트 키 ("사용자@IP:포트" - dcv_capability.cache_key)
+def history_adjusted(policy, key):
+    values = {}
+    for action, name in (("restart", "restart_deadline"), ("blackscreen", "blackscreen_deadline")):
+        try:
+            p95, runs = dcv_history.host_percentiles(action, 0.95, since=time.time() - history_window, hosts=[key]).get(key, (None, 0))
+        except (OSError, sqlite3.Error):
+            return policy
+        if runs >= history_min_runs:
+            configured = getattr(policy, name)
+            values[name] = round(min(max(configured, p95 * history_margin), configured * history_max_factor), 1)
+    return replace(policy, **values) if values else policy
+
+
+# 호스트에 적용할 대기 정책 반환 (host_class를 지정하면 설정 파일의 호스트 매핑보다 우선)
+# key: 조치 이력의 호스트 키 (dcv_capability.cache_key(session)) - 지정하면 해당 접속의 조치 이력으로 전체 제한 시간 조정
+def policy_for_host(ip, host_class=None, key=None):
+    classes, hosts = load_host_classes()
+    name = host_class or host_class_for(ip, hosts)
+    policy = classes.get(name, classes["default"])
+    return history_adjusted(policy, key) if key is not None else policy
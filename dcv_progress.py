@@ -0,0 +1,92 @@
+import math
+import sqlite3
+import statistics
+import time
+
+import dcv_history
+
+# 조치 진행률 / 남은 시간 추정 (Qt 를 사용하지 않음 - GUI 의 ProgressEngine 이 주기적으로 값을 읽어 표시)
+# - 조치를 단계 목록으로 나누고, 단계별 예상 소요 시간은 조치 이력(dcv_history)의 실제 소요 시간(중앙값)으로 계산
+# - 단계 시작 이벤트(step)를 받으면 해당 단계부터 다시 계산하고, 단계 안에서는 경과 시간에 비례해 증가
+# - 작업이 직접 보고하는 진행률(report)이 있으면 그 값 아래로는 내려가지 않음
+
+history_limit = 20 # 예상 시간 계산에 사용할 최근 조치 기록 수
+min_host_history = 3 # 호스트별 기록이 이 개수 이상이면 해당 호스트 기록만 사용
+max_estimate = 99.0 # 완료 이벤트 전까지 표시할 최대 진행률
+
+# 조치별 단계 (트레이스 단계 이름, 기록이 없을 때 예상 소요 시간(초)) - "total" 은 트레이스 전체 소요 시간
+action_steps = {
+    "restart": (("send_restart", 1.0), ("check_restarted", 3.0)),
+    "blackscreen": (("send_isolate_multi_user", 0.5), ("switch_to_graphical", 2.0), ("check_graphical", 3.0)),
+    "triage": (("triage", 1.0),),
+    "collect": (("total", 10.0),),
+}
+
+
+# 조치 이력 저장소에서 최근 성공한 조치의 단계별 소요 시간 중앙값(초) 조회 (host 기록이 충분하면 해당 호스트 기록만 사용)
+# host: 조치 이력의 호스트 키 ("사용자@IP:포트" - dcv_capability.cache_key)
+def history_durations(action, host=None, limit=history_limit):
+    try:
+        samples = dcv_history.step_samples(action, host, limit) if host is not None else {}
+        if len(samples.get("total", ())) < min_host_history:
+            samples = dcv_history.step_samples(action, None, limit)
+    except (OSError, sqlite3.Error):
+        return {}
+    return {step: statistics.median(values) for step, values in samples.items()}
+
+# 호스트의 조치별 단계 소요 시간 중앙값을 한 번에 조회 - {조치: {단계: 초}} (GUI 가 작업 스레드에서 미리 읽어 둘 때 사용)
+def host_history(host, actions=tuple(action_steps)):
+    return {action: history_durations(action, host) for action in actions}
+
+
+# 조치 1회의 진행률 추정 (history: 미리 조회해 둔 단계별 소요 시간 - 생략 시 조치 이력 저장소에서 조회)
+class ProgressEstimate:
+    def __init__(self, action, host=None, clock=time.monotonic, history=None):
+        history = history_durations(action, host) if history is None else history
+        self.steps = [(name, max(history.get(name, default), 0.05)) for name, default in action_steps.get(action, (("total", 5.0),))]
+        self.total = sum(expected for _, expected in self.steps)
+        self.clock = clock
+        self.index = 0
+        self.step_start = clock()
+        self.floor = 0.0 # 작업이 직접 보고한 진행률
+        self.finished = False
+
+    # 단계 시작 이벤트 (이전 단계는 모두 끝난 것으로 처리, 모르는 단계 이름은 무시)
+    def step(self, name):
+        for index, (step, _) in enumerate(self.steps):
+            if step == name and index >= self.index:
+                self.index = index
+                self.step_start = self.clock()
+                return
+
+    # 작업이 직접 보고한 진행률 (원격 일괄 실행 / 진단 자료 수집)
+    def report(self, percent):
+        self.floor = max(self.floor, float(percent))
+
+    def finish(self):
+        self.finished = True
+
+    # 현재 단계의 진행 비율 (예상 시간의 90% 까지는 경과 시간에 비례, 이후에는 단계 끝에 점점 가깝게 - 예상보다 오래 걸려도 멈춰 보이지 않도록)
+    def step_fraction(self, elapsed, expected):
+        if elapsed < expected * 0.9:
+            return elapsed / expected
+        return 0.9 + 0.09 * (1 - math.exp(-(elapsed - expected * 0.9) / expected))
+
+    # 현재 추정 진행률(%)
+    def percent(self):
+        if self.finished:
+            return 100.0
+        done = sum(expected for _, expected in self.steps[:self.index])
+        expected = self.steps[self.index][1]
+        value = (done + self.step_fraction(self.clock() - self.step_start, expected) * expected) / self.total * 100
+        return min(max(value, self.floor), max_estimate)
+
+    # 남은 예상 시간(초) - 현재 단계가 예상 시간을 넘긴 경우 None (추정 불가)
+    def remaining(self):
+        if self.finished:
+            return 0.0
+        elapsed = self.clock() - self.step_start
+        expected = self.steps[self.index][1]
+        if elapsed > expected:
+            return None
+        return expected - elapsed + sum(expected for _, expected in self.steps[self.index + 1:])
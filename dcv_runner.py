@@ -0,0 +1,163 @@
+import hashlib
+import shlex
+import time
+from functools import partial
+
+import dcv_capability
+import dcv_core
+import dcv_trace
+
+# 원격 일괄 실행 모드 - CASE 1 / CASE 2 전체 과정을 원격지의 작은 셸 스크립트로 한 번에 수행
+# 클라이언트가 단계마다 명령을 보내는 대신 채널 1개로 스크립트를 실행하고, 진행상황은 한 줄씩 전달 받음
+#   PROGRESS <퍼센트> <단계>  : 진행상황 (프로그레스바 갱신용)
+#   STATE <값>               : 감시 중인 상태가 바뀜
+#   POLLS <횟수>             : 상태 대기 1회에서 확인한 횟수
+#   RESULT ok|failed <단계>  : 최종 결과
+# 스크립트는 내용 해시(sha256)로 원격지 ~/.cache/dcv_tools 에 저장해 두고, 이미 있으면 다시 전송하지 않음
+
+runner_script = r'''#!/bin/sh
+# dcv_tools remote remediation runner
+# 사용법: runner.sh <restart|blackscreen> <서비스명> <제한시간(초)> <재시작 판정 시간(초)> <확인 간격 목록> <sudo 접두어>
+action=$1; service=$2; timeout=$3; window=$4; intervals=$5; SUDO=$6
+end=$(( $(date +%s) + ${timeout%.*} ))
+
+progress() { echo "PROGRESS $1 $2"; }
+finish() { echo "RESULT $1 $2"; [ "$1" = ok ]; exit $?; }
+
+# 현재 런레벨 (runlevel 명령이 없으면 graphical.target 활성 여부로 판단)
+current_runlevel() {
+    if command -v runlevel >/dev/null 2>&1; then runlevel | awk '{print $2}'
+    elif systemctl is-active -q graphical.target; then echo 5; else echo 3; fi
+}
+
+# $1 상태 확인 명령이 $2 값이 될 때까지 대기 (상태가 바뀔 때만 STATE 출력, 끝나면 확인 횟수 POLLS 출력)
+wait_state() {
+    last=; n=0
+    for d in $intervals 0; do
+        n=$((n+1))
+        s=$(eval "$1" 2>/dev/null); s=${s:-unknown}
+        if [ "$s" != "$last" ]; then echo "STATE $s"; last=$s; fi
+        [ "$s" = "$2" ] && { echo "POLLS $n"; return 0; }
+        [ "$(date +%s)" -ge "$end" ] && break
+        [ "$d" = 0 ] || sleep "$d"
+    done
+    echo "POLLS $n"
+    return 1
+}
+
+case "$action" in
+restart)
+    progress 10 restart
+    $SUDO systemctl restart "$service" || finish failed restart
+    progress 20 restart_sent
+    wait_state "systemctl is-active $service" active || finish failed wait_active
+    progress 50 active
+    # 활성화 시간과 현재 시간을 같은 시계(epoch 초)로 비교 (monotonic 과 /proc/uptime 은 절전 시간만큼 어긋남)
+    enter=$(systemctl show "$service" --property=ActiveEnterTimestamp --timestamp=unix 2>/dev/null | cut -d= -f2 | tr -d @)
+    if [ -z "$enter" ]; then
+        t=$(TZ=UTC systemctl show "$service" --property=ActiveEnterTimestamp | cut -d= -f2-)
+        [ -n "$t" ] && enter=$(TZ=UTC date -d "$t" +%s 2>/dev/null)
+    fi
+    age=-1
+    [ -n "$enter" ] && age=$(( $(date +%s) - enter ))
+    if [ "$age" -ge 0 ] && [ "$age" -le "$window" ]; then finish ok restarted; fi
+    finish failed not_recent
+    ;;
+blackscreen)
+    progress 10 isolate_multi_user
+    $SUDO systemctl --no-block isolate multi-user.target || finish failed isolate_multi_user
+    progress 20 multi_user_sent
+    wait_state current_runlevel 3 || finish failed wait_runlevel_3
+    progress 50 runlevel_3
+    $SUDO systemctl --no-block isolate graphical.target || finish failed isolate_graphical
+    progress 70 graphical_sent
+    wait_state current_runlevel 5 || finish failed wait_runlevel_5
+    finish ok runlevel_5
+    ;;
+esac
+finish failed unknown_action
+'''
+runner_hash = hashlib.sha256(runner_script.encode("utf-8")).hexdigest()[:16]
+
+# 캐시된 스크립트가 있으면 바로 실행하고, 없으면 stdin 으로 받은 내용을 저장 후 실행하는 원격 명령
+# (전송 없이 실행했는데 캐시가 없으면 MISSING 출력 후 종료 → 스크립트를 보내서 재시도)
+def runner_command(args):
+    path = f'"$HOME/.cache/dcv_tools/runner-{runner_hash}.sh"'
+    return (
+        f'f={path}; if [ -s "$f" ]; then echo CACHED; else mkdir -p "$(dirname "$f")";'
+        ' cat > "$f.$$"; if [ -s "$f.$$" ]; then mv "$f.$$" "$f"; echo UPLOADED;'
+        ' else rm -f "$f.$$"; echo MISSING; exit 3; fi; fi;'
+        f' exec sh "$f" {" ".join(shlex.quote(str(arg)) for arg in args)}'
+    )
+
+
+# 스크립트 실행 1회 (upload=True 이면 stdin 으로 스크립트 전송)
+# 반환값: (스크립트 캐시 상태, 최종 결과, 마지막 단계)
+def execute_runner(session, args, upload, progress, timeout):
+    status, outcome, step = None, "failed", "no_result"
+    # 캐시가 없어 스크립트를 보내며 다시 실행하는 경우는 이력의 재시도 횟수에 포함
+    with session.tracer.span("runner", upload=upload, retry=upload, rechecks=0) as attrs:
+        # 캐시가 있으면 원격지가 입력을 읽지 않으므로 빈 입력만 보내고 종료 (캐시가 없을 때 cat 이 입력 종료를 기다리지 않도록)
+        stdin = runner_script.encode("utf-8") if upload else b""
+        for line in session.stream(runner_command(args), timeout, step="exec:runner", stdin=stdin):
+            line = line.strip()
+            if line in ("CACHED", "UPLOADED", "MISSING"):
+                status = line
+            elif line.startswith("PROGRESS "):
+                parts = line.split()
+                progress(int(parts[1]))
+                step = parts[2] if len(parts) > 2 else step
+            elif line.startswith("POLLS "):
+                attrs["rechecks"] += max(int(line[6:]) - 1, 0)
+            elif line.startswith("RESULT "):
+                parts = line.split()
+                outcome = parts[1]
+                step = parts[2] if len(parts) > 2 else step
+        attrs.update(cache=status, last_step=step)
+    return status, outcome, step
+
+
+# 원격 일괄 실행 - 스크립트 1회 실행으로 조치 전체 수행 (GUI 처럼 트레이스 / 제한 시간을 직접 관리하는 경우 사용)
+# 반환값: (성공 여부, 마지막 단계)
+def run_remote(session, action, service=dcv_core.service_name, policy=None, deadline=None, progress=None):
+    progress = progress or (lambda value: None)
+    policy = policy or dcv_core.default_policy
+    deadline = deadline or policy.start(action)
+    timeout = deadline.remaining()
+    intervals = " ".join(str(value) for value in policy.intervals(timeout))
+    # sudo 사용 방식은 로그인 시 조회해 둔 원격 환경 정보 사용
+    sudo_prefix = dcv_capability.capabilities_for(session).sudo_prefix.strip()
+    args = (action, service, max(int(timeout), 1), dcv_core.recent_restart_window, intervals, sudo_prefix)
+    session.triage = None # 상태가 바뀌므로 이전 진단 결과 무효화
+    # 스크립트는 보내지 않고 먼저 실행 (대부분 원격지에 캐시되어 있음) - 캐시가 없을 때만(MISSING) 전송 후 재시도
+    status, outcome, step = execute_runner(session, args, False, progress, timeout + 15)
+    if status == "MISSING":
+        status, outcome, step = execute_runner(session, args, True, progress, timeout + 15)
+    return outcome == "ok", step
+
+
+# 원격 일괄 실행 모드로 조치 수행 (dcv_core.restart_flow / blackscreen_flow 와 같은 형태의 결과 반환)
+def run_remote_flow(session, action, service=dcv_core.service_name, progress=None, policy=None):
+    progress = progress or (lambda value: None)
+    policy = policy or dcv_core.default_policy
+    result = dcv_core.RemediationResult(action)
+    tracer = dcv_trace.begin(session, action)
+    deadline = policy.start(action)
+    start = time.monotonic()
+    try:
+        progress(0)
+        result.ok, step = run_remote(session, action, service, policy, deadline, progress)
+        progress(100 if result.ok else 0)
+        case_name = "CASE 1" if action == "restart" else "CASE 2"
+        result.message = f"{case_name} 조치 완료" if result.ok else f"{case_name} 조치 실패 ({step})"
+    except Exception:
+        dcv_capability.invalidate(session)
+        raise
+    finally:
+        result.elapsed = time.monotonic() - start
+        result.trace_path = tracer.finish("ok" if result.ok else "failed")
+    return result
+
+
+# dcv_core.remediation_flows 와 같은 형태의 원격 일괄 실행 조치 목록
+remote_flows = {action: partial(run_remote_flow, action=action) for action in dcv_core.remediation_flows}
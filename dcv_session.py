@@ -0,0 +1,755 @@
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+import dcv_trace
+
+paramiko = None # paramiko 모듈 (import 시간이 길어 처음 필요할 때 불러옴)
+paramiko_lock = threading.Lock()
+
+# paramiko 모듈을 불러와서 반환 (이미 불러온 경우 바로 반환)
+def load_paramiko():
+    global paramiko
+    if paramiko is None:
+        with paramiko_lock:
+            if paramiko is None:
+                import paramiko as module
+                paramiko = module
+    return paramiko
+
+# 로그인창이 먼저 화면에 그려지도록 paramiko 모듈을 백그라운드 스레드에서 미리 불러옴
+def warm_import():
+    threading.Thread(target=load_paramiko, daemon=True).start()
+
+# 접속 프로필 - 네트워크 환경에 맞춘 SSH Transport 설정
+# compress: SSH 압축 사용 (저대역 회선에서 텍스트 출력 전송량 감소)
+# window_size / max_packet_size: 채널 수신 창 / 최대 패킷 크기 (None 이면 paramiko 기본값 2MB / 32KB)
+# keepalive: keepalive 패킷 간격(초)
+# prefetch_channel: 명령 실행 시 다음 명령용 채널을 미리 열어 둠 (명령마다 채널 열기 왕복 1회 생략 - 고지연 회선용)
+@dataclass(frozen=True)
+class TransportProfile:
+    name: str
+    label: str # 로그인 화면 표시 이름
+    compress: bool = False
+    window_size: int = None
+    max_packet_size: int = None
+    keepalive: int = 15
+    prefetch_channel: bool = False
+
+transport_profiles = {
+    "default": TransportProfile("default", "기본"),
+    # VPN 등 왕복 지연 100ms 이상 회선용 - 채널을 미리 열어 명령마다 왕복 1회를 줄이고, 큰 수신 창으로 대용량 수집 시 왕복마다 멈추지 않도록 하며
+    # keepalive 를 짧게 하여 끊긴 회선을 빨리 감지 (다음 명령에서 바로 재접속)
+    # 압축은 사용하지 않음 - 조치 명령 출력은 작고 진단 명령 출력은 원격지에서 gzip 으로 받으므로 줄어드는 전송량이 거의 없음
+    "high-latency": TransportProfile("high-latency", "고지연 (VPN)", window_size=8 * 1024 * 1024, max_packet_size=64 * 1024,
+                                     keepalive=10, prefetch_channel=True),
+}
+default_profile = transport_profiles["default"]
+
+# 이름으로 접속 프로필 찾기 (None 이면 기본 프로필)
+def profile_for(name):
+    if name is None:
+        return default_profile
+    if name not in transport_profiles:
+        raise ValueError(f"알 수 없는 접속 프로필: {name} ({' / '.join(transport_profiles)})")
+    return transport_profiles[name]
+
+# TCP 접속 + SSH 키 교환까지만 수행한 Transport 반환 (인증 전 단계)
+# jump: 경유 서버(JumpHost) - 있으면 직접 TCP 접속 대신 경유 서버의 터널(direct-tcpip 채널) 위에서 키 교환
+# profile: 접속 프로필 (압축 / 수신 창 / 최대 패킷 크기 적용)
+def open_transport(ip, port=22, timeout=10, jump=None, profile=None):
+    load_paramiko()
+    profile = profile or default_profile
+    sock = jump.open_tunnel(ip, port, timeout) if jump is not None else socket.create_connection((ip, port), timeout=timeout)
+    transport = paramiko.Transport(sock, default_window_size=profile.window_size or paramiko.common.DEFAULT_WINDOW_SIZE,
+                                   default_max_packet_size=profile.max_packet_size or paramiko.common.DEFAULT_MAX_PACKET_SIZE)
+    transport.use_compression(profile.compress)
+    # 서버 배너 / 키 교환 / 인증 응답 대기에도 같은 제한 시간 적용 (응답 없는 호스트에서 무한 대기 방지)
+    transport.banner_timeout = timeout
+    transport.handshake_timeout = timeout
+    transport.auth_timeout = timeout
+    try:
+        transport.start_client(timeout=timeout)
+    except Exception:
+        transport.close()
+        raise
+    return transport
+
+# 로그인 버튼을 누르기 전에 (IP 입력이 끝난 시점) TCP 접속 + 키 교환을 미리 수행해 두는 클래스
+# 로그인 시에는 비밀번호 인증 단계만 남게 됨
+class PendingTransport:
+    def __init__(self, ip, port=22, timeout=10, jump=None, profile=None):
+        self.ip = ip
+        self.port = port
+        self.timeout = timeout
+        self.jump = jump
+        self.profile = profile or default_profile
+        self.transport = None
+        self.error = None
+        self.cancelled = False # 취소 / 포기 표시 (이후 접속이 끝나면 접속 스레드가 결과를 바로 닫음)
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        transport = None
+        try:
+            transport = open_transport(self.ip, self.port, self.timeout, self.jump, self.profile)
+        except Exception as e:
+            self.error = e
+        finally:
+            with self.lock:
+                if not self.cancelled:
+                    self.transport, transport = transport, None
+            if transport is not None:
+                transport.close()
+            self.done.set()
+
+    # 같은 접속 대상인지 확인
+    def matches(self, ip, port=22, jump=None, profile=None):
+        return self.ip == ip and self.port == port and self.jump is jump and self.profile == (profile or default_profile)
+
+    # 미리 열어둔 Transport를 넘겨받음 (진행 중이면 완료될 때까지 대기, 실패/끊김 시 None)
+    # timeout초 안에 끝나지 않으면 포기 표시 - 늦게 열린 Transport 는 접속 스레드가 닫음 (호출한 쪽은 새로 접속)
+    def take(self):
+        if not self.done.wait(self.timeout):
+            self.cancel()
+            return None
+        with self.lock:
+            transport, self.transport = self.transport, None
+        if transport is not None and transport.is_active():
+            return transport
+        if transport is not None:
+            transport.close()
+        return None
+
+    # 사용하지 않게 된 경우 (IP 변경 / 창 종료) 미리 열어둔 접속 정리
+    def cancel(self):
+        with self.lock:
+            self.cancelled = True
+            transport, self.transport = self.transport, None
+        if transport is not None:
+            transport.close()
+
+# 다음 명령에 사용할 채널을 백그라운드 스레드에서 미리 열어 두는 클래스 (접속 프로필의 prefetch_channel)
+# 명령 출력을 읽는 동안 채널 열기 왕복이 함께 진행되므로, 다음 명령은 실행 요청 왕복만 기다림
+class SpareChannel:
+    def __init__(self, transport, timeout=10):
+        self.transport = transport
+        self.timeout = timeout
+        self.channel = None
+        self.cancelled = False
+        self.done = threading.Event()
+        threading.Thread(target=self.run, daemon=True).start()
+
+    def run(self):
+        try:
+            self.channel = self.transport.open_session(timeout=self.timeout)
+        except Exception:
+            self.channel = None
+        finally:
+            if self.cancelled:
+                self.cancel()
+            self.done.set()
+
+    # 미리 열어 둔 채널을 넘겨받음 (transport 가 바뀌었거나 열기에 실패 / 채널이 닫힌 경우 None)
+    def take(self, transport):
+        if self.transport is not transport:
+            self.cancel()
+            return None
+        self.done.wait(self.timeout)
+        channel, self.channel = self.channel, None
+        if channel is not None and not channel.closed and transport.is_active():
+            return channel
+        if channel is not None:
+            channel.close()
+        return None
+
+    def cancel(self):
+        self.cancelled = True
+        channel, self.channel = self.channel, None
+        if channel is not None:
+            channel.close()
+
+# 경유 서버(bastion / jump host) - 인증된 Transport 하나 위에 대상 호스트별 direct-tcpip 채널(터널)을 열어 사용
+# 대상 호스트가 여러 대여도 경유 서버 로그인은 한 번만 수행하고, 대상 호스트 세션이 끝나면 터널만 닫힘
+# 접속 한도: 경유 서버 Transport 1개당 터널 max_channels개, 넘으면 경유 서버 접속을 max_transports개까지 추가하고
+# 그래도 부족하면 다른 터널이 닫힐 때까지 대기 (감시 모드처럼 세션을 계속 유지하는 경우 호스트 수만큼 터널 사용)
+class JumpHost:
+    def __init__(self, ip, username, password, port=22, timeout=10, keepalive=15, max_channels=50, max_transports=8):
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.port = port
+        self.timeout = timeout
+        self.keepalive = keepalive
+        self.max_channels = max_channels
+        self.max_transports = max_transports
+        self.tunnels = {} # 경유 서버 Transport -> 열려 있는 터널 채널 목록
+        self.opening = {} # 경유 서버 Transport -> 여는 중인 터널 수 (한도 계산에 포함)
+        self.connecting = False # 경유 서버 로그인 진행 여부 (한 번에 하나만 로그인)
+        self.generation = 0 # close() 횟수 (로그인 중에 닫힌 경우 새 Transport 를 등록하지 않도록)
+        self.condition = threading.Condition()
+        self.handshake_count = 0 # 경유 서버 로그인 횟수
+        self.tunnel_count = 0 # 연 터널 수
+
+    # 경유 서버에 접속 + 인증한 Transport 반환
+    def connect(self):
+        transport = open_transport(self.ip, self.port, self.timeout)
+        try:
+            transport.auth_password(self.username, self.password)
+        except Exception:
+            transport.close()
+            raise
+        transport.set_keepalive(self.keepalive)
+        return transport
+
+    # 터널을 더 열 수 있는 경유 서버 Transport 반환 (condition 을 잡은 상태에서 호출, 끊어진 Transport / 닫힌 터널은 정리, 없으면 None)
+    def available_transport(self):
+        for transport, channels in list(self.tunnels.items()):
+            if not transport.is_active():
+                del self.tunnels[transport]
+                continue
+            channels.difference_update([channel for channel in channels if channel.closed])
+            if len(channels) + self.opening.get(transport, 0) < self.max_channels:
+                return transport
+        return None
+
+    # 터널을 열 경유 서버 Transport 확보 (여는 중인 터널 수에 포함해서 반환)
+    # 새로 로그인해야 하면 condition 밖에서 수행 - 로그인하는 동안 다른 스레드가 기존 Transport 로 터널을 열 수 있도록
+    # (동시에 요청한 다른 스레드는 새로 로그인하지 않고 진행 중인 로그인을 기다려 같은 Transport 를 함께 사용)
+    def acquire_transport(self, end):
+        with self.condition:
+            while True:
+                transport = self.available_transport()
+                if transport is not None:
+                    self.opening[transport] = self.opening.get(transport, 0) + 1
+                    return transport
+                if not self.connecting and len(self.tunnels) < self.max_transports:
+                    self.connecting = True
+                    generation = self.generation
+                    break
+                remaining = end - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"경유 서버 {self.ip} 접속 한도 초과 (터널 {self.max_transports * self.max_channels}개 사용 중)")
+                # 터널이 닫혀도 알림이 없으므로 주기적으로 다시 확인
+                self.condition.wait(min(remaining, 0.5))
+        try:
+            transport = self.connect()
+        except BaseException:
+            with self.condition:
+                self.connecting = False
+                self.condition.notify_all()
+            raise
+        with self.condition:
+            self.connecting = False
+            self.handshake_count += 1
+            self.condition.notify_all()
+            if generation == self.generation:
+                self.tunnels[transport] = set()
+                self.opening[transport] = self.opening.get(transport, 0) + 1
+                return transport
+        # 로그인하는 동안 close() 된 경우
+        transport.close()
+        raise ConnectionError(f"경유 서버 {self.ip} 접속이 종료되었습니다")
+
+    # 대상 호스트(ip:port)로의 터널을 열어 반환 (대상 호스트 SSH Transport 의 소켓으로 사용)
+    def open_tunnel(self, ip, port=22, timeout=None):
+        timeout = self.timeout if timeout is None else timeout
+        transport = self.acquire_transport(time.monotonic() + timeout)
+        channel = None
+        try:
+            # 터널 열기(경유 서버에서 대상 호스트로 TCP 접속)는 condition 밖에서 수행 - 응답 없는 호스트가 다른 터널 열기를 막지 않도록
+            channel = transport.open_channel("direct-tcpip", (ip, port), ("127.0.0.1", 0), timeout=timeout)
+            return channel
+        finally:
+            with self.condition:
+                self.opening[transport] -= 1
+                if channel is not None and transport in self.tunnels:
+                    self.tunnels[transport].add(channel)
+                    self.tunnel_count += 1
+                self.condition.notify_all()
+
+    # 경유 서버 사용 현황 (로그인 횟수 / 연 터널 수 / 현재 접속 / 열려 있는 터널 수)
+    def stats(self):
+        with self.condition:
+            return {
+                "handshakes": self.handshake_count,
+                "tunnels_opened": self.tunnel_count,
+                "transports": len(self.tunnels),
+                "open_tunnels": sum(1 for channels in self.tunnels.values() for channel in channels if not channel.closed),
+            }
+
+    def close(self):
+        with self.condition:
+            transports, self.tunnels = list(self.tunnels), {}
+            self.generation += 1
+        for transport in transports:
+            transport.close()
+
+# "[사용자@]호스트[:포트]" 형식의 경유 서버 지정을 (사용자, 호스트, 포트)로 분리 (사용자 생략 시 default_user)
+def parse_jump_spec(spec, default_user):
+    username, _, address = spec.rpartition("@")
+    host, _, port = address.partition(":")
+    return username or default_user, host, int(port) if port else 22
+
+jump_hosts = {} # 경유 서버 지정별 JumpHost (같은 프로세스에서 여러 번 로그인해도 경유 서버 접속 재사용)
+jump_hosts_lock = threading.Lock()
+
+# 경유 서버 지정("[사용자@]호스트[:포트]")에 해당하는 JumpHost 반환 (없으면 생성 - 접속은 첫 터널을 열 때 수행)
+def jump_host_for(spec, username, password, timeout=10):
+    username, host, port = parse_jump_spec(spec, username)
+    key = (username, host, port)
+    replaced = None
+    with jump_hosts_lock:
+        jump = jump_hosts.get(key)
+        if jump is None or jump.password != password:
+            replaced, jump = jump, JumpHost(host, username, password, port=port, timeout=timeout)
+            jump_hosts[key] = jump
+    # 비밀번호가 바뀌어 교체된 이전 경유 서버 접속 종료 (Transport 종료는 lock 밖에서 수행)
+    if replaced is not None:
+        replaced.close()
+    return jump
+
+# 열어 둔 경유 서버 접속 모두 종료 (프로그램 종료 시 호출)
+def close_jump_hosts():
+    with jump_hosts_lock:
+        jumps = list(jump_hosts.values())
+        jump_hosts.clear()
+    for jump in jumps:
+        jump.close()
+
+# 사용자가 조치를 취소한 경우 발생하는 예외
+class OperationCancelled(Exception):
+    def __init__(self):
+        super().__init__("사용자가 조치를 취소했습니다")
+
+# 원격 명령이 제한 시간 내에 끝나지 않은 경우 발생하는 예외 (step: 응답이 멈춘 단계 이름)
+class StepTimeout(Exception):
+    def __init__(self, step, timeout):
+        super().__init__(f"원격 응답 없음 - {step} 단계에서 {timeout:.0f}초 초과")
+        self.step = step
+        self.timeout = timeout
+
+# 원격 명령이 실패(종료 코드 0 이 아님)로 끝난 경우 발생하는 예외
+class CommandFailed(Exception):
+    def __init__(self, step, exit_status, stderr=""):
+        super().__init__(f"원격 명령 실패 - {step} 단계 (종료 코드 {exit_status})" + (f": {stderr}" if stderr else ""))
+        self.step = step
+        self.exit_status = exit_status
+        self.stderr = stderr
+
+# 백그라운드 명령이 끝나기 전에 Transport 가 끊기거나 재접속되어 결과를 받지 못한 경우 발생하는 예외 (원격지에서는 완료되었을 수 있음)
+class BackgroundLost(Exception):
+    def __init__(self, step):
+        super().__init__(f"재접속으로 백그라운드 명령 결과를 확인하지 못함 - {step} 단계")
+        self.step = step
+
+# 조치 1회의 취소 요청 (취소 시 진행 중인 채널을 모두 닫아 블로킹된 읽기를 즉시 풀어줌)
+class CancelToken:
+    def __init__(self):
+        self.event = threading.Event()
+        self.lock = threading.Lock()
+        self.channels = set()
+
+    @property
+    def cancelled(self):
+        return self.event.is_set()
+
+    def cancel(self):
+        self.event.set()
+        with self.lock:
+            channels, self.channels = self.channels, set()
+        for channel in channels:
+            channel.close()
+
+    # 취소된 경우 OperationCancelled 발생
+    def check(self):
+        if self.event.is_set():
+            raise OperationCancelled()
+
+    # 진행 중인 채널 등록 (이미 취소된 경우 바로 닫고 OperationCancelled 발생)
+    def register(self, channel):
+        with self.lock:
+            if not self.event.is_set():
+                self.channels.add(channel)
+                return
+        channel.close()
+        raise OperationCancelled()
+
+    def unregister(self, channel):
+        with self.lock:
+            self.channels.discard(channel)
+
+# 원격 명령 실행 결과 (stdout / stderr / 종료 코드 - 종료 코드를 받지 못한 경우 None)
+@dataclass
+class CommandResult:
+    stdout: str = ""
+    stderr: str = ""
+    exit_status: int = None
+
+    @property
+    def ok(self):
+        return self.exit_status == 0
+
+# 트레이스 단계 이름으로 사용할 명령어 요약 (예: "sudo systemctl restart dcvserver" -> "exec:systemctl restart")
+def command_step(command):
+    words = [word for word in command.split() if word not in ("sudo", "-n")]
+    if not words:
+        return "exec"
+    if words[0] == "systemctl" and len(words) > 1:
+        return f"exec:systemctl {words[1]}"
+    return f"exec:{words[0]}"
+
+# 로그인 시 인증된 SSH Transport를 계속 유지하면서 모든 조치/상태확인 명령이 채널만 새로 열어 사용하도록 관리하는 클래스
+# (기존에는 버튼을 누를 때마다 TCP 접속 + 키 교환 + 비밀번호 인증을 처음부터 다시 수행했음)
+class SSHSessionManager:
+    def __init__(self, ip, username, password, port=22, timeout=10, keepalive=None, command_timeout=30, jump=None, max_channels=4,
+                 profile=None):
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.port = port
+        self.timeout = timeout
+        self.jump = jump # 경유 서버(JumpHost) - 있으면 경유 서버의 터널로 접속 (재접속 시에도 같은 경유 서버 접속을 재사용)
+        self.profile = profile or default_profile # 접속 프로필 (TransportProfile)
+        self.keepalive = self.profile.keepalive if keepalive is None else keepalive
+        self.spare = None # 미리 열어 둔 다음 명령용 채널 (SpareChannel - profile.prefetch_channel 일 때만 사용)
+        self.channels_prefetched = 0 # 미리 열어 둔 채널을 사용한 횟수
+        self.command_timeout = command_timeout # 제한 시간을 지정하지 않은 원격 명령의 최대 대기 시간(초)
+        self.max_channels = max_channels # 동시 실행(submit / execute_async) 최대 채널 수 (sshd MaxSessions 기본값 10 보다 작게)
+        self.executor = None # 동시 실행용 작업 스레드 (처음 사용할 때 생성)
+        self.background = [] # 결과를 기다리지 않고 시작한 명령의 Future 목록 (join_background 로 정리)
+        self.transport = None
+        self.retired = [] # 재접속 후에도 백그라운드 명령이 사용 중이라 닫지 않고 남겨 둔 이전 Transport (명령이 끝나면 종료)
+        self.cancel_token = CancelToken() # 현재 조치의 취소 요청 (조치 시작 시 begin_operation 으로 교체)
+        self.lock = threading.RLock()
+        self.handshake_count = 0 # 실제로 수행한 핸드셰이크(접속 + 인증) 횟수
+        self.handshakes_avoided = 0 # 기존 Transport 를 재사용해서 핸드셰이크를 생략한 조치 수 (조치마다 최대 1회)
+        self.round_trips = 0 # 원격 명령 실행(채널) 횟수
+        self.capabilities = None # 원격 환경 정보 (dcv_capability.HostCapabilities - 로그인 시 조회)
+        self.triage = None # 최근 자동 진단 결과 (dcv_triage.Diagnosis - 조치 명령을 보내면 무효화)
+        self.tracer = dcv_trace.Tracer(ip, "session", keep_spans=False) # 단계별 소요 시간 기록기 (조치 시작 시 교체)
+
+    # TCP 접속 + 키 교환 + 비밀번호 인증을 수행하고 Transport를 보관
+    # pending: 미리 키 교환까지 끝낸 PendingTransport (있으면 비밀번호 인증만 수행)
+    # (재접속 시에는 이전 Transport 만 정리 - 동시 실행용 작업 스레드와 백그라운드 명령 목록은 유지)
+    def connect(self, pending=None):
+        with self.lock:
+            self.drop_transport()
+            transport = None
+            if pending is not None and pending.matches(self.ip, self.port, self.jump, self.profile):
+                transport = pending.take()
+            elif pending is not None:
+                pending.cancel()
+            if transport is not None:
+                try:
+                    with self.tracer.span("auth", prewarmed=True):
+                        transport.auth_password(self.username, self.password)
+                except paramiko.AuthenticationException:
+                    transport.close()
+                    raise
+                except Exception:
+                    # 미리 열어둔 접속이 그 사이 끊긴 경우 처음부터 다시 접속
+                    transport.close()
+                    transport = None
+            if transport is None:
+                with self.tracer.span("connect", jump=self.jump.ip if self.jump is not None else None):
+                    transport = open_transport(self.ip, self.port, self.timeout, self.jump, self.profile)
+                try:
+                    with self.tracer.span("auth", prewarmed=False):
+                        transport.auth_password(self.username, self.password)
+                except Exception:
+                    transport.close()
+                    raise
+            # 유휴 상태에서 방화벽/NAT에 의해 세션이 끊기지 않도록 keepalive 패킷 전송
+            transport.set_keepalive(self.keepalive)
+            self.transport = transport
+            self.handshake_count += 1
+            # 첫 명령용 채널도 미리 열어 둠 (로그인 직후 첫 명령부터 채널 열기 왕복 생략)
+            if self.profile.prefetch_channel:
+                self.spare = SpareChannel(transport, self.timeout)
+            return transport
+
+    # 현재 Transport가 살아있는지 확인
+    def is_alive(self):
+        return self.transport is not None and self.transport.is_active() and self.transport.is_authenticated()
+
+    # 살아있는 Transport를 반환 (끊어진 경우 저장된 정보로 투명하게 재접속)
+    def ensure(self):
+        with self.lock:
+            if self.is_alive():
+                return self.transport
+            return self.connect()
+
+    # Transport 위에 새 채널을 열어 반환 (채널 열기 실패 시 1회 재접속 후 재시도)
+    # 접속 프로필이 prefetch_channel 이면 미리 열어 둔 채널을 사용하고 다음 명령용 채널을 다시 미리 열기 시작
+    def open_channel(self):
+        transport = self.ensure()
+        channel = self.take_spare(transport) if self.profile.prefetch_channel else None
+        if channel is None:
+            try:
+                channel = transport.open_session(timeout=self.timeout)
+            except (load_paramiko().SSHException, EOFError, OSError):
+                with self.lock:
+                    if self.transport is transport:
+                        self.connect()
+                transport = self.ensure()
+                channel = transport.open_session(timeout=self.timeout)
+        if self.profile.prefetch_channel:
+            with self.lock:
+                if self.spare is None and self.transport is transport:
+                    self.spare = SpareChannel(transport, self.timeout)
+        return channel
+
+    def take_spare(self, transport):
+        with self.lock:
+            spare, self.spare = self.spare, None
+        channel = spare.take(transport) if spare is not None else None
+        if channel is not None:
+            self.channels_prefetched += 1
+        return channel
+
+    # 채널을 열고 명령 실행 요청 (채널은 현재 조치의 취소 요청에 등록 - 종료 시 release 로 해제)
+    def start_command(self, command):
+        self.cancel_token.check()
+        channel = self.open_channel()
+        self.cancel_token.register(channel)
+        channel.exec_command(command)
+        self.round_trips += 1
+        return channel
+
+    def release(self, channel):
+        self.cancel_token.unregister(channel)
+        channel.close()
+
+    # 채널 출력(stdout)을 도착하는 대로 반환 - timeout초 안에 끝나지 않으면 (출력이 계속 도착하더라도) StepTimeout, 취소 시 OperationCancelled
+    # stderr 는 같은 반복에서 함께 비움 (버퍼가 차서 원격 프로세스가 멈추지 않도록) - errors(bytearray)를 주면 그곳에 모음
+    # abort: 출력을 기다리는 동안 주기적으로 호출하는 함수 - 예외를 반환하면 더 기다리지 않고 그 예외 발생
+    def read_output(self, channel, step, timeout=None, poll=0.5, errors=None, abort=None):
+        timeout = self.command_timeout if timeout is None else timeout
+        end = time.monotonic() + timeout
+        while True:
+            # 출력이 계속 도착하는 명령도 제한 시간을 넘기지 않도록 매 반복마다 확인
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                raise StepTimeout(step, timeout)
+            self.drain_stderr(channel, errors)
+            channel.settimeout(min(poll, remaining))
+            try:
+                data = channel.recv(32768)
+            except socket.timeout:
+                self.cancel_token.check()
+                error = abort() if abort is not None else None
+                if error is not None:
+                    raise error
+                continue
+            if not data:
+                break
+            yield data
+        self.drain_stderr(channel, errors)
+        self.cancel_token.check()
+
+    @staticmethod
+    def drain_stderr(channel, errors=None):
+        while channel.recv_stderr_ready():
+            data = channel.recv_stderr(32768)
+            if errors is not None:
+                errors.extend(data)
+
+    # 명령을 실행하고 결과(stdout)를 문자열로 반환 (블로킹 - 작업 스레드에서 호출)
+    # timeout: 최대 대기 시간(초) (생략 시 command_timeout)
+    def run(self, command, step=None, timeout=None):
+        step = step or command_step(command)
+        with self.tracer.span(step):
+            channel = self.start_command(command)
+            try:
+                return b"".join(self.read_output(channel, step, timeout)).decode('utf-8').strip()
+            finally:
+                self.release(channel)
+
+    # 명령을 실행하고 stdout / stderr / 종료 코드를 함께 반환 (두 출력을 같은 반복에서 읽어 어느 쪽 버퍼도 차지 않음)
+    def execute(self, command, step=None, timeout=None):
+        step = step or command_step(command)
+        errors = bytearray()
+        with self.tracer.span(step) as attrs:
+            channel = self.start_command(command)
+            try:
+                output = b"".join(self.read_output(channel, step, timeout, errors=errors))
+                # 출력이 끝난 뒤 종료 코드가 도착할 때까지 잠시 대기
+                status = channel.exit_status if channel.status_event.wait(self.timeout) else None
+            finally:
+                self.release(channel)
+            attrs["exit_status"] = status
+        return CommandResult(output.decode('utf-8').strip(), errors.decode('utf-8', 'replace').strip(), status)
+
+    # 같은 Transport 위에서 여러 채널을 동시에 실행하기 위한 작업 스레드에 fn 실행 요청 (Future 반환)
+    # 예) 오래 걸리는 명령 실행과 상태 감시를 동시에 진행하고 둘 다 끝나면 결과를 합침
+    def submit(self, fn, *args, **kwargs):
+        with self.lock:
+            if self.executor is None:
+                self.executor = ThreadPoolExecutor(max_workers=self.max_channels, thread_name_prefix=f"ssh-{self.ip}")
+            return self.executor.submit(fn, *args, **kwargs)
+
+    # 명령을 별도 채널에서 실행하고 Future(결과: CommandResult) 반환
+    def execute_async(self, command, step=None, timeout=None):
+        return self.submit(self.execute, command, step, timeout)
+
+    # 명령을 실행하고 종료 코드가 0 이 아니면 CommandFailed 발생
+    def check_call(self, command, step=None, timeout=None):
+        step = step or command_step(command)
+        result = self.execute(command, step, timeout)
+        if result.exit_status not in (0, None):
+            raise CommandFailed(step, result.exit_status, result.stderr)
+        return result
+
+    # 결과를 기다리지 않고 시작할 명령 (조치 흐름에서 다음 단계와 동시에 진행, join_background 에서 결과 확인)
+    # 명령 도중 Transport 가 끊기거나 재접속되어 결과를 받지 못하면 명령 실패 대신 BackgroundLost 로 끝남
+    def start_background(self, command, step=None, timeout=None):
+        step = step or command_step(command)
+        generation = self.handshake_count
+        cancel_token = self.cancel_token
+
+        def lost():
+            return self.handshake_count != generation or not self.is_alive()
+
+        def run():
+            try:
+                result = self.execute(command, step, timeout)
+            except Exception as e:
+                if cancel_token.cancelled or isinstance(e, (OperationCancelled, StepTimeout)):
+                    raise
+                if lost():
+                    raise BackgroundLost(step) from e
+                raise
+            # Transport 가 끊기면 채널이 종료 코드 없이 (paramiko 는 -1) 닫힘 - 명령 실패로 오인하지 않도록 구분
+            if result.exit_status in (None, -1) and lost():
+                raise BackgroundLost(step)
+            return result
+
+        future = self.submit(run)
+        self.background.append(future)
+        return future
+
+    # 백그라운드 명령이 끝날 때까지 최대 timeout초 대기 후 (명령, 결과 또는 예외) 목록 반환 - 끝나지 않은 명령은 취소하지 않고 남겨둠
+    def join_background(self, timeout=None):
+        futures, self.background = self.background, []
+        done, pending = wait(futures, timeout=timeout)
+        self.background.extend(pending)
+        self.close_retired()
+        return [future.exception() or future.result() for future in futures if future in done]
+
+    # 명령을 실행하고 출력이 도착하는 대로 한 줄씩 반환 (오래 실행되는 감시 명령용 - 채널 1개만 사용)
+    # stdin: 명령 시작 직후 원격지 입력으로 보낼 내용 (전송 후 입력 종료)
+    def stream(self, command, timeout=None, step=None, stdin=None, abort=None):
+        step = step or command_step(command)
+        with self.tracer.span(step):
+            channel = self.start_command(command)
+            try:
+                if stdin is not None:
+                    channel.sendall(stdin)
+                    channel.shutdown_write()
+                pending = b""
+                for data in self.read_output(channel, step, timeout, abort=abort):
+                    lines = (pending + data).split(b"\n")
+                    pending = lines.pop()
+                    for line in lines:
+                        yield line.decode('utf-8')
+                if pending:
+                    yield pending.decode('utf-8')
+            finally:
+                self.release(channel)
+
+    # 명령 출력(stdout)을 메모리에 모으지 않고 도착하는 대로 파일 객체(out)에 기록 후 기록한 바이트 수 반환
+    def copy_output(self, command, out, step=None, timeout=None):
+        step = step or command_step(command)
+        written = 0
+        with self.tracer.span(step) as attrs:
+            channel = self.start_command(command)
+            try:
+                for data in self.read_output(channel, step, timeout):
+                    out.write(data)
+                    written += len(data)
+            finally:
+                self.release(channel)
+            attrs["bytes"] = written
+        return written
+
+    # 같은 Transport 위에 SFTP 채널을 열어 반환 (timeout: 요청별 응답 대기 시간, 사용 후 close_sftp 로 정리)
+    def open_sftp(self, timeout=None):
+        self.cancel_token.check()
+        channel = self.open_channel()
+        self.cancel_token.register(channel)
+        channel.settimeout(self.command_timeout if timeout is None else timeout)
+        channel.invoke_subsystem("sftp")
+        self.round_trips += 1
+        return load_paramiko().SFTPClient(channel)
+
+    def close_sftp(self, sftp):
+        channel = sftp.get_channel()
+        sftp.close()
+        self.release(channel)
+
+    # 새 조치 시작 - 이전 취소 요청을 지우고 새 취소 요청을 반환
+    # 살아있는 Transport 로 시작하는 조치는 핸드셰이크를 생략한 조치로 집계 (명령 / 채널 수와 관계없이 1회)
+    def begin_operation(self):
+        with self.lock:
+            if self.is_alive():
+                self.handshakes_avoided += 1
+        self.close_retired()
+        self.cancel_token = CancelToken()
+        self.background = []
+        return self.cancel_token
+
+    # 진행 중인 조치 취소 - 채널과 Transport 를 닫아 블로킹된 작업을 즉시 종료 (GUI 스레드에서 호출해도 대기하지 않음)
+    # 다음 조치 시에는 ensure() 에서 투명하게 재접속
+    def cancel(self):
+        self.cancel_token.cancel()
+        transport = self.transport
+        if transport is not None:
+            transport.close()
+
+    # 세션 재사용 현황 (핸드셰이크 수 / 생략된 핸드셰이크 수 / 명령 왕복 수 / 미리 열어 둔 채널 사용 수)
+    def stats(self):
+        return {
+            "handshakes": self.handshake_count,
+            "handshakes_avoided": self.handshakes_avoided,
+            "round_trips": self.round_trips,
+            "channels_prefetched": self.channels_prefetched,
+            "profile": self.profile.name,
+        }
+
+    # 현재 Transport 정리 (재접속 / 종료 시)
+    # keep_busy=True 이면 백그라운드 명령이 아직 실행 중인 살아있는 Transport 는 닫지 않고 남겨 둠 (명령이 끝난 뒤 close_retired 에서 종료)
+    def drop_transport(self, keep_busy=True):
+        with self.lock:
+            if self.spare is not None:
+                self.spare.cancel()
+                self.spare = None
+            transport, self.transport = self.transport, None
+            if transport is None:
+                return
+            if keep_busy and transport.is_active() and any(not future.done() for future in self.background):
+                self.retired.append(transport)
+                return
+        transport.close()
+
+    # 남겨 둔 이전 Transport 종료 (force=False 이면 실행 중인 백그라운드 명령이 없을 때만)
+    def close_retired(self, force=False):
+        with self.lock:
+            if not force and any(not future.done() for future in self.background):
+                return
+            retired, self.retired = self.retired, []
+        for transport in retired:
+            transport.close()
+
+    # 유지하던 Transport 종료 (프로그램 종료 시 호출)
+    def close(self):
+        with self.lock:
+            self.drop_transport(keep_busy=False)
+            self.close_retired(force=True)
+            if self.executor is not None:
+                # 진행 중인 작업은 Transport 가 닫혀 바로 끝남 (재접속 후 동시 실행이 필요하면 새로 생성)
+                self.executor.shutdown(wait=False)
+                self.executor = None
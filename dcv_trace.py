@@ -0,0 +1,175 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import dcv_capability
+import dcv_history
+
+# 조치 단계별 소요 시간 기록 (접속 / 인증 / 명령 실행 / 상태 대기)
+# - 조치 1회마다 JSON 트레이스 파일 저장 / 조치 이력 저장소(dcv_history)에 기록
+# - 단계별 지연시간 히스토그램을 누적하여 Prometheus 텍스트 형식으로 출력 (node_exporter textfile collector 용)
+
+trace_dir = os.environ.get("DCV_TOOLS_TRACE_DIR") or os.path.join(os.path.expanduser("~"), ".dcv_tools", "traces")
+max_trace_files = 200 # 보관할 트레이스 파일 최대 개수 (초과 시 오래된 파일부터 삭제)
+latency_buckets = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60) # 히스토그램 구간(초)
+
+
+# 단계별 지연시간 히스토그램
+class Histogram:
+    def __init__(self, buckets=latency_buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds):
+        self.count += 1
+        self.sum += seconds
+        for index, bound in enumerate(self.buckets):
+            if seconds <= bound:
+                self.counts[index] += 1
+
+
+# (단계, 호스트)별 히스토그램 모음 (프로세스 전체에서 공유)
+class LatencyRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.histograms = {}
+
+    def observe(self, step, host, seconds):
+        with self.lock:
+            key = (step, host)
+            if key not in self.histograms:
+                self.histograms[key] = Histogram()
+            self.histograms[key].observe(seconds)
+
+    # Prometheus 텍스트 형식으로 변환
+    def to_prometheus(self, name="dcv_tools_step_seconds"):
+        lines = [f"# HELP {name} DCV Tools remediation step latency in seconds", f"# TYPE {name} histogram"]
+        with self.lock:
+            for (step, host), histogram in sorted(self.histograms.items()):
+                labels = f'step="{escape_label(step)}",host="{escape_label(host)}"'
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {histogram.count}')
+                lines.append(f"{name}_sum{{{labels}}} {histogram.sum:.6f}")
+                lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    # Prometheus 텍스트 파일로 저장 (수집기가 쓰는 중인 파일을 읽지 않도록 임시 파일 작성 후 교체)
+    def write_prometheus(self, path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(temp_path, path)
+
+registry = LatencyRegistry()
+
+def escape_label(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# 조치 1회 동안의 단계별 소요 시간 기록기 (monotonic 시계 기준)
+# keep_spans=False 이면 히스토그램에만 반영하고 단계 목록은 보관하지 않음 (조치 외 상시 사용 세션용)
+# key: 조치 이력 저장 키 (접속 사용자 / 포트까지 구분하는 "사용자@IP:포트" - 생략 시 host)
+class Tracer:
+    def __init__(self, host, action, keep_spans=True, key=None):
+        self.host = host
+        self.key = key or host
+        self.action = action
+        self.keep_spans = keep_spans
+        self.started_at = time.time()
+        self.start = time.monotonic()
+        self.spans = []
+        self.lock = threading.Lock()
+        self.outcome = None
+        self.attributes = {} # 단계 외 추가 기록 값 (예: GUI 멈춤 시간)
+
+    # with 블록의 소요 시간을 name 단계로 기록 (예외 발생 시 error로 기록 후 그대로 전달)
+    @contextmanager
+    def span(self, name, **attrs):
+        start = time.monotonic()
+        status = "ok"
+        try:
+            yield attrs
+        except Exception as e:
+            status = "error"
+            attrs["error"] = str(e)
+            raise
+        finally:
+            end = time.monotonic()
+            registry.observe(name, self.host, end - start)
+            if self.keep_spans:
+                span = {
+                    "step": name,
+                    "start_ms": round((start - self.start) * 1000, 3),
+                    "duration_ms": round((end - start) * 1000, 3),
+                    "status": status,
+                    "thread": threading.current_thread().name,
+                }
+                span.update(attrs)
+                with self.lock:
+                    self.spans.append(span)
+
+    # 트레이스에 추가 값 기록
+    def annotate(self, **values):
+        self.attributes.update(values)
+
+    # 단계별 소요 시간 합계 (같은 단계가 여러 번 실행된 경우 합산)
+    def step_durations(self):
+        durations = {}
+        with self.lock:
+            for span in self.spans:
+                durations[span["step"]] = durations.get(span["step"], 0.0) + span["duration_ms"] / 1000
+        return durations
+
+    def to_dict(self):
+        with self.lock:
+            spans = list(self.spans)
+        return {
+            "host": self.host,
+            "key": self.key,
+            "action": self.action,
+            "started_at": self.started_at,
+            "duration_ms": round((time.monotonic() - self.start) * 1000, 3),
+            "outcome": self.outcome,
+            "attributes": self.attributes,
+            "spans": spans,
+        }
+
+    # 조치 종료 처리 - 전체 소요 시간 기록 후 이력 저장소 기록 / JSON 트레이스 / Prometheus 히스토그램 파일 저장
+    # 저장한 트레이스 파일 경로 반환 (저장 실패 시 None - 트레이스 저장 실패가 조치 결과에 영향을 주지 않도록 함)
+    def finish(self, outcome):
+        self.outcome = outcome
+        registry.observe(f"total:{self.action}", self.host, time.monotonic() - self.start)
+        trace = self.to_dict()
+        # 조치 이력 저장소에 기록 (기록 스레드에서 저장 - 기다리지 않음)
+        dcv_history.record(trace)
+        try:
+            os.makedirs(trace_dir, exist_ok=True)
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(self.started_at)) + f"{int(self.started_at * 1000) % 1000:03d}"
+            path = os.path.join(trace_dir, f"{stamp}-{self.action}-{self.host.replace(':', '_')}.json")
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(trace, f, ensure_ascii=False, indent=2)
+            registry.write_prometheus(os.path.join(os.path.dirname(trace_dir), "metrics.prom"))
+            prune_traces()
+            return path
+        except OSError:
+            return None
+
+
+# 오래된 트레이스 파일 정리
+def prune_traces():
+    files = sorted(name for name in os.listdir(trace_dir) if name.endswith(".json"))
+    for name in files[:-max_trace_files]:
+        os.remove(os.path.join(trace_dir, name))
+
+
+# 세션에 새 트레이스를 시작 (이후 세션에서 수행되는 접속/명령/대기 단계가 이 트레이스에 기록됨)
+def begin(session, action):
+    tracer = Tracer(session.ip, action, key=dcv_capability.cache_key(session))
+    session.tracer = tracer
+    return tracer
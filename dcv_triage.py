@@ -0,0 +1,176 @@
+import time
+from dataclasses import dataclass, field
+
+import dcv_core
+from dcv_core import parse_epoch, parse_key_values, to_int
+
+# 자동 진단 - 한 번의 원격 명령으로 dcvserver / 런레벨 / 디스플레이 관리자 / Xorg / DCV 세션 상태를 조회하고
+# 규칙에 따라 CASE 1(dcvserver 재시작) / CASE 2(런레벨 3 → 5) 중 필요한 조치만 추천
+# 진단 결과는 세션에 triage_ttl초 동안 보관하며, 조치 명령을 보내면 (상태가 바뀌므로) 무효화됨
+
+triage_ttl = 30 # 진단 결과 재사용 시간(초)
+crash_window = 10 # 최근 비정상 종료 기록을 확인할 기간(분)
+
+
+# 진단 조회 결과
+@dataclass
+class TriageReport:
+    service_state: str = "unknown" # dcvserver ActiveState
+    sub_state: str = "" # dcvserver SubState
+    restarts: int = 0 # systemd 자동 재시작 횟수 (NRestarts)
+    exit_status: int = 0 # 마지막 종료 코드 (ExecMainStatus)
+    active_age: float = None # active가 된 뒤 경과 시간(초)
+    recent_failures: int = 0 # 최근 crash_window분 동안의 비정상 종료 기록 수
+    runlevel: str = "" # 현재 런레벨 (runlevel 명령이 없으면 빈 값)
+    default_target: str = "" # 기본 부팅 타겟
+    graphical_target: str = "" # graphical.target 상태
+    display_manager: str = "" # display-manager(GDM 등) 상태
+    xorg_running: bool = None # Xorg 실행 여부 (pgrep 이 없으면 None)
+    dcv_sessions: int = None # DCV 세션 수 (dcv 명령이 없으면 None)
+    sessions_complete: bool = False # 모든 사용자의 세션을 조회했는지 여부 (root 또는 sudo -n 으로 조회한 경우)
+    console_session: bool = False # 콘솔 세션 자동 생성 호스트 여부 (dcv.conf create-session = true)
+
+    @property
+    def graphical(self):
+        if self.runlevel:
+            return self.runlevel == "5"
+        return self.graphical_target == "active"
+
+    @property
+    def graphical_default(self):
+        return self.default_target in ("", "graphical.target")
+
+
+# 진단 결과 (추천 조치 / 판단 근거 / 조회 결과)
+@dataclass
+class Diagnosis:
+    action: str = None # "restart" / "blackscreen" / None(조치 불필요)
+    reasons: list = field(default_factory=list)
+    notes: list = field(default_factory=list) # 조치와 무관한 참고 사항
+    report: TriageReport = None
+    probed_at: float = 0.0 # 조회 시점 (monotonic)
+
+    @property
+    def case_name(self):
+        return {"restart": "CASE 1", "blackscreen": "CASE 2"}.get(self.action, "조치 불필요")
+
+
+# 진단에 필요한 정보를 한 번의 왕복으로 조회하는 명령어 (없는 명령은 빈 값)
+# sudo 는 DCV 세션 목록 조회에만 비밀번호 없이(-n) 시도 - 실패하면 접속 사용자 권한으로 보이는 세션만 조회
+def triage_command(service=dcv_core.service_name):
+    return (
+        f"systemctl show {service} --property=ActiveState --property=SubState --property=NRestarts"
+        " --property=ExecMainStatus; "
+        + dcv_core.active_enter_command(service) + ";"
+        f" echo RecentFailures=$(journalctl -u {service} --since -{crash_window}min -o cat 2>/dev/null"
+        " | grep -ciE 'main process exited|failed with result|dumped core');"
+        " echo Runlevel=$(runlevel 2>/dev/null | awk '{print $2}');"
+        " echo DefaultTarget=$(systemctl get-default 2>/dev/null);"
+        " echo GraphicalTarget=$(systemctl is-active graphical.target 2>/dev/null);"
+        " echo DisplayManager=$(systemctl is-active display-manager 2>/dev/null);"
+        " echo Xorg=$(command -v pgrep >/dev/null 2>&1 && { pgrep -x 'Xorg|X' >/dev/null 2>&1 && echo 1 || echo 0; });"
+        " a=0; if command -v dcv >/dev/null 2>&1; then if [ \"$(id -u)\" = 0 ]; then s=$(dcv list-sessions 2>/dev/null); a=1;"
+        " elif s=$(sudo -n dcv list-sessions 2>/dev/null); then a=1; else s=$(dcv list-sessions 2>/dev/null); fi;"
+        " echo DcvSessions=$(printf '%s\\n' \"$s\" | grep -c '^Session'); fi; echo DcvSessionsAll=$a;"
+        " echo ConsoleSession=$(grep -Eiqs '^[[:space:]]*create-session[[:space:]]*=[[:space:]]*true' /etc/dcv/dcv.conf && echo 1 || echo 0)"
+    )
+
+# triage_command 결과(key=value 줄 목록)를 TriageReport로 변환
+def parse_triage(output):
+    values = parse_key_values(output)
+    report = TriageReport()
+    report.service_state = values.get("ActiveState") or "unknown"
+    report.sub_state = values.get("SubState", "")
+    report.restarts = to_int(values.get("NRestarts"))
+    report.exit_status = to_int(values.get("ExecMainStatus"))
+    enter = parse_epoch(values.get("ActiveEnterTimestamp"))
+    now = to_int(values.get("Now"))
+    report.active_age = now - enter if enter and now else None
+    report.recent_failures = to_int(values.get("RecentFailures"))
+    report.runlevel = values.get("Runlevel", "")
+    report.default_target = values.get("DefaultTarget", "")
+    report.graphical_target = values.get("GraphicalTarget", "")
+    report.display_manager = values.get("DisplayManager", "")
+    report.xorg_running = values["Xorg"] == "1" if values.get("Xorg") else None
+    report.dcv_sessions = to_int(values["DcvSessions"]) if values.get("DcvSessions") else None
+    report.sessions_complete = values.get("DcvSessionsAll") == "1"
+    report.console_session = values.get("ConsoleSession") == "1"
+    return report
+
+
+# 진단 규칙 - 해당하면 (조치, 근거) 반환, 조치가 None 이면 참고 사항
+def rule_service_down(report):
+    if report.service_state != "active":
+        return "restart", f"dcvserver 서비스가 동작 중이 아님 ({report.service_state}/{report.sub_state})"
+
+def rule_not_graphical(report):
+    if report.graphical_default and not report.graphical:
+        return "blackscreen", f"그래픽 모드가 아님 (런레벨 {report.runlevel or '-'}, graphical.target {report.graphical_target or '-'})"
+
+def rule_display_manager(report):
+    if report.graphical_default and report.graphical and report.display_manager not in ("active", ""):
+        return "blackscreen", f"디스플레이 관리자(GDM)가 동작 중이 아님 ({report.display_manager})"
+
+def rule_xorg(report):
+    if report.graphical_default and report.graphical and report.xorg_running is False:
+        return "blackscreen", "Xorg 가 실행 중이 아님"
+
+# 세션이 없는 것은 보통 정상 (가상 세션 호스트에 아무도 접속하지 않았거나 다른 사용자의 세션이 보이지 않는 경우) - 참고 사항으로만 표시
+# 세션 수를 믿을 수 있고(콘솔 세션 호스트 + 모든 사용자 세션 조회) dcvserver 최근 비정상 종료 기록도 있을 때만 재시작 추천
+# (자동 조치(watchdog)가 정상 호스트의 dcvserver 를 반복해서 재시작하지 않도록)
+def rule_no_sessions(report):
+    if report.service_state != "active" or report.dcv_sessions != 0:
+        return None
+    if report.console_session and report.sessions_complete and (report.recent_failures or report.restarts):
+        return "restart", "콘솔 세션이 없고 dcvserver 최근 비정상 종료 기록 있음 (재시작 시 콘솔 세션 재생성)"
+    return None, "DCV 세션이 없음"
+
+def rule_recent_crash(report):
+    if report.recent_failures or report.restarts:
+        return None, f"dcvserver 최근 비정상 종료 기록 (자동 재시작 {report.restarts}회, 최근 {crash_window}분 오류 {report.recent_failures}건)"
+
+# 위에서부터 먼저 해당하는 규칙의 조치를 추천 (dcvserver 가 멈춘 경우 런레벨 변경으로는 해결되지 않으므로 CASE 1 우선)
+triage_rules = (rule_service_down, rule_not_graphical, rule_display_manager, rule_xorg, rule_no_sessions, rule_recent_crash)
+
+# 조회 결과에 규칙을 적용하여 추천 조치 결정
+def diagnose(report):
+    diagnosis = Diagnosis(report=report, probed_at=time.monotonic())
+    for rule in triage_rules:
+        matched = rule(report)
+        if matched is None:
+            continue
+        action, reason = matched
+        if action is None:
+            diagnosis.notes.append(reason)
+            continue
+        diagnosis.action = diagnosis.action or action
+        if action == diagnosis.action:
+            diagnosis.reasons.append(reason)
+        else:
+            diagnosis.notes.append(reason)
+    return diagnosis
+
+
+# 세션의 진단 결과 반환 (triage_ttl초 이내의 결과가 있으면 재사용, refresh=True 이면 다시 조회)
+def triage(session, service=dcv_core.service_name, refresh=False, timeout=None):
+    diagnosis = session.triage
+    if not refresh and diagnosis is not None and time.monotonic() - diagnosis.probed_at < triage_ttl:
+        return diagnosis
+    with session.tracer.span("triage") as attrs:
+        diagnosis = diagnose(parse_triage(session.run(triage_command(service), step="probe:triage", timeout=timeout)))
+        attrs["recommendation"] = diagnosis.action
+    session.triage = diagnosis
+    return diagnosis
+
+
+# 자동 조치 - 진단 후 필요한 조치만 수행 (flows: 조치 목록 - 원격 일괄 실행 모드는 dcv_runner.remote_flows)
+def auto_flow(session, progress=None, policy=None, flows=None):
+    flows = flows or dcv_core.remediation_flows
+    start = time.monotonic()
+    diagnosis = triage(session)
+    if diagnosis.action is None:
+        return dcv_core.RemediationResult("none", ok=True, message="이상 없음 - 조치 생략", elapsed=time.monotonic() - start)
+    result = flows[diagnosis.action](session, progress=progress, policy=policy)
+    result.message = f"{result.message} ({', '.join(diagnosis.reasons)})"
+    result.elapsed = time.monotonic() - start
+    return result
@@ -0,0 +1,224 @@
+import heapq
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import dcv_capability
+import dcv_core
+import dcv_fleet
+import dcv_runner
+import dcv_trace
+import dcv_triage
+from dcv_policy import policy_for_host
+from dcv_session import SSHSessionManager
+
+# 감시(watchdog) 모드 - 여러 호스트에 SSH 세션을 계속 유지하면서 주기적으로 상태를 진단하고
+# dcvserver 장애(CASE 1) / 검은 화면(CASE 2) 상태가 연속으로 확인되면 자동으로 조치
+# - 상태 확인은 자동 진단(dcv_triage) 명령 1회 왕복 (호스트마다 시작 시점을 분산)
+# - 호스트별 조치 횟수 제한 (period초 동안 최대 max_actions회) / 전체 동시 조치 수 제한
+# - 작업 스레드 수는 호스트 수와 무관하게 고정 (세션마다 paramiko 수신 스레드 1개만 추가) - 한 프로세스에서 수백 대 감시 가능
+
+
+# 호스트별 감시 상태
+@dataclass
+class HostState:
+    host: str
+    status: str = "pending" # healthy / unhealthy / unreachable / remediating / rate_limited
+    unhealthy_count: int = 0 # 연속으로 이상이 확인된 횟수
+    failures: int = 0 # 연속 접속 실패 횟수 (재시도 간격 계산용)
+    last_probe: float = 0.0 # 마지막 확인 시간 (epoch 초)
+    latency_ms: float = None # 마지막 상태 확인 소요 시간(ms)
+    action: str = "" # 마지막으로 추천 / 수행한 조치
+    progress: int = 0 # 진행 중인 조치의 진행률(%)
+    message: str = ""
+    actions: deque = field(default_factory=deque) # 최근 자동 조치 시간 (monotonic)
+
+
+class Watchdog:
+    def __init__(self, hosts, username, password, interval=30, concurrency=5, probe_workers=32, max_actions=3, period=3600,
+                 threshold=2, recheck=5, max_backoff=300, connect_timeout=10, dry_run=False, host_class=None, remote=False,
+                 jump=None, profile=None, on_event=None, on_state=None):
+        self.hosts = list(hosts)
+        self.username = username
+        self.password = password
+        self.interval = interval # 정상 호스트 확인 주기(초)
+        self.probe_workers = probe_workers # 상태 확인 / 조치를 수행하는 작업 스레드 수
+        self.max_actions = max_actions # 호스트별 period초 동안 최대 자동 조치 횟수
+        self.period = period
+        self.threshold = threshold # 이 횟수만큼 연속으로 이상이 확인되어야 조치 (일시적인 상태 변화에 반응하지 않도록)
+        self.recheck = recheck # 이상 확인 후 재확인까지 대기 시간(초)
+        self.max_backoff = max_backoff # 접속 실패 시 최대 재시도 간격(초)
+        self.connect_timeout = connect_timeout
+        self.dry_run = dry_run # True 이면 조치 없이 감지 결과만 기록
+        self.host_class = host_class
+        self.jump = jump # 경유 서버(JumpHost) - 모든 호스트 세션이 경유 서버 접속 하나를 함께 사용
+        self.profile = profile # 접속 프로필 (dcv_session.TransportProfile)
+        self.flows = dcv_runner.remote_flows if remote else dcv_core.remediation_flows
+        self.on_event = on_event or (lambda event: None)
+        self.on_state = on_state or (lambda state: None) # 상태 확인 / 조치 진행마다 호출 (상태 변화가 없어도 호출 - 현황 화면용)
+        self.slots = threading.BoundedSemaphore(concurrency) # 전체 동시 조치 수 제한
+        self.states = {host: HostState(host) for host in self.hosts}
+        self.sessions = {}
+        self.queue = [] # (다음 확인 시간, 호스트) 힙
+        self.condition = threading.Condition()
+        self.stopped = threading.Event()
+
+    def emit(self, state, event, **values):
+        self.on_event(dict(time=time.time(), host=state.host, event=event, status=state.status, message=state.message, **values))
+
+    # 호스트를 delay초 뒤 확인 대상으로 등록
+    def schedule(self, host, delay):
+        with self.condition:
+            heapq.heappush(self.queue, (time.monotonic() + delay, host))
+            self.condition.notify()
+
+    # duration초 동안 (생략 시 stop() 호출 전까지) 감시
+    def run(self, duration=None):
+        end = time.monotonic() + duration if duration else None
+        for host in self.hosts:
+            # 모든 호스트가 같은 시점에 확인하지 않도록 첫 확인 시점 분산
+            self.schedule(host, random.uniform(0, min(self.interval, len(self.hosts) * 0.05)))
+        with ThreadPoolExecutor(max_workers=self.probe_workers, thread_name_prefix="watchdog") as pool:
+            while not self.stopped.is_set():
+                if end is not None and time.monotonic() >= end:
+                    break
+                with self.condition:
+                    now = time.monotonic()
+                    due = []
+                    while self.queue and self.queue[0][0] <= now:
+                        due.append(heapq.heappop(self.queue)[1])
+                    if not due:
+                        wait = self.queue[0][0] - now if self.queue else self.interval
+                        if end is not None:
+                            wait = min(wait, end - now)
+                        self.condition.wait(max(wait, 0))
+                        continue
+                for host in due:
+                    pool.submit(self.check_host, host)
+            self.stop()
+        self.close()
+
+    def stop(self):
+        self.stopped.set()
+        with self.condition:
+            self.condition.notify()
+        # 진행 중인 확인 / 조치가 바로 끝나도록 취소
+        for session in list(self.sessions.values()):
+            session.cancel()
+
+    def close(self):
+        for session in list(self.sessions.values()):
+            session.close()
+        self.sessions.clear()
+
+    def session_for(self, host):
+        session = self.sessions.get(host)
+        if session is None:
+            ip, port = dcv_fleet.split_host_port(host)
+            session = SSHSessionManager(ip, self.username, self.password, port=port, timeout=self.connect_timeout, jump=self.jump,
+                                     profile=self.profile)
+            self.sessions[host] = session
+        return session
+
+    # 호스트 1대 상태 확인 후 필요하면 조치 (작업 스레드에서 실행) - 다음 확인 시점 등록까지 수행
+    def check_host(self, host):
+        if self.stopped.is_set():
+            return
+        try:
+            delay = self.probe(host)
+        except Exception as e:
+            state = self.states[host]
+            state.status, state.message = "error", str(e)
+            self.emit(state, "error")
+            delay = self.interval
+        self.on_state(self.states[host])
+        if not self.stopped.is_set():
+            self.schedule(host, delay)
+
+    def probe(self, host):
+        state = self.states[host]
+        session = self.session_for(host)
+        session.begin_operation()
+        start = time.monotonic()
+        try:
+            # 끊어진 세션은 ensure() 에서 투명하게 재접속
+            diagnosis = dcv_triage.triage(session, refresh=True)
+        except Exception as e:
+            if self.stopped.is_set():
+                return self.interval
+            state.failures += 1
+            if state.status != "unreachable":
+                state.status, state.message = "unreachable", str(e)
+                self.emit(state, "unreachable")
+            session.close()
+            return min(self.interval * 2 ** (state.failures - 1), self.max_backoff)
+        state.failures = 0
+        state.last_probe = time.time()
+        state.latency_ms = round((time.monotonic() - start) * 1000, 1)
+
+        if diagnosis.action is None:
+            if state.status != "healthy":
+                state.status, state.message = "healthy", "이상 없음"
+                self.emit(state, "healthy")
+            state.unhealthy_count = 0
+            return self.interval
+
+        state.unhealthy_count += 1
+        state.action = diagnosis.action
+        state.message = ", ".join(diagnosis.reasons)
+        if state.unhealthy_count < self.threshold:
+            state.status = "unhealthy"
+            self.emit(state, "unhealthy", recommendation=diagnosis.action, count=state.unhealthy_count)
+            return self.recheck
+        return self.remediate(state, session, diagnosis)
+
+    # 조치 수행 (호스트별 횟수 제한 / 전체 동시 조치 수 제한 적용)
+    def remediate(self, state, session, diagnosis):
+        now = time.monotonic()
+        while state.actions and now - state.actions[0] > self.period:
+            state.actions.popleft()
+        if len(state.actions) >= self.max_actions:
+            if state.status != "rate_limited":
+                state.status = "rate_limited"
+                self.emit(state, "rate_limited", recommendation=diagnosis.action, actions=len(state.actions))
+            return self.interval
+        if self.dry_run:
+            state.status = "unhealthy"
+            self.emit(state, "would_remediate", recommendation=diagnosis.action)
+            state.actions.append(now)
+            return self.interval
+        if not self.slots.acquire(blocking=False):
+            # 동시 조치 수 제한에 걸린 경우 작업 스레드를 붙잡지 않고 잠시 후 다시 확인
+            self.emit(state, "deferred", recommendation=diagnosis.action)
+            return self.recheck
+        try:
+            state.status = "remediating"
+            state.progress = 0
+            state.actions.append(now)
+            self.emit(state, "remediating", recommendation=diagnosis.action)
+            self.on_state(state)
+            result = self.flows[diagnosis.action](session, progress=lambda value: self.report_progress(state, value),
+                                                  policy=policy_for_host(session.ip, self.host_class, key=dcv_capability.cache_key(session)))
+            state.status = "healthy" if result.ok else "unhealthy"
+            state.message = result.message
+            state.unhealthy_count = 0
+            self.emit(state, "remediated", action=diagnosis.action, ok=result.ok, elapsed=round(result.elapsed, 3))
+        finally:
+            self.slots.release()
+            # 조치 트레이스는 파일로 저장되었으므로 이후 상태 확인 단계가 계속 쌓이지 않도록 기록기 교체
+            session.tracer = dcv_trace.Tracer(session.ip, "watchdog", keep_spans=False)
+        return self.interval
+
+    def report_progress(self, state, value):
+        state.progress = value
+        self.on_state(state)
+
+    # 현재 호스트별 상태 개수
+    def summary(self):
+        counts = {}
+        for state in self.states.values():
+            counts[state.status] = counts.get(state.status, 0) + 1
+        return counts